@@ -0,0 +1,8 @@
+"""Offline benchmarks of the Kodi Media Sensors integration.
+
+- `fake_kodi`: a stand-in Kodi JSON-RPC server (HTTP and websocket)
+  serving a synthetic library, with configurable per-method latency
+- `run`: drives the websocket commands of the integration and its
+  sensor through a Home Assistant instance connected to that server,
+  and reports latency, Kodi RPC count and payload sizes per command
+"""
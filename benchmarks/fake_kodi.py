@@ -0,0 +1,1352 @@
+"""Stand-in Kodi JSON-RPC server, for the benchmarks.
+
+Serves a synthetic, deterministic library (1k to 200k songs and more,
+with their albums and artists, movies, TV shows, music videos and PVR
+channels) and emulates the players and playlists, like Kodi does on its
+HTTP (`POST /jsonrpc`, batches included) and websocket (`/jsonrpc`, with
+notifications) ports. Every JSON-RPC method called by this integration
+and by the core Kodi integration is implemented, plus the
+`*.Set*Details` methods (title only), which notify `*.OnUpdate`.
+
+The latency of Kodi is emulated per method (`--latency`), plus a cost
+per library item scanned by a filter or a sort (`--scan-cost`), as Kodi
+runs its filters against its SQLite database.
+
+Control endpoints (HTTP port), used by the benchmark runner:
+- `GET /bench/stats`: calls, errors and response bytes per method
+- `POST /bench/reset`: reset the statistics
+- `POST /bench/library`: regenerate the library (`{"songs": 50000}`)
+  and notify the end of the library and PVR scans
+- `POST /bench/player`: fill a playlist and play it
+  (`{"playlistid": 0, "size": 200, "position": 0}`)
+- `POST /bench/play`: play the next item (or `{"position": 3}`) of the
+  active playlist; returns the `id` and `type` of the played item
+- `POST /bench/stop`: stop the player
+- `POST /bench/notify`: push a notification (`{"method", "data"}`)
+
+Usage:
+    python -m benchmarks.fake_kodi --songs 50000 --latency 5 \\
+        --latency AudioLibrary.GetSongs=40 --scan-cost 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import heapq
+import json
+import logging
+import random
+import time
+from typing import Any
+from urllib.parse import quote
+
+from aiohttp import WSMsgType, web
+
+_LOGGER = logging.getLogger(__name__)
+
+PLAYER_ID_AUDIO = 0
+PLAYER_ID_VIDEO = 1
+
+SONGS_PER_ALBUM = 10
+ALBUMS_PER_ARTIST = 5
+SEASONS_PER_SHOW = 5
+EPISODES_PER_SEASON = 10
+SONGS_PER_PLAYLIST_FILE = 25
+MUSIC_PLAYLISTS_DIRECTORY = "special://musicplaylists"
+MUSIC_PLAYLISTS = [
+    f"{MUSIC_PLAYLISTS_DIRECTORY}/Mix {number:02d}.m3u" for number in range(1, 21)
+]
+
+# Words of the synthetic titles, also used by the runner as queries
+WORDS = (
+    "amber autumn blue broken city crystal dance dark dream echo electric "
+    "fire forever free garden ghost gold heart highway home honey light "
+    "little lonely love midnight mirror moon morning neon night ocean "
+    "paper rain red river road rock shadow silver sky slow smoke snow song "
+    "soul star stone storm summer sun sweet thunder time tokyo train velvet "
+    "wild wind winter world yellow young zero"
+).split()
+
+_GENRES = [
+    "Rock",
+    "Pop",
+    "Jazz",
+    "Blues",
+    "Electronic",
+    "Classical",
+    "Folk",
+    "Hip-Hop",
+    "Soul",
+    "Metal",
+]
+
+# Library kinds: (id key, item type)
+_KINDS = {
+    "songs": ("songid", "song"),
+    "albums": ("albumid", "album"),
+    "artists": ("artistid", "artist"),
+    "movies": ("movieid", "movie"),
+    "tvshows": ("tvshowid", "tvshow"),
+    "episodes": ("episodeid", "episode"),
+    "musicvideos": ("musicvideoid", "musicvideo"),
+    "channels": ("channelid", "channel"),
+}
+_KIND_BY_ID_KEY = {id_key: kind for kind, (id_key, _) in _KINDS.items()}
+
+# Fields holding the title of the items, filtered without building them
+_TITLE_FIELDS = {
+    "songs": ("title", "label"),
+    "albums": ("title", "album", "label"),
+    "artists": ("artist", "label"),
+    "movies": ("title", "label"),
+    "tvshows": ("title", "label"),
+    "episodes": ("title",),
+    "musicvideos": ("title", "label"),
+    "channels": ("channel", "label"),
+}
+_TITLE_SORTS = {"title", "label", "album", "artist", "channel", "sorttitle"}
+
+# Parameters of the methods pykodi calls with positional parameters
+_POSITIONAL_PARAMS = {
+    "Application.GetProperties": ["properties"],
+    "Application.SetMute": ["mute"],
+    "Application.SetVolume": ["volume"],
+    "GUI.ShowNotification": ["title", "message", "image", "displaytime"],
+    "Input.ExecuteAction": ["action"],
+    "Player.GetItem": ["playerid", "properties"],
+    "Player.GetProperties": ["playerid", "properties"],
+    "Player.GoTo": ["playerid", "to"],
+    "Player.PlayPause": ["playerid", "play"],
+    "Player.Seek": ["playerid", "value"],
+    "Player.SetShuffle": ["playerid", "shuffle"],
+    "Player.Stop": ["playerid"],
+    "XBMC.GetInfoBooleans": ["booleans"],
+    "XBMC.GetInfoLabels": ["labels"],
+}
+
+ERROR_PARSE = {"code": -32700, "message": "Parse error."}
+ERROR_INVALID_REQUEST = {"code": -32600, "message": "Invalid request."}
+ERROR_METHOD_NOT_FOUND = {"code": -32601, "message": "Method not found."}
+ERROR_INVALID_PARAMS = {"code": -32602, "message": "Invalid params."}
+ERROR_FAILED = {"code": -32100, "message": "Failed to execute method."}
+
+
+class RpcError(Exception):
+    """JSON-RPC error returned to the caller."""
+
+    def __init__(self, error: dict) -> None:
+        super().__init__(error["message"])
+        self.error = error
+
+
+def _image(path: str) -> str:
+    return f"image://{quote(f'smb://nas/{path}', safe='')}/"
+
+
+def _date(offset: int) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(1_600_000_000 + offset))
+
+
+def _duration(seconds: int) -> dict:
+    return {
+        "hours": seconds // 3600,
+        "minutes": seconds // 60 % 60,
+        "seconds": seconds % 60,
+        "milliseconds": 0,
+    }
+
+
+class FakeLibrary:
+    """Synthetic Kodi library, generated from a seed.
+
+    Only the titles are kept in memory: the items are built when asked.
+    Songs are grouped by album and albums by artist, in ID order, so the
+    items related to another one are a range of IDs.
+    """
+
+    def __init__(
+        self,
+        songs: int = 10000,
+        movies: int = 2000,
+        tvshows: int = 200,
+        musicvideos: int = 500,
+        channels: int = 300,
+        seed: int = 0,
+    ) -> None:
+        """Initialisation."""
+        albums = -(-songs // SONGS_PER_ALBUM)
+        self.seed = seed
+        self.counts = {
+            "songs": songs,
+            "albums": albums,
+            "artists": -(-albums // ALBUMS_PER_ARTIST),
+            "movies": movies,
+            "tvshows": tvshows,
+            "episodes": tvshows * SEASONS_PER_SHOW * EPISODES_PER_SEASON,
+            "musicvideos": musicvideos,
+            "channels": channels,
+        }
+        rng = random.Random(seed)
+        self._titles = {
+            kind: [
+                " ".join(
+                    rng.choice(WORDS).capitalize() for _ in range(rng.randint(1, 4))
+                )
+                for _ in range(count)
+            ]
+            for kind, count in self.counts.items()
+        }
+        self._folded = {
+            kind: [title.casefold() for title in titles]
+            for kind, titles in self._titles.items()
+        }
+        self._ranks: dict[tuple[str, str], list[int]] = {}
+        # Number of items scanned by the filters and sorts
+        self.scanned = 0
+
+    def title(self, kind: str, item_id: int) -> str:
+        """Return the title of an item."""
+        return self._titles[kind][item_id - 1]
+
+    def set_title(self, kind: str, item_id: int, title: str) -> None:
+        """Rename an item (as `*.Set*Details` does)."""
+        if not self.exists(kind, item_id):
+            raise RpcError(ERROR_INVALID_PARAMS)
+        self._titles[kind][item_id - 1] = title
+        self._folded[kind][item_id - 1] = title.casefold()
+        self._ranks.pop((kind, "title"), None)
+
+    def exists(self, kind: str, item_id: Any) -> bool:
+        """Return True if the library holds the item."""
+        return isinstance(item_id, int) and 1 <= item_id <= self.counts[kind]
+
+    def item(self, kind: str, item_id: int) -> dict:
+        """Build an item with all its fields."""
+        if not self.exists(kind, item_id):
+            raise RpcError(ERROR_INVALID_PARAMS)
+        return getattr(self, f"_build_{kind}")(item_id)
+
+    def project(self, kind: str, item_id: int, properties) -> dict:
+        """Return an item as Kodi lists it: its ID, label and properties."""
+        item = self.item(kind, item_id)
+        projected = {_KINDS[kind][0]: item_id, "label": item["label"]}
+        for prop in properties or ():
+            projected[prop] = item.get(prop, "")
+        return projected
+
+    def query(
+        self,
+        kind: str,
+        properties=None,
+        filter_=None,
+        sort=None,
+        limits=None,
+        related: dict | None = None,
+    ) -> dict:
+        """Run a `Get<kind>` request: filter, sort, then page the items."""
+        ids: Any = range(1, self.counts[kind] + 1)
+        for key, value in (related or {}).items():
+            ids = self._filter_related(kind, ids, key, value)
+        if filter_:
+            ids = self._filter(kind, ids, filter_)
+
+        start = int((limits or {}).get("start", 0))
+        end = (limits or {}).get("end", -1)
+        end = len(ids) if end is None or end < 0 else min(int(end), len(ids))
+        page = self._sort(kind, ids, sort, end)[start:end]
+        return {
+            kind: [self.project(kind, item_id, properties) for item_id in page],
+            "limits": {"start": start, "end": start + len(page), "total": len(ids)},
+        }
+
+    def seasons(self, tvshow_id: int, properties) -> dict:
+        """Return the seasons of a TV show."""
+        if not self.exists("tvshows", tvshow_id):
+            raise RpcError(ERROR_INVALID_PARAMS)
+        seasons = []
+        for season in range(1, SEASONS_PER_SHOW + 1):
+            item = {
+                "label": f"Season {season}",
+                "title": f"Season {season}",
+                "season": season,
+                "tvshowid": tvshow_id,
+                "showtitle": self.title("tvshows", tvshow_id),
+                "episode": EPISODES_PER_SEASON,
+                "thumbnail": _image(f"tv/{tvshow_id}/season{season}.jpg"),
+            }
+            item["art"] = {"poster": item["thumbnail"]}
+            seasons.append(
+                {
+                    "seasonid": (tvshow_id - 1) * SEASONS_PER_SHOW + season,
+                    "label": item["label"],
+                    **{prop: item.get(prop, "") for prop in properties or ()},
+                }
+            )
+        return {
+            "seasons": seasons,
+            "limits": {"start": 0, "end": len(seasons), "total": len(seasons)},
+        }
+
+    def playlist_file_songs(self, path: str) -> list[int]:
+        """Return the songs of a music playlist file."""
+        rng = random.Random(f"{self.seed}:{path}")
+        return [
+            rng.randint(1, self.counts["songs"]) for _ in range(SONGS_PER_PLAYLIST_FILE)
+        ]
+
+    def related_range(self, kind: str, key: str, value: Any) -> range:
+        per_artist = ALBUMS_PER_ARTIST * SONGS_PER_ALBUM
+        per_show = SEASONS_PER_SHOW * EPISODES_PER_SEASON
+        sizes = {
+            ("songs", "albumid"): SONGS_PER_ALBUM,
+            ("songs", "artistid"): per_artist,
+            ("albums", "artistid"): ALBUMS_PER_ARTIST,
+            ("episodes", "tvshowid"): per_show,
+        }
+        size = sizes.get((kind, key))
+        if size is None or not isinstance(value, int):
+            raise RpcError(ERROR_INVALID_PARAMS)
+        return range(
+            max((value - 1) * size + 1, 1),
+            min(value * size, self.counts[kind]) + 1,
+        )
+
+    def _filter_related(self, kind: str, ids, key: str, value: Any):
+        if kind == "episodes" and key == "season":
+            return [
+                item_id
+                for item_id in ids
+                if (item_id - 1) // EPISODES_PER_SEASON % SEASONS_PER_SHOW + 1 == value
+            ]
+        related = self.related_range(kind, key, value)
+        if isinstance(ids, range):
+            return [item_id for item_id in related if item_id in ids]
+        return [item_id for item_id in ids if item_id in related]
+
+    def _filter(self, kind: str, ids, filter_: dict):
+        if "and" in filter_:
+            for rule in filter_["and"]:
+                ids = self._filter(kind, ids, rule)
+            return ids
+        if "or" in filter_:
+            matched: set[int] = set()
+            for rule in filter_["or"]:
+                matched.update(self._filter(kind, ids, rule))
+            return [item_id for item_id in ids if item_id in matched]
+        for key in ("artistid", "albumid", "tvshowid"):
+            if key in filter_:
+                return self._filter_related(kind, ids, key, filter_[key])
+
+        field = filter_.get("field")
+        operator = filter_.get("operator", "contains")
+        value = str(filter_.get("value", "")).casefold()
+        tests = {
+            "contains": lambda text: value in text,
+            "doesnotcontain": lambda text: value not in text,
+            "is": lambda text: value == text,
+            "isnot": lambda text: value != text,
+            "startswith": lambda text: text.startswith(value),
+            "endswith": lambda text: text.endswith(value),
+            # Dates are compared as text (same format)
+            "after": lambda text: text > value,
+            "before": lambda text: text < value,
+        }
+        if field is None or operator not in tests:
+            raise RpcError(ERROR_INVALID_PARAMS)
+
+        test = tests[operator]
+        self.scanned += len(ids)
+        if field in _TITLE_FIELDS[kind]:
+            folded = self._folded[kind]
+            return [item_id for item_id in ids if test(folded[item_id - 1])]
+        return [
+            item_id
+            for item_id in ids
+            if test(self._text(self.item(kind, item_id).get(field)))
+        ]
+
+    @staticmethod
+    def _text(value: Any) -> str:
+        if isinstance(value, list):
+            value = " / ".join(str(part) for part in value)
+        return str(value if value is not None else "").casefold()
+
+    def _sort(self, kind: str, ids, sort: dict | None, count: int) -> list[int]:
+        method = (sort or {}).get("method", "none")
+        descending = (sort or {}).get("order") == "descending"
+        if method in _TITLE_SORTS:
+            key = self._rank(kind, "title").__getitem__
+        elif method == "lastplayed":
+            key = self._rank(kind, "lastplayed").__getitem__
+        else:
+            # IDs are in the order the items were added
+            return list(reversed(ids) if descending else ids)
+
+        self.scanned += len(ids)
+        if count < len(ids) // 8:
+            select = heapq.nlargest if descending else heapq.nsmallest
+            return select(count, ids, key=key)
+        return sorted(ids, key=key, reverse=descending)
+
+    def _rank(self, kind: str, order: str) -> list[int]:
+        """Return the position of each item ID in the given order."""
+        ranks = self._ranks.get((kind, order))
+        if ranks is None:
+            ids = list(range(1, self.counts[kind] + 1))
+            if order == "title":
+                folded = self._folded[kind]
+                ids.sort(key=lambda item_id: folded[item_id - 1])
+            else:
+                random.Random(f"{self.seed}:{kind}:{order}").shuffle(ids)
+            ranks = [0] * (len(ids) + 1)
+            for rank, item_id in enumerate(ids):
+                ranks[item_id] = rank
+            self._ranks[(kind, order)] = ranks
+        return ranks
+
+    def _last_played(self, kind: str, item_id: int) -> str:
+        return _date(-3600 * self._rank(kind, "lastplayed")[item_id])
+
+    def _build_songs(self, song_id: int) -> dict:
+        album_id = (song_id - 1) // SONGS_PER_ALBUM + 1
+        artist_id = (album_id - 1) // ALBUMS_PER_ARTIST + 1
+        track = (song_id - 1) % SONGS_PER_ALBUM + 1
+        title = self.title("songs", song_id)
+        artist = self.title("artists", artist_id)
+        thumbnail = _image(f"music/{artist_id}/{album_id}/cover.jpg")
+        return {
+            "label": title,
+            "title": title,
+            "album": self.title("albums", album_id),
+            "albumid": album_id,
+            "artist": [artist],
+            "artistid": [artist_id],
+            "albumartist": [artist],
+            "albumartistid": [artist_id],
+            "displayartist": artist,
+            "duration": 120 + song_id * 37 % 300,
+            "track": track,
+            "disc": 1,
+            "year": 1960 + album_id % 60,
+            "genre": [_GENRES[artist_id % len(_GENRES)]],
+            "thumbnail": thumbnail,
+            "art": {"thumb": thumbnail},
+            "file": f"smb://nas/music/{artist_id}/{album_id}/{track:02d}.flac",
+            "playcount": song_id % 7,
+            "rating": song_id % 11,
+            "lastplayed": self._last_played("songs", song_id),
+            "dateadded": _date(600 * song_id),
+        }
+
+    def _build_albums(self, album_id: int) -> dict:
+        artist_id = (album_id - 1) // ALBUMS_PER_ARTIST + 1
+        title = self.title("albums", album_id)
+        artist = self.title("artists", artist_id)
+        thumbnail = _image(f"music/{artist_id}/{album_id}/cover.jpg")
+        return {
+            "label": title,
+            "title": title,
+            "artist": [artist],
+            "artistid": [artist_id],
+            "displayartist": artist,
+            "year": 1960 + album_id % 60,
+            "genre": [_GENRES[artist_id % len(_GENRES)]],
+            "thumbnail": thumbnail,
+            "art": {"thumb": thumbnail},
+            "playcount": album_id % 5,
+            "lastplayed": self._last_played("albums", album_id),
+            "dateadded": _date(6000 * album_id),
+        }
+
+    def _build_artists(self, artist_id: int) -> dict:
+        name = self.title("artists", artist_id)
+        return {
+            "label": name,
+            "artist": name,
+            "genre": [_GENRES[artist_id % len(_GENRES)]],
+            "thumbnail": _image(f"music/{artist_id}/artist.jpg"),
+            "fanart": _image(f"music/{artist_id}/fanart.jpg"),
+        }
+
+    def _build_movies(self, movie_id: int) -> dict:
+        title = self.title("movies", movie_id)
+        thumbnail = _image(f"movies/{movie_id}/poster.jpg")
+        return {
+            "label": title,
+            "title": title,
+            "year": 1950 + movie_id % 75,
+            "genre": [_GENRES[movie_id % len(_GENRES)]],
+            "rating": movie_id % 100 / 10,
+            "runtime": 5400 + movie_id % 3600,
+            "thumbnail": thumbnail,
+            "art": {"poster": thumbnail},
+            "file": f"smb://nas/movies/{movie_id}/movie.mkv",
+            "playcount": movie_id % 3,
+            "dateadded": _date(3600 * movie_id),
+        }
+
+    def _build_tvshows(self, tvshow_id: int) -> dict:
+        title = self.title("tvshows", tvshow_id)
+        thumbnail = _image(f"tv/{tvshow_id}/poster.jpg")
+        return {
+            "label": title,
+            "title": title,
+            "year": 1980 + tvshow_id % 45,
+            "genre": [_GENRES[tvshow_id % len(_GENRES)]],
+            "season": SEASONS_PER_SHOW,
+            "episode": SEASONS_PER_SHOW * EPISODES_PER_SEASON,
+            "thumbnail": thumbnail,
+            "art": {"poster": thumbnail},
+        }
+
+    def _build_episodes(self, episode_id: int) -> dict:
+        per_show = SEASONS_PER_SHOW * EPISODES_PER_SEASON
+        tvshow_id = (episode_id - 1) // per_show + 1
+        season = (episode_id - 1) % per_show // EPISODES_PER_SEASON + 1
+        episode = (episode_id - 1) % EPISODES_PER_SEASON + 1
+        title = self.title("episodes", episode_id)
+        thumbnail = _image(f"tv/{tvshow_id}/{season}x{episode:02d}.jpg")
+        return {
+            "label": f"{season}x{episode:02d}. {title}",
+            "title": title,
+            "season": season,
+            "episode": episode,
+            "seasonid": (tvshow_id - 1) * SEASONS_PER_SHOW + season,
+            "tvshowid": tvshow_id,
+            "showtitle": self.title("tvshows", tvshow_id),
+            "runtime": 2400,
+            "thumbnail": thumbnail,
+            "art": {"thumb": thumbnail},
+            "file": f"smb://nas/tv/{tvshow_id}/{season}x{episode:02d}.mkv",
+            "firstaired": _date(86400 * episode_id)[:10],
+            "dateadded": _date(1800 * episode_id),
+        }
+
+    def _build_musicvideos(self, musicvideo_id: int) -> dict:
+        artist_id = (musicvideo_id - 1) % max(self.counts["artists"], 1) + 1
+        title = self.title("musicvideos", musicvideo_id)
+        thumbnail = _image(f"musicvideos/{musicvideo_id}/thumb.jpg")
+        return {
+            "label": title,
+            "title": title,
+            "artist": [self.title("artists", artist_id)],
+            "album": self.title("albums", (artist_id - 1) * ALBUMS_PER_ARTIST + 1),
+            "year": 1980 + musicvideo_id % 45,
+            "genre": [_GENRES[artist_id % len(_GENRES)]],
+            "runtime": 180 + musicvideo_id % 240,
+            "thumbnail": thumbnail,
+            "art": {"thumb": thumbnail},
+            "file": f"smb://nas/musicvideos/{musicvideo_id}.mkv",
+            "dateadded": _date(7200 * musicvideo_id),
+        }
+
+    def _build_channels(self, channel_id: int) -> dict:
+        title = self.title("channels", channel_id)
+        radio = channel_id > self.counts["channels"] * 4 // 5
+        return {
+            "label": title,
+            "channel": title,
+            "channeltype": "radio" if radio else "tv",
+            "channelnumber": channel_id,
+            "uniqueid": 1000 + channel_id,
+            "thumbnail": _image(f"pvr/{channel_id}.png"),
+            "hidden": False,
+            "locked": False,
+        }
+
+
+class FakeKodi:
+    """Players, playlists and JSON-RPC methods of the fake Kodi."""
+
+    def __init__(
+        self,
+        library: FakeLibrary,
+        latencies: dict[str, float] | None = None,
+        default_latency: float = 0,
+        scan_cost: float = 0,
+        workers: int = 4,
+    ) -> None:
+        """Initialisation. Latencies and costs are in seconds."""
+        self.library = library
+        self._latencies = latencies or {}
+        self._default_latency = default_latency
+        self._scan_cost = scan_cost
+        self._workers = asyncio.Semaphore(workers)
+        self._clients: set[web.WebSocketResponse] = set()
+        self._tasks: set[asyncio.Task] = set()
+        # Entries are (kind, id), or ("file", path)
+        self.playlists: dict[int, list[tuple[str, Any]]] = {
+            PLAYER_ID_AUDIO: [],
+            PLAYER_ID_VIDEO: [],
+        }
+        # Active player: playerid, position, entry played, start time
+        self.player: dict[str, Any] | None = None
+        self.stats: dict[str, dict[str, int]] = {}
+        self.round_trips = 0
+        self.notifications = 0
+        self._methods = {
+            "JSONRPC.Ping": lambda params: "pong",
+            "JSONRPC.Version": lambda params: {
+                "version": {"major": 13, "minor": 5, "patch": 0}
+            },
+            "Application.GetProperties": self._application_properties,
+            "Application.SetMute": lambda params: bool(params.get("mute")),
+            "Application.SetVolume": lambda params: params.get("volume", 100),
+            "GUI.ShowNotification": lambda params: "OK",
+            "Input.ExecuteAction": lambda params: "OK",
+            "XBMC.GetInfoBooleans": self._info_booleans,
+            "XBMC.GetInfoLabels": lambda params: {
+                label: "" for label in params.get("labels", [])
+            },
+            "Files.GetDirectory": self._get_directory,
+            "PVR.GetChannels": self._get_channels,
+            "AudioLibrary.GetSongs": self._list("songs"),
+            "AudioLibrary.GetAlbums": self._list("albums"),
+            "AudioLibrary.GetArtists": self._list("artists"),
+            "AudioLibrary.GetSongDetails": self._details("songs"),
+            "AudioLibrary.GetAlbumDetails": self._details("albums"),
+            "AudioLibrary.GetArtistDetails": self._details("artists"),
+            "AudioLibrary.SetSongDetails": self._set_details("songs"),
+            "AudioLibrary.SetAlbumDetails": self._set_details("albums"),
+            "AudioLibrary.GetRecentlyAddedSongs": self._recently_added("songs"),
+            "AudioLibrary.GetRecentlyAddedAlbums": self._recently_added("albums"),
+            "AudioLibrary.GetRecentlyPlayedSongs": self._recently_played("songs"),
+            "AudioLibrary.GetRecentlyPlayedAlbums": self._recently_played("albums"),
+            "VideoLibrary.GetMovies": self._list("movies"),
+            "VideoLibrary.GetTVShows": self._list("tvshows"),
+            "VideoLibrary.GetEpisodes": self._list("episodes", ("tvshowid", "season")),
+            "VideoLibrary.GetMusicVideos": self._list("musicvideos"),
+            "VideoLibrary.GetSeasons": lambda params: self.library.seasons(
+                params.get("tvshowid"), params.get("properties")
+            ),
+            "VideoLibrary.GetMovieDetails": self._details("movies"),
+            "VideoLibrary.GetTVShowDetails": self._details("tvshows"),
+            "VideoLibrary.GetEpisodeDetails": self._details("episodes"),
+            "VideoLibrary.GetMusicVideoDetails": self._details("musicvideos"),
+            "VideoLibrary.SetMovieDetails": self._set_details("movies"),
+            "VideoLibrary.SetTVShowDetails": self._set_details("tvshows"),
+            "VideoLibrary.SetEpisodeDetails": self._set_details("episodes"),
+            "VideoLibrary.SetMusicVideoDetails": self._set_details("musicvideos"),
+            "VideoLibrary.GetRecentlyAddedMovies": self._recently_added("movies"),
+            "VideoLibrary.GetRecentlyAddedEpisodes": self._recently_added("episodes"),
+            "VideoLibrary.GetRecentlyAddedMusicVideos": self._recently_added(
+                "musicvideos"
+            ),
+            "Player.GetActivePlayers": self._active_players,
+            "Player.GetProperties": self._player_properties,
+            "Player.GetItem": self._player_item,
+            "Player.Open": self._player_open,
+            "Player.GoTo": self._player_goto,
+            "Player.Stop": self._player_stop,
+            "Player.PlayPause": lambda params: {"speed": 1 if self.player else 0},
+            "Player.Seek": self._player_seek,
+            "Player.SetShuffle": lambda params: "OK",
+            "Playlist.GetItems": self._playlist_items,
+            "Playlist.GetProperties": self._playlist_properties,
+            "Playlist.Add": self._playlist_add,
+            "Playlist.Insert": self._playlist_insert,
+            "Playlist.Remove": self._playlist_remove,
+            "Playlist.Clear": self._playlist_clear,
+        }
+
+    # ------------------------------------------------------------------
+    # JSON-RPC dispatch
+
+    async def async_handle_text(self, text: str) -> str | None:
+        """Answer a JSON-RPC request or batch, None for notifications."""
+        self.round_trips += 1
+        try:
+            request = json.loads(text)
+        except ValueError:
+            return json.dumps({"jsonrpc": "2.0", "id": None, "error": ERROR_PARSE})
+
+        if isinstance(request, list):
+            if not request:
+                return json.dumps(
+                    {"jsonrpc": "2.0", "id": None, "error": ERROR_INVALID_REQUEST}
+                )
+            # Kodi runs the calls of a batch one after the other
+            responses = [await self._async_handle_call(call) for call in request]
+            responses = [response for response in responses if response is not None]
+            return f"[{','.join(responses)}]" if responses else None
+        return await self._async_handle_call(request)
+
+    async def _async_handle_call(self, request: Any) -> str | None:
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return json.dumps(
+                {"jsonrpc": "2.0", "id": None, "error": ERROR_INVALID_REQUEST}
+            )
+
+        method = request["method"]
+        async with self._workers:
+            scanned = self.library.scanned
+            try:
+                handler = self._methods.get(method)
+                if handler is None:
+                    raise RpcError(ERROR_METHOD_NOT_FOUND)
+                response = {"result": handler(self._named_params(method, request))}
+            except RpcError as err:
+                response = {"error": err.error}
+            except (AttributeError, KeyError, TypeError, ValueError) as err:
+                _LOGGER.debug("Invalid params for %s: %s", method, err)
+                response = {"error": ERROR_INVALID_PARAMS}
+
+            delay = self._latencies.get(method, self._default_latency)
+            delay += (self.library.scanned - scanned) * self._scan_cost
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        if "id" not in request:
+            return None
+        text = json.dumps({"jsonrpc": "2.0", "id": request["id"], **response})
+        stats = self.stats.setdefault(method, {"calls": 0, "errors": 0, "bytes": 0})
+        stats["calls"] += 1
+        stats["errors"] += "error" in response
+        stats["bytes"] += len(text)
+        return text
+
+    @staticmethod
+    def _named_params(method: str, request: dict) -> dict:
+        params = request.get("params")
+        if params is None:
+            return {}
+        if isinstance(params, dict):
+            return params
+        names = _POSITIONAL_PARAMS.get(method, [])
+        if not isinstance(params, list) or len(params) > len(names):
+            raise RpcError(ERROR_INVALID_PARAMS)
+        return dict(zip(names, params))
+
+    def notify(self, method: str, data: Any) -> None:
+        """Push a notification to the websocket clients."""
+        text = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": {"data": data, "sender": "xbmc"},
+            }
+        )
+        for client in list(self._clients):
+            self.notifications += 1
+            self._create_task(client.send_str(text))
+
+    def _create_task(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ------------------------------------------------------------------
+    # Library
+
+    def _list(self, kind: str, related_keys: tuple[str, ...] = ()):
+        def handler(params: dict) -> dict:
+            return self.library.query(
+                kind,
+                params.get("properties"),
+                params.get("filter"),
+                params.get("sort"),
+                params.get("limits"),
+                {key: params[key] for key in related_keys if key in params},
+            )
+
+        return handler
+
+    def _details(self, kind: str):
+        id_key, item_type = _KINDS[kind]
+
+        def handler(params: dict) -> dict:
+            return {
+                f"{item_type}details": self.library.project(
+                    kind, params[id_key], params.get("properties")
+                )
+            }
+
+        return handler
+
+    def _set_details(self, kind: str):
+        id_key, item_type = _KINDS[kind]
+        library = "AudioLibrary" if kind in ("songs", "albums") else "VideoLibrary"
+
+        def handler(params: dict) -> str:
+            item_id = params[id_key]
+            if "title" in params:
+                self.library.set_title(kind, item_id, str(params["title"]))
+            # Kodi sends the id and type of the item, at the top level
+            self.notify(f"{library}.OnUpdate", {"id": item_id, "type": item_type})
+            return "OK"
+
+        return handler
+
+    def _recently_added(self, kind: str):
+        def handler(params: dict) -> dict:
+            return self.library.query(
+                kind,
+                params.get("properties"),
+                sort={"method": "dateadded", "order": "descending"},
+                limits=params.get("limits", {"start": 0, "end": 25}),
+            )
+
+        return handler
+
+    def _recently_played(self, kind: str):
+        def handler(params: dict) -> dict:
+            return self.library.query(
+                kind,
+                params.get("properties"),
+                sort={"method": "lastplayed", "order": "descending"},
+                limits=params.get("limits", {"start": 0, "end": 25}),
+            )
+
+        return handler
+
+    def _get_channels(self, params: dict) -> dict:
+        group = params.get("channelgroupid")
+        if group not in ("alltv", "allradio"):
+            raise RpcError(ERROR_INVALID_PARAMS)
+        radio_start = self.library.counts["channels"] * 4 // 5
+        ids = (
+            range(1, radio_start + 1)
+            if group == "alltv"
+            else range(radio_start + 1, self.library.counts["channels"] + 1)
+        )
+        result = self.library.query(
+            "channels",
+            params.get("properties"),
+            sort=params.get("sort"),
+            limits=params.get("limits"),
+            related=None,
+        )
+        channels = [
+            channel for channel in result["channels"] if channel["channelid"] in ids
+        ]
+        return {
+            "channels": channels,
+            "limits": {"start": 0, "end": len(channels), "total": len(channels)},
+        }
+
+    def _info_booleans(self, params: dict) -> dict:
+        channels = self.library.counts["channels"]
+        values = {
+            "PVR.HasTVChannels": channels * 4 // 5 > 0,
+            "PVR.HasRadioChannels": channels - channels * 4 // 5 > 0,
+        }
+        return {flag: values.get(flag, False) for flag in params.get("booleans", [])}
+
+    def _get_directory(self, params: dict) -> dict:
+        directory = str(params.get("directory", "")).rstrip("/")
+        if directory != MUSIC_PLAYLISTS_DIRECTORY:
+            raise RpcError(ERROR_INVALID_PARAMS)
+        files = [
+            {
+                "file": path,
+                "filetype": "file",
+                "label": path.rsplit("/", 1)[-1],
+                "type": "unknown",
+            }
+            for path in MUSIC_PLAYLISTS
+        ]
+        return {
+            "files": files,
+            "limits": {"start": 0, "end": len(files), "total": len(files)},
+        }
+
+    def _application_properties(self, params: dict) -> dict:
+        values = {
+            "volume": 80,
+            "muted": False,
+            "name": "Kodi",
+            "version": {"major": 21, "minor": 0, "revision": "fake", "tag": "stable"},
+        }
+        return {prop: values.get(prop) for prop in params.get("properties", [])}
+
+    # ------------------------------------------------------------------
+    # Players and playlists
+
+    def _entry_item(self, entry: tuple[str, Any], properties) -> dict:
+        kind, value = entry
+        if kind == "file":
+            item = {"label": value.rsplit("/", 1)[-1], "type": "unknown"}
+            item.update({prop: "" for prop in properties or ()})
+            item["file"] = value
+            return item
+        item = self.library.project(kind, value, properties)
+        del item[_KINDS[kind][0]]
+        item["id"] = value
+        item["type"] = _KINDS[kind][1]
+        return item
+
+    def _resolve(self, item: Any) -> list[tuple[str, Any]]:
+        """Return the playlist entries added for a Playlist/Player item."""
+        if isinstance(item, list):
+            return [entry for part in item for entry in self._resolve(part)]
+        if not isinstance(item, dict) or len(item) != 1:
+            raise RpcError(ERROR_INVALID_PARAMS)
+        ((key, value),) = item.items()
+        if key == "file":
+            return [("file", str(value))]
+        if key == "directory":
+            if value not in MUSIC_PLAYLISTS:
+                raise RpcError(ERROR_INVALID_PARAMS)
+            return [
+                ("songs", song_id)
+                for song_id in self.library.playlist_file_songs(value)
+            ]
+        if key in ("albumid", "artistid"):
+            return [
+                ("songs", song_id)
+                for song_id in self.library.related_range("songs", key, value)
+            ]
+        kind = _KIND_BY_ID_KEY.get(key)
+        if kind is None or not self.library.exists(kind, value):
+            raise RpcError(ERROR_INVALID_PARAMS)
+        return [(kind, value)]
+
+    def _get_player(self, params: dict) -> dict:
+        if self.player is None or self.player["playerid"] != params.get("playerid"):
+            raise RpcError(ERROR_FAILED)
+        return self.player
+
+    def _entry_duration(self, entry: tuple[str, Any]) -> int:
+        kind, value = entry
+        if kind == "file":
+            return 240
+        item = self.library.item(kind, value)
+        return int(item.get("duration") or item.get("runtime") or 0)
+
+    def _play(self, playlist_id: int, position: int) -> dict:
+        entries = self.playlists[playlist_id]
+        if not 0 <= position < len(entries):
+            raise RpcError(ERROR_INVALID_PARAMS)
+        return self._start(playlist_id, position, entries[position])
+
+    def _start(self, player_id: int, position: int, entry: tuple) -> dict:
+        self.player = {
+            "playerid": player_id,
+            "position": position,
+            "entry": entry,
+            "started": time.monotonic(),
+        }
+        item = self._entry_item(entry, ())
+        played = {"type": item["type"]}
+        if "id" in item:
+            played["id"] = item["id"]
+        self.notify(
+            "Player.OnPlay",
+            {"item": played, "player": {"playerid": player_id, "speed": 1}},
+        )
+        return played
+
+    def stop(self) -> None:
+        """Stop the active player."""
+        if self.player is not None:
+            self.player = None
+            self.notify("Player.OnStop", {"end": False, "item": {"type": "unknown"}})
+
+    def fill_playlist(self, playlist_id: int, size: int, offset: int = 1) -> None:
+        """Replace a playlist with `size` songs (or movies)."""
+        kind = "songs" if playlist_id == PLAYER_ID_AUDIO else "movies"
+        count = self.library.counts[kind]
+        self.playlists[playlist_id] = [
+            (kind, (offset - 1 + index) % count + 1) for index in range(size)
+        ]
+        if self.player is not None and self.player["playerid"] == playlist_id:
+            self.player["position"] = -1
+
+    def play_next(self, position: int | None = None) -> dict:
+        """Play the next (or given) item of the active playlist."""
+        if self.player is None:
+            raise RpcError(ERROR_FAILED)
+        player_id = self.player["playerid"]
+        if position is None:
+            size = len(self.playlists[player_id])
+            position = (self.player["position"] + 1) % max(size, 1)
+        return self._play(player_id, position)
+
+    def _active_players(self, params: dict) -> list:
+        if self.player is None:
+            return []
+        player_id = self.player["playerid"]
+        return [
+            {
+                "playerid": player_id,
+                "playertype": "internal",
+                "type": "audio" if player_id == PLAYER_ID_AUDIO else "video",
+            }
+        ]
+
+    def _player_properties(self, params: dict) -> dict:
+        player = self._get_player(params)
+        duration = self._entry_duration(player["entry"])
+        elapsed = int(time.monotonic() - player["started"]) % max(duration, 1)
+        values = {
+            "position": player["position"],
+            "playlistid": player["playerid"],
+            "type": "audio" if player["playerid"] == PLAYER_ID_AUDIO else "video",
+            "speed": 1,
+            "live": player["entry"][0] == "channels",
+            "time": _duration(elapsed),
+            "totaltime": _duration(duration),
+            "percentage": 100 * elapsed / max(duration, 1),
+            "repeat": "off",
+            "shuffled": False,
+            "partymode": False,
+        }
+        return {
+            prop: values[prop]
+            for prop in params.get("properties", [])
+            if prop in values
+        }
+
+    def _player_item(self, params: dict) -> dict:
+        player = self._get_player(params)
+        return {"item": self._entry_item(player["entry"], params.get("properties"))}
+
+    def _player_open(self, params: dict) -> str:
+        item = params.get("item") or {}
+        if "playlistid" in item:
+            self._play(item["playlistid"], item.get("position", 0))
+        elif "channelid" in item:
+            if not self.library.exists("channels", item["channelid"]):
+                raise RpcError(ERROR_INVALID_PARAMS)
+            self._start(PLAYER_ID_VIDEO, -1, ("channels", item["channelid"]))
+        else:
+            entries = self._resolve(item)
+            kind = entries[0][0] if entries else "songs"
+            playlist_id = PLAYER_ID_AUDIO if kind == "songs" else PLAYER_ID_VIDEO
+            self.playlists[playlist_id] = entries
+            self._play(playlist_id, 0)
+        return "OK"
+
+    def _player_goto(self, params: dict) -> str:
+        player = self._get_player(params)
+        to = params.get("to")
+        size = len(self.playlists[player["playerid"]])
+        if to == "next":
+            to = player["position"] + 1
+        elif to == "previous":
+            to = player["position"] - 1
+        if not isinstance(to, int) or not 0 <= to < size:
+            raise RpcError(ERROR_INVALID_PARAMS)
+        self._play(player["playerid"], to)
+        return "OK"
+
+    def _player_stop(self, params: dict) -> str:
+        self._get_player(params)
+        self.stop()
+        return "OK"
+
+    def _player_seek(self, params: dict) -> dict:
+        player = self._get_player(params)
+        duration = self._entry_duration(player["entry"])
+        return {
+            "percentage": 0,
+            "time": _duration(0),
+            "totaltime": _duration(duration),
+        }
+
+    def _playlist(self, params: dict) -> list:
+        playlist = self.playlists.get(params.get("playlistid"))
+        if playlist is None:
+            raise RpcError(ERROR_INVALID_PARAMS)
+        return playlist
+
+    def _playlist_items(self, params: dict) -> dict:
+        playlist = self._playlist(params)
+        limits = params.get("limits") or {}
+        start = int(limits.get("start", 0))
+        end = limits.get("end", -1)
+        end = len(playlist) if end is None or end < 0 else min(end, len(playlist))
+        items = [
+            self._entry_item(entry, params.get("properties"))
+            for entry in playlist[start:end]
+        ]
+        return {
+            "items": items,
+            "limits": {
+                "start": start,
+                "end": start + len(items),
+                "total": len(playlist),
+            },
+        }
+
+    def _playlist_properties(self, params: dict) -> dict:
+        playlist_id = params.get("playlistid")
+        values = {
+            "playlistid": playlist_id,
+            "size": len(self._playlist(params)),
+            "type": "audio" if playlist_id == PLAYER_ID_AUDIO else "video",
+        }
+        return {
+            prop: values[prop]
+            for prop in params.get("properties", [])
+            if prop in values
+        }
+
+    def _playlist_insert(self, params: dict) -> str:
+        playlist = self._playlist(params)
+        playlist_id = params["playlistid"]
+        position = params.get("position")
+        if not isinstance(position, int) or not 0 <= position <= len(playlist):
+            raise RpcError(ERROR_INVALID_PARAMS)
+        entries = self._resolve(params.get("item"))
+        playlist[position:position] = entries
+        player = self.player
+        if (
+            player is not None
+            and player["playerid"] == playlist_id
+            and 0 <= position <= player["position"]
+        ):
+            player["position"] += len(entries)
+        for offset, entry in enumerate(entries):
+            item = self._entry_item(entry, ())
+            self.notify(
+                "Playlist.OnAdd",
+                {
+                    "item": {key: item[key] for key in ("id", "type") if key in item},
+                    "playlistid": playlist_id,
+                    "position": position + offset,
+                },
+            )
+        return "OK"
+
+    def _playlist_add(self, params: dict) -> str:
+        return self._playlist_insert(
+            {**params, "position": len(self._playlist(params))}
+        )
+
+    def _playlist_remove(self, params: dict) -> str:
+        playlist = self._playlist(params)
+        playlist_id = params["playlistid"]
+        position = params.get("position")
+        if not isinstance(position, int) or not 0 <= position < len(playlist):
+            raise RpcError(ERROR_INVALID_PARAMS)
+        player = self.player
+        if player is not None and player["playerid"] == playlist_id:
+            if position == player["position"]:
+                # Kodi does not remove the item being played
+                raise RpcError(ERROR_FAILED)
+            if position < player["position"]:
+                player["position"] -= 1
+        del playlist[position]
+        self.notify(
+            "Playlist.OnRemove", {"playlistid": playlist_id, "position": position}
+        )
+        return "OK"
+
+    def _playlist_clear(self, params: dict) -> str:
+        self._playlist(params).clear()
+        player = self.player
+        if player is not None and player["playerid"] == params["playlistid"]:
+            player["position"] = -1
+        self.notify("Playlist.OnClear", {"playlistid": params["playlistid"]})
+        return "OK"
+
+    # ------------------------------------------------------------------
+    # HTTP and websocket endpoints
+
+    def create_app(self) -> web.Application:
+        """Return the web application serving JSON-RPC and the controls."""
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/jsonrpc", self._async_http_jsonrpc)
+        app.router.add_get("/jsonrpc", self._async_ws_jsonrpc)
+        app.router.add_get("/bench/stats", self._async_bench_stats)
+        app.router.add_post("/bench/reset", self._async_bench_reset)
+        app.router.add_post("/bench/library", self._async_bench_library)
+        app.router.add_post("/bench/player", self._async_bench_player)
+        app.router.add_post("/bench/play", self._async_bench_play)
+        app.router.add_post("/bench/stop", self._async_bench_stop)
+        app.router.add_post("/bench/notify", self._async_bench_notify)
+        return app
+
+    async def _async_http_jsonrpc(self, request: web.Request) -> web.Response:
+        response = await self.async_handle_text(await request.text())
+        if response is None:
+            return web.Response(status=204)
+        return web.Response(text=response, content_type="application/json")
+
+    async def _async_ws_jsonrpc(self, request: web.Request) -> web.WebSocketResponse:
+        client = web.WebSocketResponse(max_msg_size=0)
+        await client.prepare(request)
+        self._clients.add(client)
+        _LOGGER.info("Websocket client connected (%d)", len(self._clients))
+        try:
+            async for message in client:
+                if message.type == WSMsgType.TEXT:
+                    self._create_task(self._async_ws_reply(client, message.data))
+        finally:
+            self._clients.discard(client)
+            _LOGGER.info("Websocket client disconnected (%d)", len(self._clients))
+        return client
+
+    async def _async_ws_reply(self, client: web.WebSocketResponse, text: str) -> None:
+        response = await self.async_handle_text(text)
+        if response is not None and not client.closed:
+            await client.send_str(response)
+
+    async def _async_bench_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "methods": self.stats,
+                "round_trips": self.round_trips,
+                "notifications": self.notifications,
+                "library": self.library.counts,
+            }
+        )
+
+    async def _async_bench_reset(self, request: web.Request) -> web.Response:
+        self.stats = {}
+        self.round_trips = 0
+        self.notifications = 0
+        return web.json_response({})
+
+    async def _async_bench_library(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        counts = self.library.counts
+        options = {
+            key: int(body.get(key, counts[key]))
+            for key in ("songs", "movies", "tvshows", "musicvideos", "channels")
+        }
+        options["seed"] = int(body.get("seed", self.library.seed))
+        self.library = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: FakeLibrary(**options)
+        )
+        self.stop()
+        for playlist in self.playlists.values():
+            playlist.clear()
+        for method in (
+            "AudioLibrary.OnScanFinished",
+            "VideoLibrary.OnScanFinished",
+            "PVR.OnScanFinished",
+        ):
+            self.notify(method, None)
+        return web.json_response(self.library.counts)
+
+    async def _async_bench_player(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        playlist_id = int(body.get("playlistid", PLAYER_ID_AUDIO))
+        self.fill_playlist(
+            playlist_id, int(body.get("size", 200)), int(body.get("offset", 1))
+        )
+        try:
+            played = self._play(playlist_id, int(body.get("position", 0)))
+        except RpcError as err:
+            return web.json_response({"error": err.error}, status=400)
+        return web.json_response(played)
+
+    async def _async_bench_play(self, request: web.Request) -> web.Response:
+        body = await request.json() if request.can_read_body else {}
+        try:
+            played = self.play_next(body.get("position"))
+        except RpcError as err:
+            return web.json_response({"error": err.error}, status=400)
+        return web.json_response(played)
+
+    async def _async_bench_stop(self, request: web.Request) -> web.Response:
+        self.stop()
+        return web.json_response({})
+
+    async def _async_bench_notify(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.notify(body["method"], body.get("data"))
+        return web.json_response({})
+
+
+def _parse_latencies(values: list[str]) -> tuple[float, dict[str, float]]:
+    """Parse `MS` (default) and `METHOD=MS` values, into seconds."""
+    default = 0.0
+    latencies = {}
+    for value in values:
+        method, _, milliseconds = value.rpartition("=")
+        if method:
+            latencies[method] = float(milliseconds) / 1000
+        else:
+            default = float(milliseconds) / 1000
+    return default, latencies
+
+
+async def async_serve(kodi: FakeKodi, host: str, ports: list[int]) -> None:
+    """Serve the fake Kodi on the given ports, until cancelled."""
+    runner = web.AppRunner(kodi.create_app())
+    await runner.setup()
+    try:
+        for port in ports:
+            await web.TCPSite(runner, host, port).start()
+        _LOGGER.info(
+            "Fake Kodi serving %s on %s, ports %s",
+            kodi.library.counts,
+            host,
+            ", ".join(str(port) for port in ports),
+        )
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    """Run the fake Kodi from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--http-port", type=int, default=8080)
+    parser.add_argument("--ws-port", type=int, default=9090)
+    parser.add_argument("--songs", type=int, default=10000)
+    parser.add_argument("--movies", type=int, default=2000)
+    parser.add_argument("--tvshows", type=int, default=200)
+    parser.add_argument("--musicvideos", type=int, default=500)
+    parser.add_argument("--channels", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--latency",
+        action="append",
+        default=[],
+        metavar="[METHOD=]MS",
+        help="latency of every method, or of one method (repeatable)",
+    )
+    parser.add_argument(
+        "--scan-cost",
+        type=float,
+        default=0,
+        metavar="US",
+        help="extra latency per library item filtered or sorted, in µs",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="calls processed at the same time",
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    default_latency, latencies = _parse_latencies(args.latency)
+
+    async def _async_main() -> None:
+        library = FakeLibrary(
+            songs=args.songs,
+            movies=args.movies,
+            tvshows=args.tvshows,
+            musicvideos=args.musicvideos,
+            channels=args.channels,
+            seed=args.seed,
+        )
+        kodi = FakeKodi(
+            library,
+            latencies,
+            default_latency,
+            args.scan_cost / 1_000_000,
+            args.workers,
+        )
+        await async_serve(kodi, args.host, [args.http_port, args.ws_port])
+
+    try:
+        asyncio.run(_async_main())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
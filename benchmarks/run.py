@@ -0,0 +1,770 @@
+"""Benchmark of the websocket commands and of the sensor.
+
+Drives a running Home Assistant where the core Kodi integration is
+connected to the fake Kodi (`python -m benchmarks.fake_kodi`), and a
+Kodi Media Sensors entry uses that Kodi entity. Every websocket command
+of `websocket/search.py` and `websocket/playlist.py` is run, as well as
+an update of the sensor `current_track`, and reported per run:
+- p50 / p95 latency, as seen by the websocket client
+- Kodi JSON-RPC calls (pings excluded) and the bytes Kodi answered,
+  including the calls made after the command answered (e.g. playlist
+  refreshes of the subscribers), until Kodi is quiet again; this also
+  counts the updates of the core Kodi media player
+- bytes of the websocket messages received for the command (and by
+  the subscription observing it, if any)
+
+The playlist commands are run while a delta playlist subscription is
+open, as when the card is displayed.
+
+Usage:
+    python -m benchmarks.run --token $HA_TOKEN --entry-id <entry_id> \\
+        --sizes 1000,50000,200000 --iterations 20 --json bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import json
+import math
+import os
+import sys
+import time
+from typing import Any
+
+import aiohttp
+
+from .fake_kodi import MUSIC_PLAYLISTS, PLAYER_ID_AUDIO, WORDS
+
+DOMAIN = "kodi_media_sensors"
+
+# Calls not caused by the commands (keep-alive of the core integration)
+_IGNORED_METHODS = {"JSONRPC.Ping"}
+
+
+class CommandError(Exception):
+    """A websocket command failed or timed out."""
+
+
+class HomeAssistantClient:
+    """Client of the Home Assistant websocket API."""
+
+    def __init__(self, websocket: aiohttp.ClientWebSocketResponse, timeout: float):
+        """Initialisation."""
+        self._websocket = websocket
+        self._timeout = timeout
+        self._id = 0
+        self._queues: dict[int, asyncio.Queue] = {}
+        self._bytes: dict[int, int] = {}
+        # Events received per subscription
+        self.events: dict[int, list[dict]] = {}
+        self._subscriptions: set[int] = set()
+        self._reader = asyncio.get_running_loop().create_task(self._async_read())
+
+    @classmethod
+    async def async_connect(
+        cls, session: aiohttp.ClientSession, url: str, token: str, timeout: float
+    ) -> HomeAssistantClient:
+        """Connect and authenticate."""
+        websocket = await session.ws_connect(url, max_msg_size=0)
+        await websocket.receive_json()
+        await websocket.send_json({"type": "auth", "access_token": token})
+        message = await websocket.receive_json()
+        if message.get("type") != "auth_ok":
+            raise CommandError(f"Authentication failed: {message}")
+        return cls(websocket, timeout)
+
+    async def async_close(self) -> None:
+        """Close the connection."""
+        await self._websocket.close()
+        self._reader.cancel()
+
+    async def _async_read(self) -> None:
+        async for message in self._websocket:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                continue
+            data = json.loads(message.data)
+            messages = data if isinstance(data, list) else [data]
+            for msg in messages:
+                msg_id = msg.get("id")
+                size = len(message.data) if len(messages) == 1 else len(json.dumps(msg))
+                self._bytes[msg_id] = self._bytes.get(msg_id, 0) + size
+                if msg.get("type") == "event" and msg_id in self.events:
+                    self.events[msg_id].append(msg["event"])
+                queue = self._queues.get(msg_id)
+                if queue is not None:
+                    queue.put_nowait(msg)
+
+    async def async_send(self, message: dict) -> int:
+        """Send a message, and return its ID."""
+        self._id += 1
+        self._queues[self._id] = asyncio.Queue()
+        self._bytes[self._id] = 0
+        await self._websocket.send_json({**message, "id": self._id})
+        return self._id
+
+    async def async_wait(
+        self, msg_id: int, predicate: Callable[[dict], bool] | None = None
+    ) -> dict:
+        """Return the next message (matching the predicate) of an ID.
+
+        Without predicate, waits for the result. Failed results raise
+        CommandError.
+        """
+        queue = self._queues[msg_id]
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), self._timeout)
+            except asyncio.TimeoutError as err:
+                raise CommandError(f"Timeout waiting for message {msg_id}") from err
+            if message.get("type") == "result" and not message.get("success"):
+                raise CommandError(message.get("error", {}).get("code", "error"))
+            if predicate is None:
+                if message.get("type") == "result":
+                    return message
+            elif message.get("type") == "event" and predicate(message["event"]):
+                return message
+
+    async def async_command(self, message: dict) -> dict:
+        """Run a command and return its result message."""
+        msg_id = await self.async_send(message)
+        try:
+            return await self.async_wait(msg_id)
+        finally:
+            self._queues.pop(msg_id, None)
+
+    @property
+    def last_id(self) -> int:
+        """Return the ID of the last message sent."""
+        return self._id
+
+    async def async_subscribe(self, message: dict) -> int:
+        """Run a subscription command, and return the subscription ID.
+
+        Its events are collected in `events`.
+        """
+        self.events[self._id + 1] = []
+        msg_id = await self.async_send(message)
+        self._subscriptions.add(msg_id)
+        await self.async_wait(msg_id)
+        return msg_id
+
+    async def async_unsubscribe(self, *keep: int) -> None:
+        """Cancel the subscriptions, except `keep`."""
+        for msg_id in self._subscriptions - set(keep):
+            self._subscriptions.discard(msg_id)
+            try:
+                await self.async_command(
+                    {"type": "unsubscribe_events", "subscription": msg_id}
+                )
+            except CommandError:
+                pass
+            self._queues.pop(msg_id, None)
+            self.events.pop(msg_id, None)
+
+    def bytes_received(self, *msg_ids: int) -> int:
+        """Return the bytes received so far for the given message IDs."""
+        return sum(self._bytes.get(msg_id, 0) for msg_id in msg_ids)
+
+
+class FakeKodiControl:
+    """Client of the control endpoints of the fake Kodi."""
+
+    def __init__(self, session: aiohttp.ClientSession, url: str) -> None:
+        """Initialisation."""
+        self._session = session
+        self._url = url.rstrip("/")
+
+    async def async_stats(self) -> dict:
+        """Return the JSON-RPC statistics."""
+        async with self._session.get(f"{self._url}/bench/stats") as response:
+            return await response.json()
+
+    async def async_post(self, path: str, body: dict | None = None) -> dict:
+        """Call a control endpoint."""
+        async with self._session.post(
+            f"{self._url}/bench/{path}", json=body or {}
+        ) as response:
+            result = await response.json()
+            if response.status != 200:
+                raise CommandError(f"{path}: {result}")
+            return result
+
+    async def async_wait_quiet(self, quiet: float, timeout: float) -> None:
+        """Wait until no JSON-RPC call was made for `quiet` seconds."""
+        deadline = time.monotonic() + timeout
+        round_trips = (await self.async_stats())["round_trips"]
+        while time.monotonic() < deadline:
+            await asyncio.sleep(quiet)
+            previous, round_trips = (
+                round_trips,
+                (await self.async_stats())["round_trips"],
+            )
+            if round_trips == previous:
+                return
+        print(f"Kodi still busy after {timeout}s", file=sys.stderr)
+
+
+@dataclass
+class Sample:
+    """Measures of one run of a scenario."""
+
+    latency: float | None = None
+    error: bool = False
+    ws_bytes: int = 0
+    rpc_calls: int = 0
+    rpc_bytes: int = 0
+    methods: dict[str, int] = field(default_factory=dict)
+
+    async def async_time(self, awaitable: Awaitable) -> Any:
+        """Run and time an awaitable; failures are counted as errors."""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        except CommandError:
+            self.error = True
+            return None
+        finally:
+            self.latency = time.perf_counter() - start
+
+
+@dataclass
+class Context:
+    """State shared by the scenarios."""
+
+    ha: HomeAssistantClient
+    kodi: FakeKodiControl
+    entry_id: str
+    sensor_entity_id: str | None
+    playlist_size: int
+    settle: float
+    settle_timeout: float
+    library: dict[str, int] = field(default_factory=dict)
+    # Subscriptions kept during a scenario, whose messages are counted
+    observed: list[int] = field(default_factory=list)
+    state: dict[str, Any] = field(default_factory=dict)
+
+    @asynccontextmanager
+    async def async_sample(self):
+        """Measure the Kodi calls and the messages of a run."""
+        await self.kodi.async_wait_quiet(self.settle, self.settle_timeout)
+        before = (await self.kodi.async_stats())["methods"]
+        observed_bytes = self.ha.bytes_received(*self.observed)
+        sample = Sample()
+        yield sample
+        await self.kodi.async_wait_quiet(self.settle, self.settle_timeout)
+        after = (await self.kodi.async_stats())["methods"]
+        sample.ws_bytes += self.ha.bytes_received(*self.observed) - observed_bytes
+        for method, stats in after.items():
+            if method in _IGNORED_METHODS:
+                continue
+            calls = stats["calls"] - before.get(method, {}).get("calls", 0)
+            if calls:
+                sample.methods[method] = calls
+                sample.rpc_calls += calls
+                sample.rpc_bytes += stats["bytes"] - before.get(method, {}).get(
+                    "bytes", 0
+                )
+
+    async def async_command(self, sample: Sample, message: dict) -> None:
+        """Time a command, counting the bytes of its messages."""
+        msg_id = self.ha.last_id + 1
+        await sample.async_time(self.ha.async_command(message))
+        sample.ws_bytes += self.ha.bytes_received(msg_id)
+
+    async def async_reset_player(self) -> None:
+        """Play a fresh audio playlist of the configured size."""
+        await self.kodi.async_post(
+            "player",
+            {"playlistid": PLAYER_ID_AUDIO, "size": self.playlist_size, "position": 0},
+        )
+
+
+@dataclass
+class Scenario:
+    """A benchmarked command: run once per iteration."""
+
+    name: str
+    run: Callable[[Context, int, Sample], Awaitable[None]]
+    # Before the runs, and before each run (not measured)
+    setup: Callable[[Context], Awaitable[None]] | None = None
+    prepare: Callable[[Context, int], Awaitable[None]] | None = None
+    samples: list[Sample] = field(default_factory=list)
+
+
+def _query(iteration: int) -> str:
+    return WORDS[iteration * 7 % len(WORDS)]
+
+
+def _search(category: str) -> Callable:
+    async def run(ctx: Context, iteration: int, sample: Sample) -> None:
+        await ctx.async_command(
+            sample,
+            {
+                "type": f"{DOMAIN}/search",
+                "entry_id": ctx.entry_id,
+                "query": _query(iteration),
+                "category": category,
+            },
+        )
+
+    return run
+
+
+async def _run_search_subscribe(ctx: Context, iteration: int, sample: Sample) -> None:
+    async def subscribe() -> None:
+        msg_id = await ctx.ha.async_subscribe(
+            {
+                "type": f"{DOMAIN}/search_subscribe",
+                "entry_id": ctx.entry_id,
+                "query": _query(iteration),
+            }
+        )
+        ctx.state["subscription"] = msg_id
+        await ctx.ha.async_wait(
+            msg_id, lambda event: event.get("type") == "search_done"
+        )
+
+    await sample.async_time(subscribe())
+    sample.ws_bytes += ctx.ha.bytes_received(ctx.state.pop("subscription", -1))
+
+
+def _simple(command: str, **params: Callable[[Context, int], Any]) -> Callable:
+    """Run a command whose parameters depend on the iteration."""
+
+    async def run(ctx: Context, iteration: int, sample: Sample) -> None:
+        await ctx.async_command(
+            sample,
+            {
+                "type": f"{DOMAIN}/{command}",
+                "entry_id": ctx.entry_id,
+                **{key: value(ctx, iteration) for key, value in params.items()},
+            },
+        )
+
+    return run
+
+
+def _playlist_subscribe(delta: bool, window: dict | None = None) -> Callable:
+    async def run(ctx: Context, iteration: int, sample: Sample) -> None:
+        msg_id = ctx.ha.last_id + 1
+        message = {
+            "type": f"{DOMAIN}/playlist_subscribe",
+            "entry_id": ctx.entry_id,
+            "delta": delta,
+        }
+        if window is not None:
+            message["window"] = window
+        await sample.async_time(ctx.ha.async_subscribe(message))
+        sample.ws_bytes += ctx.ha.bytes_received(msg_id)
+
+    return run
+
+
+async def _prepare_player(ctx: Context, iteration: int) -> None:
+    await ctx.async_reset_player()
+
+
+async def _observe_playlist(ctx: Context) -> None:
+    """Keep a delta playlist subscription open during the scenario."""
+    await ctx.async_reset_player()
+    ctx.observed.append(
+        await ctx.ha.async_subscribe(
+            {
+                "type": f"{DOMAIN}/playlist_subscribe",
+                "entry_id": ctx.entry_id,
+                "delta": True,
+            }
+        )
+    )
+
+
+async def _prepare_playlist_ack(ctx: Context, iteration: int) -> None:
+    await ctx.async_reset_player()
+    msg_id = await ctx.ha.async_subscribe(
+        {
+            "type": f"{DOMAIN}/playlist_subscribe",
+            "entry_id": ctx.entry_id,
+            "delta": True,
+        }
+    )
+    # Acknowledge the snapshot received when subscribing
+    ctx.state["ack"] = (msg_id, ctx.ha.events[msg_id][-1]["seq"])
+
+
+async def _run_playlist_ack(ctx: Context, iteration: int, sample: Sample) -> None:
+    msg_id, seq = ctx.state.pop("ack")
+    await ctx.async_command(
+        sample,
+        {
+            "type": f"{DOMAIN}/playlist_ack",
+            "entry_id": ctx.entry_id,
+            "subscription": msg_id,
+            "seq": seq,
+        },
+    )
+
+
+async def _observe_sensor(ctx: Context) -> None:
+    """Follow the changes of the sensor current_track."""
+    await ctx.async_reset_player()
+    ctx.state["sensor"] = await ctx.ha.async_subscribe(
+        {
+            "type": "subscribe_trigger",
+            "trigger": {
+                "platform": "state",
+                "entity_id": ctx.sensor_entity_id,
+                "attribute": "current_track",
+            },
+        }
+    )
+    ctx.observed.append(ctx.state["sensor"])
+
+
+async def _run_sensor(ctx: Context, iteration: int, sample: Sample) -> None:
+    """Play the next song, until the sensor reports it."""
+
+    def is_played(played: dict) -> Callable[[dict], bool]:
+        def predicate(event: dict) -> bool:
+            to_state = event["variables"]["trigger"].get("to_state") or {}
+            track = to_state.get("attributes", {}).get("current_track") or {}
+            return track.get("id") == played.get("id")
+
+        return predicate
+
+    async def play_next() -> None:
+        played = await ctx.kodi.async_post("play")
+        await ctx.ha.async_wait(ctx.state["sensor"], is_played(played))
+
+    await sample.async_time(play_next())
+
+
+def _scenarios() -> list[Scenario]:
+    def artist_id(ctx: Context, iteration: int) -> int:
+        return iteration * 37 % ctx.library["artists"] + 1
+
+    def tvshow_id(ctx: Context, iteration: int) -> int:
+        return iteration * 7 % ctx.library["tvshows"] + 1
+
+    def song_id(ctx: Context, iteration: int) -> int:
+        return iteration * 7919 % ctx.library["songs"] + 1
+
+    def music_playlist(ctx: Context, iteration: int) -> str:
+        return MUSIC_PLAYLISTS[iteration % len(MUSIC_PLAYLISTS)]
+
+    def constant(value: Any) -> Callable[[Context, int], Any]:
+        return lambda ctx, iteration: value
+
+    return [
+        Scenario("search (all)", _search("all")),
+        Scenario("search (songs)", _search("songs")),
+        Scenario("search (channels)", _search("channels")),
+        Scenario(
+            "search (all, card)",
+            _simple(
+                "search",
+                query=lambda ctx, iteration: _query(iteration),
+                category=constant("all"),
+                profile=constant("card"),
+            ),
+        ),
+        Scenario("search_subscribe", _run_search_subscribe),
+        Scenario("search_recently_played", _simple("search_recently_played")),
+        Scenario("search_recently_added", _simple("search_recently_added")),
+        Scenario("search_artist", _simple("search_artist", artist_id=artist_id)),
+        Scenario(
+            "search_artist (minimal)",
+            _simple("search_artist", artist_id=artist_id, profile=constant("minimal")),
+        ),
+        Scenario(
+            "search_artist (compact)",
+            _simple("search_artist", artist_id=artist_id, compact=constant(True)),
+        ),
+        Scenario(
+            "search_artist (page)",
+            _simple("search_artist", artist_id=artist_id, limit=constant(2)),
+        ),
+        Scenario(
+            "search_artist (lazy)",
+            _simple("search_artist", artist_id=artist_id, lazy=constant(True)),
+        ),
+        Scenario("search_tvshow", _simple("search_tvshow", tvshow_id=tvshow_id)),
+        Scenario(
+            "search_tvshow (lazy)",
+            _simple("search_tvshow", tvshow_id=tvshow_id, lazy=constant(True)),
+        ),
+        Scenario(
+            "search_tvshow_season",
+            _simple("search_tvshow_season", tvshow_id=tvshow_id, season=constant(1)),
+        ),
+        Scenario("search_musicplaylists", _simple("search_musicplaylists")),
+        Scenario(
+            "playlist_subscribe",
+            _playlist_subscribe(False),
+            prepare=_prepare_player,
+        ),
+        Scenario(
+            "playlist_subscribe (delta)",
+            _playlist_subscribe(True),
+            prepare=_prepare_player,
+        ),
+        Scenario(
+            "playlist_subscribe (window)",
+            _playlist_subscribe(False, {"size": 20, "around_current": True}),
+            prepare=_prepare_player,
+        ),
+        Scenario("playlist_ack", _run_playlist_ack, prepare=_prepare_playlist_ack),
+        Scenario(
+            "playlist_goto_index",
+            _simple(
+                "playlist_goto_index",
+                index=lambda ctx, iteration: iteration % (ctx.playlist_size - 1) + 1,
+            ),
+            setup=_observe_playlist,
+        ),
+        Scenario(
+            "playlist_remove_item",
+            _simple(
+                "playlist_remove_item",
+                index=lambda ctx, iteration: ctx.playlist_size - 1,
+            ),
+            setup=_observe_playlist,
+            prepare=_prepare_player,
+        ),
+        Scenario(
+            "playlist_reorder",
+            _simple(
+                "playlist_reorder",
+                from_index=constant(2),
+                to_index=lambda ctx, iteration: ctx.playlist_size // 2,
+            ),
+            setup=_observe_playlist,
+            prepare=_prepare_player,
+        ),
+        Scenario(
+            "playlist_reorder_batch",
+            _simple(
+                "playlist_reorder_batch",
+                moves=lambda ctx, iteration: [
+                    {"from_index": index, "to_index": ctx.playlist_size // 2}
+                    for index in (2, 3, 4, 5)
+                ],
+            ),
+            setup=_observe_playlist,
+            prepare=_prepare_player,
+        ),
+        Scenario(
+            "playlist_play",
+            _simple(
+                "playlist_play",
+                path=music_playlist,
+                playlistid=constant(PLAYER_ID_AUDIO),
+            ),
+            setup=_observe_playlist,
+        ),
+        Scenario(
+            "playlist_add",
+            _simple(
+                "playlist_add",
+                path=music_playlist,
+                playlistid=constant(PLAYER_ID_AUDIO),
+                position=constant("last"),
+            ),
+            setup=_observe_playlist,
+            prepare=_prepare_player,
+        ),
+        Scenario(
+            "playlist_play_item",
+            _simple(
+                "playlist_play_item", item_id=song_id, item_name=constant("songid")
+            ),
+            setup=_observe_playlist,
+            prepare=_prepare_player,
+        ),
+        Scenario(
+            "playlist_add_item",
+            _simple(
+                "playlist_add_item",
+                item_id=song_id,
+                item_name=constant("songid"),
+                position=constant("last"),
+            ),
+            setup=_observe_playlist,
+            prepare=_prepare_player,
+        ),
+        Scenario("sensor current_track", _run_sensor, setup=_observe_sensor),
+    ]
+
+
+def _percentile(values: list[float], percent: float) -> float | None:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+def _summary(scenario: Scenario) -> dict[str, Any]:
+    samples = scenario.samples
+    runs = len(samples) or 1
+    latencies = [
+        sample.latency * 1000 for sample in samples if sample.latency is not None
+    ]
+    methods: dict[str, float] = {}
+    for sample in samples:
+        for method, calls in sample.methods.items():
+            methods[method] = methods.get(method, 0) + calls / runs
+    return {
+        "command": scenario.name,
+        "runs": len(samples),
+        "errors": sum(sample.error for sample in samples),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "rpc_calls": sum(sample.rpc_calls for sample in samples) / runs,
+        "rpc_bytes": sum(sample.rpc_bytes for sample in samples) / runs,
+        "ws_bytes": sum(sample.ws_bytes for sample in samples) / runs,
+        "methods": dict(sorted(methods.items())),
+    }
+
+
+def _format_table(library: dict[str, int], summaries: list[dict]) -> str:
+    lines = [
+        "Library: " + ", ".join(f"{count} {kind}" for kind, count in library.items()),
+        f"{'command':<28} {'runs':>4} {'err':>3} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'rpc':>6} {'kodi KiB':>9} {'ws KiB':>8}",
+    ]
+    for summary in summaries:
+        p50, p95 = summary["p50_ms"], summary["p95_ms"]
+        lines.append(
+            f"{summary['command']:<28} {summary['runs']:>4} {summary['errors']:>3} "
+            f"{p50 if p50 is not None else float('nan'):>8.1f} "
+            f"{p95 if p95 is not None else float('nan'):>8.1f} "
+            f"{summary['rpc_calls']:>6.1f} {summary['rpc_bytes'] / 1024:>9.1f} "
+            f"{summary['ws_bytes'] / 1024:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+async def _async_find_sensor(ha: HomeAssistantClient, entry_id: str) -> str | None:
+    result = await ha.async_command({"type": "config/entity_registry/list"})
+    for entity in result.get("result") or []:
+        if entity.get("platform") == DOMAIN and entity.get("unique_id") == (
+            f"{entry_id}_state"
+        ):
+            return entity["entity_id"]
+    return None
+
+
+async def _async_run_scenarios(
+    ctx: Context, scenarios: list[Scenario], iterations: int
+) -> list[dict]:
+    summaries = []
+    for scenario in scenarios:
+        print(f"  {scenario.name}...", file=sys.stderr)
+        ctx.observed = []
+        ctx.state = {}
+        if scenario.setup is not None:
+            await scenario.setup(ctx)
+        for iteration in range(iterations):
+            if scenario.prepare is not None:
+                await scenario.prepare(ctx, iteration)
+            async with ctx.async_sample() as sample:
+                await scenario.run(ctx, iteration, sample)
+            scenario.samples.append(sample)
+            await ctx.ha.async_unsubscribe(*ctx.observed)
+        await ctx.ha.async_unsubscribe()
+        summaries.append(_summary(scenario))
+    return summaries
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    """Run the benchmark."""
+    async with aiohttp.ClientSession() as session:
+        kodi = FakeKodiControl(session, args.kodi)
+        ha = await HomeAssistantClient.async_connect(
+            session, args.url, args.token, args.timeout
+        )
+        try:
+            sensor_entity_id = await _async_find_sensor(ha, args.entry_id)
+            ctx = Context(
+                ha,
+                kodi,
+                args.entry_id,
+                sensor_entity_id,
+                args.playlist_size,
+                args.settle,
+                args.settle_timeout,
+            )
+            selected = [
+                scenario
+                for scenario in _scenarios()
+                if not args.only
+                or any(name in scenario.name for name in args.only.split(","))
+            ]
+            if sensor_entity_id is None:
+                print("Sensor not found: not benchmarked", file=sys.stderr)
+                selected = [s for s in selected if s.run is not _run_sensor]
+
+            report = []
+            for size in args.sizes or [None]:
+                if size is not None:
+                    print(f"Library of {size} songs...", file=sys.stderr)
+                    await kodi.async_post("library", {"songs": size})
+                    # Let the integration reload its index and catalogs
+                    await kodi.async_wait_quiet(args.settle * 4, args.settle_timeout)
+                ctx.library = (await kodi.async_stats())["library"]
+                for scenario in selected:
+                    scenario.samples = []
+                summaries = await _async_run_scenarios(ctx, selected, args.iterations)
+                print(_format_table(ctx.library, summaries) + "\n")
+                report.append({"library": ctx.library, "results": summaries})
+        finally:
+            await ha.async_close()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="ws://localhost:8123/api/websocket")
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("HA_TOKEN"),
+        help="long-lived access token (default: $HA_TOKEN)",
+    )
+    parser.add_argument("--entry-id", required=True, help="Kodi Media Sensors entry")
+    parser.add_argument(
+        "--kodi", default="http://localhost:8080", help="URL of the fake Kodi"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        help="numbers of songs of the libraries to benchmark, e.g. 1000,200000",
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--playlist-size", type=int, default=200)
+    parser.add_argument("--only", help="comma-separated command names to run")
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=0.6,
+        help="seconds without Kodi calls ending a run",
+    )
+    parser.add_argument("--settle-timeout", type=float, default=300)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--json", help="write the detailed results to this file")
+    args = parser.parse_args()
+    if not args.token:
+        parser.error("--token (or $HA_TOKEN) is required")
+    sys.exit(asyncio.run(async_main(args)))
+
+
+if __name__ == "__main__":
+    main()
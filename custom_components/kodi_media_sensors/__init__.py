@@ -1,7 +1,30 @@
+import asyncio
+import functools
 import logging
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
-from .const import DOMAIN, CONF_LABEL
+from homeassistant.helpers.event import async_track_state_change_event
+from .const import (
+    DOMAIN,
+    CONF_LABEL,
+    CONF_KODI_ENTITY,
+    DEFAULT_OPTION_PLAYLIST_REFRESH_DELAY,
+    DEFAULT_OPTION_SEARCH_CONCURRENCY,
+    EVENT_LIBRARY_UPDATED,
+    KODI_STATE_OFF,
+    KODI_STATE_UNAVAILABLE,
+    LIBRARY_NOTIFICATIONS,
+    OPTION_PLAYLIST_REFRESH_DELAY,
+    OPTION_SEARCH_CONCURRENCY,
+    SEARCH_CACHE_MAX_SIZE,
+    SEARCH_CACHE_TTL,
+)
+from .channel_catalog import ChannelCatalog
+from .kodi_client import async_register_notification_handler
+from .library_index import KodiLibraryIndex
+from .recently_added import RecentlyAddedStore
+from .recently_played import RecentlyPlayedBuffer
+from .search_cache import SearchResultCache
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,11 +41,46 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.info("Kodi Media Sensors started — label: '%s'", label)
 
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
-    
+
+    kodi_entity_id = entry.data.get(CONF_KODI_ENTITY)
+    channel_catalog = ChannelCatalog(hass, entry.entry_id, kodi_entity_id)
+    library_index = KodiLibraryIndex(
+        hass, entry.entry_id, kodi_entity_id, channel_catalog
+    )
+    search_cache = SearchResultCache(
+        hass, entry.entry_id, SEARCH_CACHE_MAX_SIZE, SEARCH_CACHE_TTL
+    )
+    recently_added = RecentlyAddedStore(hass, entry.entry_id, kodi_entity_id)
+    recently_played = RecentlyPlayedBuffer(hass, entry.entry_id, kodi_entity_id)
+
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "label": label,
+        "library_index": library_index,
+        "channel_catalog": channel_catalog,
+        "search_limiter": _create_search_limiter(entry),
+        "search_cache": search_cache,
+        "recently_added": recently_added,
+        "recently_played": recently_played,
     }
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
+    # Kodi library notifications are re-fired on the bus for this entry.
+    # Registration is retried whenever Kodi comes back, in case the core
+    # Kodi integration was reloaded in the meantime.
+    _async_forward_library_notifications(hass, entry)
+    entry.async_on_unload(
+        async_track_state_change_event(
+            hass,
+            [kodi_entity_id],
+            functools.partial(_async_on_kodi_state_change, hass, entry),
+        )
+    )
+    channel_catalog.async_start()
+    library_index.async_start()
+    search_cache.async_start()
+    recently_added.async_start()
+    recently_played.async_start()
 
     # IMPORTANT: register WebSocket commands without awaiting.
     # They must be registered at the domain level, not per entry.
@@ -34,11 +92,51 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Clean up when the integration is removed."""
-    hass.data[DOMAIN].pop(entry.entry_id, None)
+    entry_data = hass.data[DOMAIN].pop(entry.entry_id, None) or {}
+    if entry_data.get("library_index"):
+        entry_data["library_index"].async_stop()
+    if entry_data.get("channel_catalog"):
+        entry_data["channel_catalog"].async_stop()
+    if entry_data.get("search_cache"):
+        entry_data["search_cache"].async_stop()
+    if entry_data.get("recently_added"):
+        entry_data["recently_added"].async_stop()
+    if entry_data.get("recently_played"):
+        entry_data["recently_played"].async_stop()
+    if entry_data.get("playlist_hub"):
+        entry_data["playlist_hub"].async_stop()
     _LOGGER.info("Kodi Media Sensors unloaded.")
     return True
 
 
+def _create_search_limiter(entry: ConfigEntry) -> asyncio.Semaphore:
+    """Bound the number of search requests sent to Kodi at once."""
+    return asyncio.Semaphore(
+        entry.options.get(OPTION_SEARCH_CONCURRENCY, DEFAULT_OPTION_SEARCH_CONCURRENCY)
+    )
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply the options that are not read on every request."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if entry_data is not None:
+        # Searches already running keep the previous limiter
+        entry_data["search_limiter"] = _create_search_limiter(entry)
+        # The number of recently added / played items kept may have changed
+        if entry_data.get("recently_added"):
+            entry_data["recently_added"].async_reload()
+        if entry_data.get("recently_played"):
+            entry_data["recently_played"].async_reseed()
+        # The hub of the playlist subscriptions outlives the options
+        if entry_data.get("playlist_hub"):
+            entry_data["playlist_hub"].async_set_refresh_delay(
+                entry.options.get(
+                    OPTION_PLAYLIST_REFRESH_DELAY, DEFAULT_OPTION_PLAYLIST_REFRESH_DELAY
+                )
+                / 1000
+            )
+
+
 def _async_setup_websocket(hass: HomeAssistant) -> None:
     """Register WebSocket commands.
 
@@ -49,4 +147,49 @@ def _async_setup_websocket(hass: HomeAssistant) -> None:
     from .websocket import async_register_websockets
 
     # This is a @callback and must be called synchronously
-    async_register_websockets(hass)
\ No newline at end of file
+    async_register_websockets(hass)
+
+
+@callback
+def _async_forward_library_notifications(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> None:
+    """Re-fire the Kodi library notifications as EVENT_LIBRARY_UPDATED."""
+    kodi_entity_id = entry.data.get(CONF_KODI_ENTITY)
+    for method in LIBRARY_NOTIFICATIONS:
+        if not async_register_notification_handler(
+            hass,
+            kodi_entity_id,
+            method,
+            functools.partial(
+                _async_on_library_notification, hass, entry.entry_id, method
+            ),
+        ):
+            return
+
+
+async def _async_on_library_notification(
+    hass: HomeAssistant, entry_id: str, method: str, sender=None, data=None
+) -> None:
+    """Handle a Kodi library notification."""
+    _LOGGER.debug("[LIBRARY] %s received: %s", method, data)
+    hass.bus.async_fire(
+        EVENT_LIBRARY_UPDATED,
+        {"entry_id": entry_id, "method": method, "data": data},
+    )
+
+
+@callback
+def _async_on_kodi_state_change(
+    hass: HomeAssistant, entry: ConfigEntry, event: Event
+) -> None:
+    """Register the notification handlers again when Kodi comes back."""
+    old_state = event.data.get("old_state")
+    new_state = event.data.get("new_state")
+    unavailable = (KODI_STATE_OFF, KODI_STATE_UNAVAILABLE)
+    if (
+        new_state is not None
+        and new_state.state not in unavailable
+        and (old_state is None or old_state.state in unavailable)
+    ):
+        _async_forward_library_notifications(hass, entry)
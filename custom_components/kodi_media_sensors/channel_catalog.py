@@ -0,0 +1,231 @@
+"""Catalog of the PVR channels of a Kodi instance.
+
+Searching the channels used to cost, for every query, a call to
+`XBMC.GetInfoBooleans` followed by the download of the whole `alltv` and
+`allradio` channel groups, only to filter them by label in Python.
+
+The catalog keeps, per Kodi instance, the channels of both groups (only
+those the PVR reports to have) along with their case-folded labels, so
+a search is a scan of precomputed strings, without any RPC. It is loaded
+when Kodi becomes available, and refreshed periodically and after each
+PVR channel scan.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from itertools import islice
+import logging
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+
+from .const import (
+    CHANNEL_CATALOG_REFRESH_INTERVAL,
+    DATA_CHANNEL_CATALOGS,
+    EVENT_LIBRARY_UPDATED,
+    KODI_STATE_OFF,
+    KODI_STATE_UNAVAILABLE,
+    SEARCH_PROPERTIES_CHANNELS,
+)
+from .kodi_client import async_call_batch, async_call_method
+
+_LOGGER = logging.getLogger(__name__)
+
+# PVR channel groups, each searched and limited separately (TV first)
+_CHANNEL_GROUPS = [
+    ("alltv", "PVR.HasTVChannels"),
+    ("allradio", "PVR.HasRadioChannels"),
+]
+
+
+class ChannelCatalog:
+    """In-memory copy of the PVR channels of one Kodi instance."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, kodi_entity_id: str) -> None:
+        """Initialisation."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._kodi_entity_id = kodi_entity_id
+        # One (group, [(case-folded label, channel)]) per available group
+        self._groups: list[tuple[str, list[tuple[str, dict]]]] | None = None
+        self._load_task: asyncio.Task | None = None
+        self._unsubs: list = []
+
+    @property
+    def is_ready(self) -> bool:
+        """Return True if the channels have been loaded."""
+        return self._groups is not None
+
+    def __len__(self) -> int:
+        return sum(len(channels) for _, channels in self._groups or [])
+
+    @callback
+    def async_start(self) -> None:
+        """Start the refreshes, and the initial load if Kodi is there."""
+        self._hass.data.setdefault(DATA_CHANNEL_CATALOGS, {})[
+            self._kodi_entity_id
+        ] = self
+        self._unsubs.append(
+            self._hass.bus.async_listen(
+                EVENT_LIBRARY_UPDATED, self._async_on_library_updated
+            )
+        )
+        self._unsubs.append(
+            async_track_state_change_event(
+                self._hass, [self._kodi_entity_id], self._async_on_kodi_state_change
+            )
+        )
+        self._unsubs.append(
+            async_track_time_interval(
+                self._hass,
+                self._async_on_refresh_interval,
+                timedelta(seconds=CHANNEL_CATALOG_REFRESH_INTERVAL),
+            )
+        )
+        if self._is_kodi_connected(self._hass.states.get(self._kodi_entity_id)):
+            self._async_schedule_load()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the refreshes and drop the catalog."""
+        catalogs = self._hass.data.get(DATA_CHANNEL_CATALOGS, {})
+        if catalogs.get(self._kodi_entity_id) is self:
+            del catalogs[self._kodi_entity_id]
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._load_task is not None:
+            self._load_task.cancel()
+        self._groups = None
+
+    @callback
+    def async_search(self, query: str, limit: int) -> list | None:
+        """Return up to `limit` channels per group whose label contains query.
+
+        Returns None if the catalog is not loaded yet.
+        """
+        if self._groups is None:
+            return None
+        query = query.casefold()
+        results = []
+        for _, channels in self._groups:
+            matches = (dict(ch) for label, ch in channels if query in label)
+            results.extend(islice(matches, max(limit, 0)))
+        return results
+
+    async def async_load(self) -> bool:
+        """(Re)load the catalog, or wait for the load in progress.
+
+        The previous channels keep serving searches until the new ones
+        are fully loaded. Returns False if the load failed.
+        """
+        return await asyncio.shield(self._async_schedule_load())
+
+    async def async_load_once(self) -> bool:
+        """Load the catalog unless already loaded. Returns is_ready."""
+        if self._groups is None:
+            await self.async_load()
+        return self.is_ready
+
+    @callback
+    def _async_schedule_load(self) -> asyncio.Task:
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_background_task(
+                self._async_load(), f"{self._kodi_entity_id} channel catalog"
+            )
+            self._load_task.add_done_callback(self._async_on_load_done)
+        return self._load_task
+
+    @callback
+    def _async_on_load_done(self, task: asyncio.Task) -> None:
+        if self._load_task is task:
+            self._load_task = None
+
+    async def _async_load(self) -> bool:
+        pvr_status = await async_call_method(
+            self._hass,
+            self._kodi_entity_id,
+            "XBMC.GetInfoBooleans",
+            booleans=[flag for _, flag in _CHANNEL_GROUPS],
+        )
+        if pvr_status is None:
+            return False
+
+        groups = [group for group, flag in _CHANNEL_GROUPS if pvr_status.get(flag)]
+        results = await async_call_batch(
+            self._hass,
+            self._kodi_entity_id,
+            [
+                (
+                    "PVR.GetChannels",
+                    {
+                        "channelgroupid": group,
+                        "properties": SEARCH_PROPERTIES_CHANNELS,
+                        "sort": {
+                            "method": "label",
+                            "order": "ascending",
+                            "ignorearticle": False,
+                        },
+                    },
+                )
+                for group in groups
+            ],
+        )
+        if any(result is None for result in results):
+            _LOGGER.debug("[CHANNELS] Could not load %s", self._kodi_entity_id)
+            return False
+
+        self._groups = [
+            (
+                group,
+                [
+                    (str(channel.get("label", "")).casefold(), channel)
+                    for channel in result.get("channels") or []
+                ],
+            )
+            for group, result in zip(groups, results)
+        ]
+        _LOGGER.debug(
+            "[CHANNELS] Loaded %d channels for %s", len(self), self._kodi_entity_id
+        )
+        return True
+
+    @staticmethod
+    def _is_kodi_connected(state) -> bool:
+        return state is not None and state.state not in (
+            KODI_STATE_OFF,
+            KODI_STATE_UNAVAILABLE,
+        )
+
+    @callback
+    def _async_on_kodi_state_change(self, event: Event) -> None:
+        """Reload when Kodi comes back (the PVR may have changed)."""
+        if self._is_kodi_connected(
+            event.data.get("new_state")
+        ) and not self._is_kodi_connected(event.data.get("old_state")):
+            self._async_schedule_load()
+
+    @callback
+    def _async_on_refresh_interval(self, now) -> None:
+        if self._is_kodi_connected(self._hass.states.get(self._kodi_entity_id)):
+            self._async_schedule_load()
+
+    @callback
+    def _async_on_library_updated(self, event: Event) -> None:
+        if (
+            event.data.get("entry_id") == self._entry_id
+            and event.data.get("method") == "PVR.OnScanFinished"
+        ):
+            self._async_schedule_load()
+
+
+@callback
+def async_get_channel_catalog(
+    hass: HomeAssistant, kodi_entity_id: str
+) -> ChannelCatalog | None:
+    """Return the channel catalog of a Kodi entity, if any."""
+    return hass.data.get(DATA_CHANNEL_CATALOGS, {}).get(kodi_entity_id)
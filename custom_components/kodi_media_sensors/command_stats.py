@@ -0,0 +1,160 @@
+"""Timings of the websocket commands of the integration.
+
+Every websocket command handler is wrapped by `track_command`, which
+counts the commands in flight (per command and per entry) and keeps the
+duration of the last `COMMAND_STATS_RECENT_SIZE` commands, so the stats
+command and the diagnostics can report the slowest recent ones without
+debug logging.
+
+A command failed if its handler raised, or if it replied with an error
+(`connection.send_error`): the error results are noticed on their way
+out, by wrapping the `send_message` of the connection.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+import functools
+import time
+from typing import Any
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    COMMAND_STATS_RECENT_SIZE,
+    COMMAND_STATS_SLOWEST_COUNT,
+    DATA_COMMAND_STATS,
+)
+
+
+class CommandStats:
+    """In-flight counts and recent durations of the websocket commands."""
+
+    def __init__(self, recent_size: int) -> None:
+        """Initialisation."""
+        # command type -> commands running
+        self.in_flight: Counter[str] = Counter()
+        # entry_id -> commands running
+        self.in_flight_by_entry: Counter[str] = Counter()
+        # (command type, entry_id, duration, end wall time, failed)
+        self.recent: deque[tuple[str, str | None, float, float, bool]] = deque(
+            maxlen=recent_size
+        )
+
+    @callback
+    def async_start(self, command: str, entry_id: str | None) -> None:
+        """Record the start of a command."""
+        self.in_flight[command] += 1
+        if entry_id is not None:
+            self.in_flight_by_entry[entry_id] += 1
+
+    @callback
+    def async_end(
+        self, command: str, entry_id: str | None, duration: float, failed: bool
+    ) -> None:
+        """Record the end of a command that took `duration` seconds."""
+        self.in_flight[command] -= 1
+        if not self.in_flight[command]:
+            del self.in_flight[command]
+        if entry_id is not None:
+            self.in_flight_by_entry[entry_id] -= 1
+            if not self.in_flight_by_entry[entry_id]:
+                del self.in_flight_by_entry[entry_id]
+        self.recent.append((command, entry_id, duration, time.time(), failed))
+
+    @callback
+    def async_slowest(
+        self, entry_id: str | None = None, count: int = COMMAND_STATS_SLOWEST_COUNT
+    ) -> list[dict[str, Any]]:
+        """Return the slowest recent commands (of an entry), slowest first."""
+        recent = (
+            self.recent
+            if entry_id is None
+            else [command for command in self.recent if command[1] == entry_id]
+        )
+        return [
+            {
+                "type": command,
+                "entry_id": command_entry_id,
+                "duration_ms": round(duration * 1000, 1),
+                "ended_at": ended_at,
+                "failed": failed,
+            }
+            for command, command_entry_id, duration, ended_at, failed in sorted(
+                recent, key=lambda command: command[2], reverse=True
+            )[:count]
+        ]
+
+
+class _ErrorResultRecorder:
+    """`send_message` of a connection, noting the commands replying errors."""
+
+    def __init__(self, send_message: Callable[[Any], None]) -> None:
+        """Initialisation."""
+        self._send_message = send_message
+        # message id of a tracked command -> True once it sent an error
+        self.failed: dict[int, bool] = {}
+
+    def __call__(self, message: Any) -> None:
+        if (
+            isinstance(message, dict)
+            and message.get("id") in self.failed
+            and message.get("type") == "result"
+            and message.get("success") is False
+        ):
+            self.failed[message["id"]] = True
+        self._send_message(message)
+
+
+@callback
+def _async_get_error_recorder(
+    connection: websocket_api.ActiveConnection,
+) -> _ErrorResultRecorder:
+    """Return the error recorder of a connection, installing it if needed."""
+    recorder = connection.send_message
+    if not isinstance(recorder, _ErrorResultRecorder):
+        # Kept for the life of the connection: commands may overlap
+        recorder = connection.send_message = _ErrorResultRecorder(recorder)
+    return recorder
+
+
+@callback
+def async_get_command_stats(hass: HomeAssistant) -> CommandStats:
+    """Return the websocket command stats, creating them if needed."""
+    stats = hass.data.get(DATA_COMMAND_STATS)
+    if stats is None:
+        stats = hass.data[DATA_COMMAND_STATS] = CommandStats(COMMAND_STATS_RECENT_SIZE)
+    return stats
+
+
+def track_command(
+    func: Callable[[HomeAssistant, websocket_api.ActiveConnection, dict], Awaitable],
+) -> Callable[[HomeAssistant, websocket_api.ActiveConnection, dict], Awaitable]:
+    """Time an async websocket command handler.
+
+    Goes below `websocket_api.async_response`. Subscriptions are timed
+    until their handler returns, i.e. until the subscription is set up.
+    """
+
+    @functools.wraps(func)
+    async def _async_tracked(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        stats = async_get_command_stats(hass)
+        command = msg["type"]
+        entry_id = msg.get("entry_id")
+        recorder = _async_get_error_recorder(connection)
+        recorder.failed[msg["id"]] = False
+        stats.async_start(command, entry_id)
+        start = time.monotonic()
+        failed = True
+        try:
+            await func(hass, connection, msg)
+            failed = recorder.failed[msg["id"]]
+        finally:
+            recorder.failed.pop(msg["id"], None)
+            stats.async_end(command, entry_id, time.monotonic() - start, failed)
+
+    return _async_tracked
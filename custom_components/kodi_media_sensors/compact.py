@@ -0,0 +1,109 @@
+"""Compact (columnar) encoding of the lists of items sent to clients.
+
+Lists of items are sent as lists of objects repeating every field name,
+and the same artists, albums, genres or thumbnails over and over. When
+a client asks for it (`compact: true`), each list is sent as a table:
+
+    {
+        "keys": ["songid", "title", "artist", "album"],
+        "rows": [[1, "Help!", [0], 1], [2, "Yesterday", [0], 1]],
+        "strings": ["The Beatles", "Help!"],
+        "indexed": ["artist", "album"],
+    }
+
+- `rows` holds the values of each item, in the order of `keys`; an item
+  without a field has null
+- the values of the `indexed` columns (strings, or lists of strings,
+  repeated in the list) are replaced by their index in `strings`
+- fields holding lists of items (the songs of an album, the episodes of
+  a season) are nested tables, without `strings`: their indexed columns
+  refer to the `strings` of the outermost table
+
+Decoding: `item[keys[i]] = indexed.includes(keys[i]) ? lookup(row[i]) :
+row[i]`, where `lookup` maps an index (or a list of indexes) through
+`strings`, and nested tables are decoded the same way.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class _StringTable:
+    """Strings of an encoded list, each stored once."""
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._indexes: dict[str, int] = {}
+
+    def index(self, value: str) -> int:
+        index = self._indexes.get(value)
+        if index is None:
+            index = self._indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def encode(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self.index(value)
+        if isinstance(value, list):
+            return [self.index(string) for string in value]
+        return value
+
+
+def _is_item_list(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and isinstance(value[0], dict)
+
+
+def _has_repeated_strings(values: list[Any]) -> bool:
+    """Return True if the column only holds strings, some of them repeated."""
+    seen = set()
+    count = 0
+    for value in values:
+        if value is None:
+            continue
+        strings = value if isinstance(value, list) else [value]
+        for string in strings:
+            if not isinstance(string, str):
+                return False
+            seen.add(string)
+            count += 1
+    return count > len(seen)
+
+
+def _encode(items: list[dict], strings: _StringTable) -> dict[str, Any]:
+    keys = list(dict.fromkeys(key for item in items for key in item))
+    columns = []
+    indexed = []
+    for key in keys:
+        values = [item.get(key) for item in items]
+        if any(_is_item_list(value) for value in values):
+            values = [
+                _encode(value, strings) if isinstance(value, list) else value
+                for value in values
+            ]
+        elif _has_repeated_strings(values):
+            values = [strings.encode(value) for value in values]
+            indexed.append(key)
+        columns.append(values)
+    return {
+        "keys": keys,
+        "rows": [list(row) for row in zip(*columns)],
+        "indexed": indexed,
+    }
+
+
+def compact_items(items: list[dict]) -> dict[str, Any]:
+    """Return the compact encoding of a list of items."""
+    strings = _StringTable()
+    table = _encode(items, strings)
+    table["strings"] = strings.strings
+    return table
+
+
+def compact_results(results: dict[str, list]) -> dict[str, Any]:
+    """Return the results with each list of items compact-encoded."""
+    return {
+        key: compact_items(items) if isinstance(items, list) else items
+        for key, items in results.items()
+    }
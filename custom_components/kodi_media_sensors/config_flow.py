@@ -8,9 +8,11 @@ from .const import (
     DOMAIN,
     CONF_LABEL,
     CONF_KODI_ENTITY,
+    DEFAULT_OPTION_PLAYLIST_REFRESH_DELAY,
     DEFAULT_OPTION_SEARCH_ALBUMS_LIMIT,
     DEFAULT_OPTION_SEARCH_ARTISTS_LIMIT,
     DEFAULT_OPTION_SEARCH_CHANNELS_LIMIT,
+    DEFAULT_OPTION_SEARCH_CONCURRENCY,
     DEFAULT_OPTION_SEARCH_EPISODES_LIMIT,
     DEFAULT_OPTION_SEARCH_MOVIES_LIMIT,
     DEFAULT_OPTION_SEARCH_MUSIC_PLAYLISTS_LIMIT,
@@ -24,11 +26,15 @@ from .const import (
     DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT,
     DEFAULT_OPTION_SEARCH_SONGS_LIMIT,
     DEFAULT_OPTION_SEARCH_TVSHOWS_LIMIT,
+    MAX_PLAYLIST_REFRESH_DELAY,
+    MAX_SEARCH_CONCURRENCY,
     MAX_SEARCH_LIMIT,
     MIN_SEARCH_RECENTLY_PLAYED,
+    OPTION_PLAYLIST_REFRESH_DELAY,
     OPTION_SEARCH_ALBUMS_LIMIT,
     OPTION_SEARCH_ARTISTS_LIMIT,
     OPTION_SEARCH_CHANNELS_LIMIT,
+    OPTION_SEARCH_CONCURRENCY,
     OPTION_SEARCH_EPISODES_LIMIT,
     OPTION_SEARCH_MOVIES_LIMIT,
     OPTION_SEARCH_MUSIC_PLAYLISTS_LIMIT,
@@ -250,6 +256,24 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             schema_base,
         )
 
+        # SEARCH CONCURRENCY
+        schema_base = self.add_int_to_schema(
+            OPTION_SEARCH_CONCURRENCY,
+            DEFAULT_OPTION_SEARCH_CONCURRENCY,
+            1,
+            MAX_SEARCH_CONCURRENCY,
+            schema_base,
+        )
+
+        # PLAYLIST
+        schema_base = self.add_int_to_schema(
+            OPTION_PLAYLIST_REFRESH_DELAY,
+            DEFAULT_OPTION_PLAYLIST_REFRESH_DELAY,
+            0,
+            MAX_PLAYLIST_REFRESH_DELAY,
+            schema_base,
+        )
+
         schema_full = vol.Schema(schema_base)
         return self.async_show_form(
             step_id="init",
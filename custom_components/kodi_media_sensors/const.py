@@ -12,6 +12,15 @@ PLAYER_ID_VIDEO = 1
 # Default Kodi playlist (0 = audio playlist, see Playlist.GetPlaylists)
 DEFAULT_PLAYLIST_ID = 0
 
+# Delta playlist subscribers not acknowledging more than this number of
+# updates get full snapshots until they catch up
+PLAYLIST_DELTA_MAX_UNACKED = 5
+# Largest window of a windowed playlist subscription
+PLAYLIST_WINDOW_MAX_SIZE = 500
+# A continuous stream of Kodi changes postpones the playlist refresh by
+# at most this many refresh delays
+PLAYLIST_REFRESH_MAX_WAIT_DELAYS = 4
+
 KODI_STATE_IDLE = "idle"
 KODI_STATE_ON = "on"
 KODI_STATE_OFF = "off"
@@ -47,6 +56,8 @@ OPTION_SEARCH_RECENTLY_ADDED_MUSICVIDEOS_LIMIT = (
 OPTION_SEARCH_RECENTLY_ADDED_EPISODES_LIMIT = "search_recently_added_episodes_limit"
 OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT = "search_recently_played_songs_limit"
 OPTION_SEARCH_RECENTLY_PLAYED_ALBUMS_LIMIT = "search_recently_played_albums_limit"
+OPTION_PLAYLIST_REFRESH_DELAY = "playlist_refresh_delay"
+OPTION_SEARCH_CONCURRENCY = "search_concurrency"
 
 
 DEFAULT_OPTION_HIDE_WATCHED = False
@@ -69,6 +80,13 @@ DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_MUSICVIDEOS_LIMIT = 20
 DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT = 10
 DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_ALBUMS_LIMIT = 10
 
+DEFAULT_OPTION_PLAYLIST_REFRESH_DELAY = 250  # milliseconds
+MAX_PLAYLIST_REFRESH_DELAY = 5000
+
+# Number of search requests sent to the same Kodi instance at once
+DEFAULT_OPTION_SEARCH_CONCURRENCY = 2
+MAX_SEARCH_CONCURRENCY = 5
+
 
 MEDIA_TYPE_ADDON = "addon"
 MEDIA_TYPE_ALBUM = "album"
@@ -86,3 +104,142 @@ MEDIA_TYPE_TVSHOW_DETAIL = "tvshowdetail"
 MEDIA_TYPE_FILE = "file"
 MEDIA_TYPE_FILE_MUSIC_PLAYLIST = "filemusicplaylist"
 
+# Internal bus event re-firing Kodi library notifications for one entry
+EVENT_LIBRARY_UPDATED = f"{DOMAIN}_library_updated"
+
+# Kodi JSON-RPC notifications forwarded as EVENT_LIBRARY_UPDATED
+# (the PVR channel scans change the channels found by the search)
+LIBRARY_NOTIFICATIONS = [
+    "AudioLibrary.OnScanStarted",
+    "AudioLibrary.OnScanFinished",
+    "AudioLibrary.OnCleanFinished",
+    "AudioLibrary.OnUpdate",
+    "AudioLibrary.OnRemove",
+    "VideoLibrary.OnScanStarted",
+    "VideoLibrary.OnScanFinished",
+    "VideoLibrary.OnCleanFinished",
+    "VideoLibrary.OnUpdate",
+    "VideoLibrary.OnRemove",
+    "PVR.OnScanStarted",
+    "PVR.OnScanFinished",
+]
+
+CATEGORY_ALL = "all"
+CATEGORY_MOVIES = "movies"
+CATEGORY_TVSHOWS = "tvshows"
+CATEGORY_SONGS = "songs"
+CATEGORY_ALBUMS = "albums"
+CATEGORY_ARTISTS = "artists"
+CATEGORY_MUSIC_VIDEOS = "musicvideos"
+CATEGORY_EPISODES = "episodes"
+CATEGORY_CHANNELS = "channels"
+CATEGORY_MUSICPLAYLIST = "musicplaylists"
+
+# Properties requested from Kodi for each search category
+SEARCH_PROPERTIES_MOVIES = ["title", "year", "thumbnail", "genre"]
+SEARCH_PROPERTIES_EPISODES = [
+    "title",
+    "episode",
+    "season",
+    "seasonid",
+    "tvshowid",
+    "thumbnail",
+    "showtitle",
+    "art",
+]
+SEARCH_PROPERTIES_MUSICVIDEOS = [
+    "thumbnail",
+    "title",
+    "year",
+    "artist",
+    "album",
+    "art",
+    "genre",
+]
+SEARCH_PROPERTIES_TVSHOWS = ["title", "year", "thumbnail", "art"]
+SEARCH_PROPERTIES_SONGS = [
+    "title",
+    "artist",
+    "year",
+    "genre",
+    "album",
+    "albumid",
+    "duration",
+    "thumbnail",
+]
+SEARCH_PROPERTIES_ALBUMS = ["title", "artist", "year", "thumbnail"]
+SEARCH_PROPERTIES_ARTISTS = ["thumbnail"]
+SEARCH_PROPERTIES_CHANNELS = [
+    "uniqueid",
+    "thumbnail",
+    "channeltype",
+    "channel",
+    "channelnumber",
+]
+
+# hass.data key of the per Kodi entity thumbnail caches
+DATA_THUMBNAIL_CACHES = f"{DOMAIN}_thumbnail_caches"
+THUMBNAIL_CACHE_MAX_SIZE = 1000
+THUMBNAIL_CACHE_TTL = 3600  # seconds
+# Thumbnails resolved at once per Kodi entity (cache misses only)
+THUMBNAIL_RESOLVE_CONCURRENCY = 8
+
+# Search results cached per entry, dropped when the Kodi library changes
+SEARCH_CACHE_MAX_SIZE = 200
+SEARCH_CACHE_TTL = 300  # seconds
+# hass.data key of the last search results of each websocket connection
+DATA_SEARCH_TYPEAHEAD = f"{DOMAIN}_search_typeahead"
+
+# hass.data key of the PVR channel catalog of each Kodi entity
+DATA_CHANNEL_CATALOGS = f"{DOMAIN}_channel_catalogs"
+CHANNEL_CATALOG_REFRESH_INTERVAL = 1800  # seconds
+
+# Number of items requested per page when bulk-loading the library index
+LIBRARY_INDEX_PAGE_SIZE = 2000
+
+# Maximum number of albums of an artist drill-down page
+ARTIST_ALBUMS_MAX_PAGE_SIZE = 200
+
+
+# hass.data key of the cached Kodi entity / core Kodi client resolutions
+DATA_KODI_RESOLUTION = f"{DOMAIN}_kodi_resolution"
+
+# hass.data key of the per Kodi entity, per JSON-RPC method call metrics
+DATA_KODI_RPC_METRICS = f"{DOMAIN}_kodi_rpc_metrics"
+# Upper bounds (ms) of the call latency histogram buckets, the last one
+# counting every slower call
+RPC_METRICS_LATENCY_BUCKETS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+# Measure the response size of 1 call in N (per method, first call included)
+RPC_METRICS_SIZE_SAMPLE_RATE = 8
+
+# hass.data key of the websocket command timings
+DATA_COMMAND_STATS = f"{DOMAIN}_command_stats"
+# Number of recent commands kept, and of the slowest of them reported
+COMMAND_STATS_RECENT_SIZE = 200
+COMMAND_STATS_SLOWEST_COUNT = 10
+
+# Field profiles selectable by the websocket commands: the fields sent
+# for each item (besides its label, type and ids), also restricting the
+# properties requested from Kodi. `full` sends everything.
+FIELD_PROFILE_MINIMAL = "minimal"
+FIELD_PROFILE_CARD = "card"
+FIELD_PROFILE_FULL = "full"
+FIELD_PROFILES = {
+    FIELD_PROFILE_MINIMAL: ["title", "file", "season", "episode"],
+    FIELD_PROFILE_CARD: [
+        "title",
+        "file",
+        "thumbnail",
+        "artist",
+        "album",
+        "showtitle",
+        "season",
+        "episode",
+        "year",
+        "duration",
+        "runtime",
+        "channeltype",
+        "channelnumber",
+    ],
+    FIELD_PROFILE_FULL: None,
+}
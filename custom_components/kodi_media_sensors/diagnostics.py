@@ -0,0 +1,21 @@
+"""Diagnostics support for Kodi Media Sensors."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .websocket.stats import async_get_stats
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the diagnostics of a config entry: its options and runtime stats."""
+    return {
+        "data": dict(entry.data),
+        "options": dict(entry.options),
+        "stats": async_get_stats(hass, [entry.entry_id]),
+    }
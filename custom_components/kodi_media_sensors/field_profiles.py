@@ -0,0 +1,69 @@
+"""Field profiles of the items sent by the websocket commands.
+
+The commands used to request a fixed list of properties from Kodi and
+to send the items whole, even to compact cards only showing a title and
+a thumbnail. A field profile (`minimal`, `card` or `full`, see
+`FIELD_PROFILES`) names the fields a client needs: the properties
+requested from Kodi are restricted to them, and so are the fields sent.
+
+The label, the type and the ids of the items (`id`, `songid`,
+`albumid`, ...) are always kept, as the frontend needs them to act on
+the items. The songs of an album and the episodes of a season are
+projected as well.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import FIELD_PROFILE_FULL, FIELD_PROFILES
+
+# Fields containing items
+_NESTED_FIELDS = ("songs", "episodes")
+
+
+def _is_identity_field(field: str) -> bool:
+    return field in ("label", "type", "id") or field.endswith("id")
+
+
+def profile_properties(
+    properties: list[str], profile: str, required: tuple[str, ...] = ()
+) -> list[str]:
+    """Return the properties to request from Kodi for a profile.
+
+    `required` are the properties needed by the command itself (e.g. to
+    group or sort the items), requested whatever the profile.
+    """
+    fields = FIELD_PROFILES[profile]
+    if fields is None:
+        return properties
+    return [
+        prop
+        for prop in properties
+        if prop in fields or prop in required or _is_identity_field(prop)
+    ]
+
+
+def project_item(item: dict, profile: str) -> dict:
+    """Return the fields of an item sent for a profile."""
+    fields = FIELD_PROFILES[profile]
+    if fields is None:
+        return item
+    return {
+        key: project_items(value, profile) if key in _NESTED_FIELDS else value
+        for key, value in item.items()
+        if key in fields or key in _NESTED_FIELDS or _is_identity_field(key)
+    }
+
+
+def project_items(items: list[Any], profile: str) -> list[Any]:
+    """Return the fields of the items sent for a profile.
+
+    The items are not modified: they may be shared with caches.
+    """
+    if profile == FIELD_PROFILE_FULL or not isinstance(items, list):
+        return items
+    return [
+        project_item(item, profile) if isinstance(item, dict) else item
+        for item in items
+    ]
@@ -12,24 +12,246 @@ returns the JSON-RPC result directly -- no event bus involved.
 
 This is an internal implementation detail of the core Kodi
 integration and is not part of its public API. If a future Home
-Assistant release changes this structure, `_async_get_kodi_client`
+Assistant release changes this structure, `_async_get_kodi_runtime_data`
 is the single place that needs updating.
 """
+
+import asyncio
+from bisect import bisect_left
+import json
 import logging
+from time import monotonic
+from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import SIGNAL_CONFIG_ENTRY_CHANGED
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import (
+    CONF_KODI_ENTITY,
+    DATA_KODI_RESOLUTION,
+    DATA_KODI_RPC_METRICS,
+    RPC_METRICS_LATENCY_BUCKETS,
+    RPC_METRICS_SIZE_SAMPLE_RATE,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _async_get_kodi_client(hass: HomeAssistant, entity_id: str):
-    """Return the pykodi.Kodi client backing the given media_player entity.
+class _KodiResolutionCache:
+    """Resolved Kodi entities and core Kodi runtime data."""
 
-    Returns None if the entity, its config entry, or the runtime data
-    is not found (e.g. the core Kodi integration is not loaded, or its
-    internal structure has changed).
+    def __init__(self) -> None:
+        """Initialisation."""
+        # kodi entity_id -> runtime data of the core Kodi config entry
+        self.runtime_data: dict[str, Any] = {}
+        # entry_id of this integration -> kodi entity_id
+        self.entity_ids: dict[str, str] = {}
+        # number of lookups that were not served from the cache
+        self.resolutions = 0
+
+    @callback
+    def async_invalidate(self, *args) -> None:
+        """Drop every cached resolution."""
+        self.runtime_data.clear()
+        self.entity_ids.clear()
+
+
+@callback
+def _async_get_resolution_cache(hass: HomeAssistant) -> _KodiResolutionCache:
+    cache = hass.data.get(DATA_KODI_RESOLUTION)
+    if cache is None:
+        cache = hass.data[DATA_KODI_RESOLUTION] = _KodiResolutionCache()
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, cache.async_invalidate)
+        async_dispatcher_connect(
+            hass, SIGNAL_CONFIG_ENTRY_CHANGED, cache.async_invalidate
+        )
+    return cache
+
+
+@callback
+def async_get_resolution_stats(hass: HomeAssistant) -> dict[str, int]:
+    """Return how often entities were actually resolved, and cache sizes."""
+    cache = _async_get_resolution_cache(hass)
+    return {
+        "resolutions": cache.resolutions,
+        "cached_clients": len(cache.runtime_data),
+        "cached_entries": len(cache.entity_ids),
+    }
+
+
+@callback
+def async_get_kodi_entity_id(hass: HomeAssistant, entry_id: str) -> str | None:
+    """Return the Kodi entity configured in the given config entry.
+
+    Returns None if the config entry is not found.
+    """
+    cache = _async_get_resolution_cache(hass)
+    kodi_entity_id = cache.entity_ids.get(entry_id)
+    if kodi_entity_id is not None:
+        return kodi_entity_id
+
+    cache.resolutions += 1
+    config_entry = hass.config_entries.async_get_entry(entry_id)
+    if config_entry is None:
+        return None
+    kodi_entity_id = config_entry.data.get(CONF_KODI_ENTITY)
+    if kodi_entity_id is not None:
+        cache.entity_ids[entry_id] = kodi_entity_id
+    return kodi_entity_id
+
+
+class _MethodMetrics:
+    """Call metrics of one JSON-RPC method of one Kodi entity."""
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "total_time",
+        "max_time",
+        "latency_buckets",
+        "sized_calls",
+        "total_bytes",
+        "max_bytes",
+    )
+
+    def __init__(self) -> None:
+        """Initialisation."""
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        # one counter per RPC_METRICS_LATENCY_BUCKETS bound, plus overflow
+        self.latency_buckets = [0] * (len(RPC_METRICS_LATENCY_BUCKETS) + 1)
+        # response sizes are only measured on a sample of the calls
+        self.sized_calls = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+
+    def record(self, elapsed: float, result: Any, failed: bool) -> None:
+        """Record one call that took `elapsed` seconds."""
+        self.calls += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        self.latency_buckets[
+            bisect_left(RPC_METRICS_LATENCY_BUCKETS, elapsed * 1000)
+        ] += 1
+        if failed:
+            self.errors += 1
+        elif (self.calls - 1) % RPC_METRICS_SIZE_SAMPLE_RATE == 0:
+            try:
+                size = len(json.dumps(result, separators=(",", ":")))
+            except (TypeError, ValueError):
+                return
+            self.sized_calls += 1
+            self.total_bytes += size
+            if size > self.max_bytes:
+                self.max_bytes = size
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics, times in ms and sizes in bytes."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_time * 1000, 1),
+            "avg_ms": (
+                round(self.total_time * 1000 / self.calls, 1) if self.calls else None
+            ),
+            "max_ms": round(self.max_time * 1000, 1),
+            "latency_ms": {
+                **{
+                    f"<={bound}": count
+                    for bound, count in zip(
+                        RPC_METRICS_LATENCY_BUCKETS, self.latency_buckets
+                    )
+                },
+                f">{RPC_METRICS_LATENCY_BUCKETS[-1]}": self.latency_buckets[-1],
+            },
+            "avg_bytes": (
+                self.total_bytes // self.sized_calls if self.sized_calls else None
+            ),
+            "max_bytes": self.max_bytes,
+        }
+
+
+class _EntityMetrics:
+    """Call metrics of the JSON-RPC methods of one Kodi entity."""
+
+    __slots__ = ("in_flight", "methods")
+
+    def __init__(self) -> None:
+        """Initialisation."""
+        # calls sent and not answered yet
+        self.in_flight = 0
+        self.methods: dict[str, _MethodMetrics] = {}
+
+    def record(self, method: str, elapsed: float, result: Any, failed: bool) -> None:
+        """Record one call of a method that took `elapsed` seconds."""
+        metrics = self.methods.get(method)
+        if metrics is None:
+            metrics = self.methods[method] = _MethodMetrics()
+        metrics.record(elapsed, result, failed)
+
+
+@callback
+def _async_get_entity_metrics(hass: HomeAssistant, entity_id: str) -> _EntityMetrics:
+    entities = hass.data.get(DATA_KODI_RPC_METRICS)
+    if entities is None:
+        entities = hass.data[DATA_KODI_RPC_METRICS] = {}
+    metrics = entities.get(entity_id)
+    if metrics is None:
+        metrics = entities[entity_id] = _EntityMetrics()
+    return metrics
+
+
+@callback
+def async_get_rpc_metrics(
+    hass: HomeAssistant, entity_id: str
+) -> dict[str, dict[str, Any]]:
+    """Return the call metrics of each JSON-RPC method called on a Kodi entity.
+
+    Methods are sorted by total time spent, so the ones dominating the
+    load come first.
     """
+    metrics = hass.data.get(DATA_KODI_RPC_METRICS, {}).get(entity_id)
+    if metrics is None:
+        return {}
+    return {
+        method: method_metrics.as_dict()
+        for method, method_metrics in sorted(
+            metrics.methods.items(), key=lambda item: item[1].total_time, reverse=True
+        )
+    }
+
+
+@callback
+def async_get_rpc_in_flight(hass: HomeAssistant, entity_id: str) -> int:
+    """Return the number of calls to a Kodi entity waiting for an answer."""
+    metrics = hass.data.get(DATA_KODI_RPC_METRICS, {}).get(entity_id)
+    return metrics.in_flight if metrics is not None else 0
+
+
+@callback
+def async_reset_rpc_metrics(hass: HomeAssistant, entity_id: str) -> None:
+    """Drop the call metrics of a Kodi entity (calls in flight are kept)."""
+    metrics = hass.data.get(DATA_KODI_RPC_METRICS, {}).get(entity_id)
+    if metrics is not None:
+        metrics.methods.clear()
+
+
+def _async_get_kodi_runtime_data(hass: HomeAssistant, entity_id: str):
+    """Return the core Kodi integration runtime data for the given entity.
+
+    Returns None if the entity or its config entry is not found.
+    """
+    cache = _async_get_resolution_cache(hass)
+    runtime_data = cache.runtime_data.get(entity_id)
+    if runtime_data is not None:
+        return runtime_data
+
+    cache.resolutions += 1
     entity_registry = er.async_get(hass)
     entity_entry = entity_registry.async_get(entity_id)
     if entity_entry is None or entity_entry.config_entry_id is None:
@@ -46,6 +268,19 @@ def _async_get_kodi_client(hass: HomeAssistant, entity_id: str):
         return None
 
     runtime_data = getattr(config_entry, "runtime_data", None)
+    if runtime_data is not None:
+        cache.runtime_data[entity_id] = runtime_data
+    return runtime_data
+
+
+def _async_get_kodi_client(hass: HomeAssistant, entity_id: str):
+    """Return the pykodi.Kodi client backing the given media_player entity.
+
+    Returns None if the entity, its config entry, or the runtime data
+    is not found (e.g. the core Kodi integration is not loaded, or its
+    internal structure has changed).
+    """
+    runtime_data = _async_get_kodi_runtime_data(hass, entity_id)
     kodi_client = getattr(runtime_data, "kodi", None)
     if kodi_client is None:
         _LOGGER.error(
@@ -58,6 +293,47 @@ def _async_get_kodi_client(hass: HomeAssistant, entity_id: str):
     return kodi_client
 
 
+@callback
+def async_get_playing_item(hass: HomeAssistant, entity_id: str) -> dict | None:
+    """Return the item played according to the core Kodi media_player.
+
+    The entity keeps the result of its last `Player.GetItem` in `_item`,
+    which always holds the Kodi `id` and `type`. This is an internal
+    detail of the core Kodi integration: None is returned if it is not
+    available, and the caller asks Kodi instead.
+    """
+    mp_component = hass.data.get("media_player")
+    mp_entity = mp_component.get_entity(entity_id) if mp_component else None
+    item = getattr(mp_entity, "_item", None)
+    if not isinstance(item, dict) or item.get("id") is None:
+        return None
+    return item
+
+
+def async_register_notification_handler(
+    hass: HomeAssistant, entity_id: str, method: str, handler
+) -> bool:
+    """Route a Kodi JSON-RPC notification (e.g. `VideoLibrary.OnUpdate`).
+
+    The handler is called as `handler(sender=..., data=...)`, the same
+    way the core Kodi media_player receives its `Player.On*`
+    notifications. Only one handler can exist per method, so never
+    register methods the core integration already listens to.
+
+    Returns False if the Kodi connection cannot push notifications
+    (HTTP-only connection, or core integration internals changed).
+    """
+    runtime_data = _async_get_kodi_runtime_data(hass, entity_id)
+    connection = getattr(runtime_data, "connection", None)
+    if connection is None or not getattr(connection, "can_subscribe", False):
+        _LOGGER.debug("Kodi notifications not available for %s", entity_id)
+        return False
+
+    namespace, name = method.split(".", 1)
+    setattr(getattr(connection.server, namespace), name, handler)
+    return True
+
+
 async def async_call_method(
     hass: HomeAssistant,
     entity_id: str,
@@ -73,11 +349,140 @@ async def async_call_method(
     if kodi_client is None:
         return None
 
+    metrics = _async_get_entity_metrics(hass, entity_id)
+    metrics.in_flight += 1
+    start = monotonic()
     try:
         result = await kodi_client.call_method(method, **params)
     except Exception as err:  # noqa: BLE001 - any JSON-RPC/connection error
+        metrics.record(method, monotonic() - start, None, True)
         _LOGGER.error("Error calling %s for %s: %s", method, entity_id, err)
         return None
+    finally:
+        metrics.in_flight -= 1
 
+    metrics.record(method, monotonic() - start, result, False)
     _LOGGER.debug("Result of %s for %s: %r", method, entity_id, result)
-    return result
\ No newline at end of file
+    return result
+
+
+class _BatchRequest:
+    """JSON-RPC 2.0 batch (array) request.
+
+    Quacks like a `jsonrpc_base.Request` so it can be handed over to the
+    `send_message` of the HTTP server used by pykodi.
+    """
+
+    def __init__(self, calls: list[tuple[str, dict]]) -> None:
+        self.calls = calls
+
+    @property
+    def response_id(self) -> str:
+        return "batch"
+
+    @property
+    def transport_error_text(self) -> str:
+        return "Error calling batch of %d methods" % len(self.calls)
+
+    def serialize(self) -> str:
+        return json.dumps(
+            [
+                {"jsonrpc": "2.0", "method": method, "params": params, "id": msg_id}
+                for msg_id, (method, params) in enumerate(self.calls)
+            ]
+        )
+
+    def parse_response(self, data) -> list[tuple[Any, Any]]:
+        """Return the (result, error) of each call, in order."""
+        if not isinstance(data, list):
+            raise ValueError(f"Batch response is not a list: {data!r}")
+        responses = {
+            response.get("id"): response
+            for response in data
+            if isinstance(response, dict)
+        }
+        parsed = []
+        for msg_id in range(len(self.calls)):
+            response = responses.get(msg_id)
+            if response is None:
+                parsed.append((None, "no response"))
+            elif response.get("error") is not None:
+                parsed.append((None, response["error"]))
+            else:
+                parsed.append((response.get("result"), None))
+        return parsed
+
+
+async def async_call_batch(
+    hass: HomeAssistant,
+    entity_id: str,
+    calls: list[tuple[str, dict]],
+) -> list[Any]:
+    """Call several Kodi JSON-RPC methods in a single round-trip.
+
+    `calls` is a list of `(method, params)`. Over an HTTP connection the
+    calls are sent as one JSON-RPC 2.0 batch (array) request; over the
+    websocket connection, whose client does not support batches, they
+    are all sent at once and awaited together.
+
+    Returns the result of each call, in order. A failed call gives None
+    (logged at debug level only: a failure may be expected, e.g. when
+    asking the properties of a player that is not active).
+    """
+    if not calls:
+        return []
+
+    runtime_data = _async_get_kodi_runtime_data(hass, entity_id)
+    connection = getattr(runtime_data, "connection", None)
+    kodi_client = getattr(runtime_data, "kodi", None)
+    if connection is None or kodi_client is None:
+        _LOGGER.error(
+            "Could not access the Kodi client for entity %s "
+            "(core Kodi integration internals may have changed)",
+            entity_id,
+        )
+        return [None] * len(calls)
+
+    methods = ", ".join(method for method, _ in calls)
+    metrics = _async_get_entity_metrics(hass, entity_id)
+    metrics.in_flight += len(calls)
+    start = monotonic()
+    try:
+        if getattr(connection, "can_subscribe", False):
+            responses = await asyncio.gather(
+                *(
+                    kodi_client.call_method(method, **params)
+                    for method, params in calls
+                ),
+                return_exceptions=True,
+            )
+            parsed = [
+                (
+                    (None, response)
+                    if isinstance(response, Exception)
+                    else (response, None)
+                )
+                for response in responses
+            ]
+        else:
+            parsed = await connection.server.send_message(_BatchRequest(calls))
+    except Exception as err:  # noqa: BLE001 - any JSON-RPC/connection error
+        elapsed = monotonic() - start
+        for method, _ in calls:
+            metrics.record(method, elapsed, None, True)
+        _LOGGER.error("Error calling [%s] for %s: %s", methods, entity_id, err)
+        return [None] * len(calls)
+    finally:
+        metrics.in_flight -= len(calls)
+
+    # each call of the batch is accounted the time of the whole round-trip
+    elapsed = monotonic() - start
+    results = []
+    for (method, _), (result, error) in zip(calls, parsed):
+        metrics.record(method, elapsed, result, error is not None)
+        if error is not None:
+            _LOGGER.debug("Error calling %s for %s: %s", method, entity_id, error)
+        results.append(result)
+
+    _LOGGER.debug("Result of [%s] for %s: %r", methods, entity_id, results)
+    return results
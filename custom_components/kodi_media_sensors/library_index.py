@@ -0,0 +1,451 @@
+"""In-memory index of the Kodi library, used by the search command.
+
+Every `kodi_media_sensors/search` used to run one `contains` filter per
+category, which forces Kodi to full-scan its SQLite tables: on large
+libraries an `all` search takes seconds. This module keeps, per Kodi
+instance, a token/prefix index of the searchable fields (titles,
+artists, albums, shows) so the search can be answered from memory.
+PVR channels are not part of the library: their searches are delegated
+to the channel catalog.
+
+The index is bulk-loaded through `async_call_method` whenever the Kodi
+entity becomes available, and kept current from the library
+notifications re-fired as `EVENT_LIBRARY_UPDATED` events:
+- `On*ScanFinished` / `On*CleanFinished` reload the affected library
+- `OnUpdate` refreshes a single item, `OnRemove` drops it
+
+A category that has not been loaded yet is "cold": `async_search`
+returns None and the caller falls back to querying Kodi.
+
+Matching: the whole query must appear in one of the searched fields,
+as with Kodi's `contains` filter, so a warm and a cold search return the
+same items. The token index only narrows the candidates: a word of the
+query preceded by a separator must start a word of the item.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+import heapq
+import logging
+import re
+import time
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CATEGORY_ALBUMS,
+    CATEGORY_ARTISTS,
+    CATEGORY_CHANNELS,
+    CATEGORY_EPISODES,
+    CATEGORY_MOVIES,
+    CATEGORY_MUSIC_VIDEOS,
+    CATEGORY_SONGS,
+    CATEGORY_TVSHOWS,
+    EVENT_LIBRARY_UPDATED,
+    KODI_STATE_OFF,
+    KODI_STATE_UNAVAILABLE,
+    LIBRARY_INDEX_PAGE_SIZE,
+    SEARCH_PROPERTIES_ALBUMS,
+    SEARCH_PROPERTIES_ARTISTS,
+    SEARCH_PROPERTIES_EPISODES,
+    SEARCH_PROPERTIES_MOVIES,
+    SEARCH_PROPERTIES_MUSICVIDEOS,
+    SEARCH_PROPERTIES_SONGS,
+    SEARCH_PROPERTIES_TVSHOWS,
+)
+from .channel_catalog import ChannelCatalog
+from .kodi_client import async_call_method
+
+_LOGGER = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+_MAX_CHAR = "\U0010ffff"
+
+# How each category is loaded from Kodi and matched against a query.
+# `fields` are the item fields searched (same as the Kodi filter fields),
+# `sort` is the field used by the Kodi sort method.
+_INDEX_SPECS = {
+    CATEGORY_MOVIES: {
+        "method": "VideoLibrary.GetMovies",
+        "result_key": "movies",
+        "id_key": "movieid",
+        "properties": SEARCH_PROPERTIES_MOVIES,
+        "fields": ["title"],
+        "sort": "title",
+        "details": ("VideoLibrary.GetMovieDetails", "moviedetails"),
+    },
+    CATEGORY_TVSHOWS: {
+        "method": "VideoLibrary.GetTVShows",
+        "result_key": "tvshows",
+        "id_key": "tvshowid",
+        "properties": SEARCH_PROPERTIES_TVSHOWS,
+        "fields": ["title"],
+        "sort": "title",
+        "details": ("VideoLibrary.GetTVShowDetails", "tvshowdetails"),
+    },
+    CATEGORY_EPISODES: {
+        "method": "VideoLibrary.GetEpisodes",
+        "result_key": "episodes",
+        "id_key": "episodeid",
+        "properties": SEARCH_PROPERTIES_EPISODES,
+        "fields": ["title"],
+        "sort": "title",
+        "details": ("VideoLibrary.GetEpisodeDetails", "episodedetails"),
+    },
+    CATEGORY_MUSIC_VIDEOS: {
+        "method": "VideoLibrary.GetMusicVideos",
+        "result_key": "musicvideos",
+        "id_key": "musicvideoid",
+        "properties": SEARCH_PROPERTIES_MUSICVIDEOS,
+        "fields": ["title", "artist"],
+        "sort": "title",
+        "details": ("VideoLibrary.GetMusicVideoDetails", "musicvideodetails"),
+    },
+    CATEGORY_SONGS: {
+        "method": "AudioLibrary.GetSongs",
+        "result_key": "songs",
+        "id_key": "songid",
+        "properties": SEARCH_PROPERTIES_SONGS,
+        "fields": ["title"],
+        "sort": "title",
+        "details": ("AudioLibrary.GetSongDetails", "songdetails"),
+    },
+    CATEGORY_ALBUMS: {
+        "method": "AudioLibrary.GetAlbums",
+        "result_key": "albums",
+        "id_key": "albumid",
+        "properties": SEARCH_PROPERTIES_ALBUMS,
+        "fields": ["title"],
+        "sort": "label",
+        "details": ("AudioLibrary.GetAlbumDetails", "albumdetails"),
+    },
+    CATEGORY_ARTISTS: {
+        "method": "AudioLibrary.GetArtists",
+        "result_key": "artists",
+        "id_key": "artistid",
+        "properties": SEARCH_PROPERTIES_ARTISTS,
+        "fields": ["artist"],
+        "sort": "label",
+        "details": ("AudioLibrary.GetArtistDetails", "artistdetails"),
+    },
+}
+
+# Categories reloaded when a library scan or clean finishes
+_LIBRARY_CATEGORIES = {
+    "AudioLibrary": [CATEGORY_SONGS, CATEGORY_ALBUMS, CATEGORY_ARTISTS],
+    "VideoLibrary": [
+        CATEGORY_MOVIES,
+        CATEGORY_TVSHOWS,
+        CATEGORY_EPISODES,
+        CATEGORY_MUSIC_VIDEOS,
+    ],
+}
+
+# Kodi item type (as sent in OnUpdate / OnRemove) -> indexed category
+_TYPE_CATEGORIES = {
+    "movie": CATEGORY_MOVIES,
+    "tvshow": CATEGORY_TVSHOWS,
+    "episode": CATEGORY_EPISODES,
+    "musicvideo": CATEGORY_MUSIC_VIDEOS,
+    "song": CATEGORY_SONGS,
+    "album": CATEGORY_ALBUMS,
+    "artist": CATEGORY_ARTISTS,
+}
+
+
+def _field_texts(item: dict, fields: list[str]) -> tuple[str, ...]:
+    """Return the case-folded values of the searched fields of an item."""
+    texts = []
+    for field in fields:
+        value = item.get(field)
+        if isinstance(value, list):
+            texts.extend(str(v).casefold() for v in value if v)
+        elif value:
+            texts.append(str(value).casefold())
+    return tuple(texts)
+
+
+class _CategoryIndex:
+    """Token/prefix index over the items of a single category."""
+
+    def __init__(self, id_key: str, fields: list[str], sort_field: str) -> None:
+        self._id_key = id_key
+        self._fields = fields
+        self._sort_field = sort_field
+        self._items: dict[Any, dict] = {}
+        self._texts: dict[Any, tuple[str, ...]] = {}
+        self._sort_keys: dict[Any, str] = {}
+        self._postings: dict[str, set] = {}
+        self._sorted_tokens: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item: dict) -> None:
+        """Add or replace an item."""
+        item_id = item.get(self._id_key)
+        if item_id is None:
+            return
+        self.remove(item_id)
+
+        texts = _field_texts(item, self._fields)
+        self._items[item_id] = item
+        self._texts[item_id] = texts
+        self._sort_keys[item_id] = str(item.get(self._sort_field) or "").casefold()
+        for token in {t for text in texts for t in _TOKEN_RE.findall(text)}:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {item_id}
+                self._sorted_tokens = None
+            else:
+                postings.add(item_id)
+
+    def remove(self, item_id: Any) -> None:
+        """Remove an item, if present."""
+        texts = self._texts.pop(item_id, None)
+        if texts is None:
+            return
+        del self._items[item_id]
+        del self._sort_keys[item_id]
+        for token in {t for text in texts for t in _TOKEN_RE.findall(text)}:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(item_id)
+            if not postings:
+                del self._postings[token]
+                self._sorted_tokens = None
+
+    def _prefix_matches(self, prefix: str) -> set:
+        """Return the ids of the items having a word starting with prefix."""
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        tokens = self._sorted_tokens
+        start = bisect_left(tokens, prefix)
+        end = bisect_left(tokens, prefix + _MAX_CHAR, start)
+        return set().union(*(self._postings[t] for t in tokens[start:end]))
+
+    def search(self, query: str, limit: int) -> list[dict]:
+        """Return up to `limit` items matching the query, in sort order."""
+        query = query.casefold()
+        candidates = None
+        for match in _TOKEN_RE.finditer(query):
+            if match.start() == 0:
+                # May start in the middle of a word of the item
+                continue
+            matches = self._prefix_matches(match.group())
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        if candidates is None:
+            candidates = self._texts.keys()
+
+        hits = (
+            item_id
+            for item_id in candidates
+            if any(query in text for text in self._texts[item_id])
+        )
+        ids = heapq.nsmallest(limit, hits, key=self._sort_keys.__getitem__)
+        return [dict(self._items[item_id]) for item_id in ids]
+
+
+class KodiLibraryIndex:
+    """Searchable in-memory copy of the library of one Kodi instance."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        kodi_entity_id: str,
+        channel_catalog: ChannelCatalog | None = None,
+    ) -> None:
+        """Initialisation."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._kodi_entity_id = kodi_entity_id
+        self._channel_catalog = channel_catalog
+        self._indexes: dict[str, _CategoryIndex] = {}
+        # Libraries being scanned: their OnUpdate are ignored, a full
+        # reload follows on OnScanFinished
+        self._scanning: set[str] = set()
+        self._sync_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        self._unsubs: list = []
+
+    @callback
+    def async_start(self) -> None:
+        """Listen to library changes and start the initial load."""
+        self._unsubs.append(
+            self._hass.bus.async_listen(
+                EVENT_LIBRARY_UPDATED, self._async_on_library_updated
+            )
+        )
+        self._unsubs.append(
+            async_track_state_change_event(
+                self._hass, [self._kodi_entity_id], self._async_on_kodi_state_change
+            )
+        )
+        if self._is_kodi_connected(self._hass.states.get(self._kodi_entity_id)):
+            self._async_schedule(self.async_sync())
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening, cancel pending loads and drop the index."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        self._indexes.clear()
+
+    def is_ready(self, category: str) -> bool:
+        """Return True if the category has been loaded."""
+        if category == CATEGORY_CHANNELS:
+            return self._channel_catalog is not None and self._channel_catalog.is_ready
+        return category in self._indexes
+
+    @callback
+    def async_get_sizes(self) -> dict[str, int]:
+        """Return the number of items indexed per loaded category."""
+        return {category: len(index) for category, index in self._indexes.items()}
+
+    @callback
+    def async_search(self, category: str, query: str, limit: int) -> list | None:
+        """Search a category in memory.
+
+        Returns None if the category is cold (not loaded yet), in which
+        case the caller must query Kodi.
+        """
+        if category == CATEGORY_CHANNELS:
+            if self._channel_catalog is None:
+                return None
+            return self._channel_catalog.async_search(query, limit)
+
+        index = self._indexes.get(category)
+        if index is None:
+            return None
+        if limit <= 0:
+            return []
+        return index.search(query, limit)
+
+    async def async_sync(self, categories: list[str] | None = None) -> None:
+        """(Re)load the given categories (all by default) from Kodi.
+
+        The previous index of a category keeps serving searches until
+        its replacement is fully loaded.
+        """
+        async with self._sync_lock:
+            for category in categories or list(_INDEX_SPECS):
+                started = time.monotonic()
+                spec = _INDEX_SPECS[category]
+                index = _CategoryIndex(spec["id_key"], spec["fields"], spec["sort"])
+                if not await self._async_load(
+                    index, spec["method"], spec["result_key"], spec["properties"]
+                ):
+                    _LOGGER.debug(
+                        "[INDEX] Could not load %s for %s",
+                        category,
+                        self._kodi_entity_id,
+                    )
+                    continue
+
+                self._indexes[category] = index
+                _LOGGER.debug(
+                    "[INDEX] Loaded %d %s for %s in %.2fs",
+                    len(index),
+                    category,
+                    self._kodi_entity_id,
+                    time.monotonic() - started,
+                )
+
+    async def _async_load(
+        self, index: _CategoryIndex, method: str, result_key: str, properties
+    ) -> bool:
+        """Page through a Kodi list method and add every item to index."""
+        start = 0
+        while True:
+            result = await async_call_method(
+                self._hass,
+                self._kodi_entity_id,
+                method,
+                properties=properties,
+                limits={"start": start, "end": start + LIBRARY_INDEX_PAGE_SIZE},
+            )
+            if result is None:
+                return False
+
+            page = result.get(result_key) or []
+            for item in page:
+                index.add(item)
+
+            start += LIBRARY_INDEX_PAGE_SIZE
+            total = result.get("limits", {}).get("total", 0)
+            if not page or start >= total:
+                return True
+
+    async def _async_refresh_item(self, category: str, item_id: Any) -> None:
+        """Re-read a single item from Kodi after an OnUpdate notification."""
+        spec = _INDEX_SPECS[category]
+        method, result_key = spec["details"]
+        result = await async_call_method(
+            self._hass,
+            self._kodi_entity_id,
+            method,
+            properties=spec["properties"],
+            **{spec["id_key"]: item_id},
+        )
+        index = self._indexes.get(category)
+        if index is not None and result and result.get(result_key):
+            index.add(result[result_key])
+
+    @callback
+    def _async_schedule(self, coro) -> None:
+        task = self._hass.async_create_background_task(
+            coro, f"{self._kodi_entity_id} library index"
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _is_kodi_connected(state) -> bool:
+        return state is not None and state.state not in (
+            KODI_STATE_OFF,
+            KODI_STATE_UNAVAILABLE,
+        )
+
+    @callback
+    def _async_on_kodi_state_change(self, event: Event) -> None:
+        """Reload everything when Kodi comes back (the library may differ)."""
+        if self._is_kodi_connected(
+            event.data.get("new_state")
+        ) and not self._is_kodi_connected(event.data.get("old_state")):
+            self._async_schedule(self.async_sync())
+
+    @callback
+    def _async_on_library_updated(self, event: Event) -> None:
+        if event.data.get("entry_id") != self._entry_id:
+            return
+
+        library, _, name = event.data.get("method", "").partition(".")
+        data = event.data.get("data") or {}
+
+        if name == "OnScanStarted":
+            self._scanning.add(library)
+        elif name in ("OnScanFinished", "OnCleanFinished"):
+            self._scanning.discard(library)
+            if library in _LIBRARY_CATEGORIES:
+                self._async_schedule(self.async_sync(_LIBRARY_CATEGORIES[library]))
+        elif library in self._scanning:
+            return
+        elif name == "OnRemove":
+            category = _TYPE_CATEGORIES.get(data.get("type"))
+            if category in self._indexes:
+                self._indexes[category].remove(data.get("id"))
+        elif name == "OnUpdate":
+            category = _TYPE_CATEGORIES.get(data.get("type"))
+            if category in self._indexes and data.get("id") is not None:
+                self._async_schedule(self._async_refresh_item(category, data["id"]))
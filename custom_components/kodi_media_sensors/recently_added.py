@@ -0,0 +1,458 @@
+"""Recently added items of a Kodi instance, kept up to date incrementally.
+
+`kodi_media_sensors/search_recently_added` used to download the five
+recently added lists (songs, albums, movies, episodes, music videos) in
+full every time a card was opened.
+
+The store keeps, per Kodi instance, the most recently added items of
+each category (as many as the entry options ask for), and the most
+recent `dateadded` seen in each: its watermark. After a library scan, or
+when an item is added, only the items added since the watermark are
+requested from Kodi, and the additions are pushed to the subscribers.
+Opening a card costs no Kodi call once the store is loaded.
+
+Everything is reloaded when Kodi comes back, after a library clean and
+when the options change; removed items are dropped right away, and the
+category is fetched again to fill the free slot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_ALBUMS_LIMIT,
+    DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_EPISODES_LIMIT,
+    DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_MOVIES_LIMIT,
+    DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_MUSICVIDEOS_LIMIT,
+    DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_SONGS_LIMIT,
+    EVENT_LIBRARY_UPDATED,
+    KODI_STATE_OFF,
+    KODI_STATE_UNAVAILABLE,
+    OPTION_SEARCH_RECENTLY_ADDED_ALBUMS_LIMIT,
+    OPTION_SEARCH_RECENTLY_ADDED_EPISODES_LIMIT,
+    OPTION_SEARCH_RECENTLY_ADDED_MOVIES_LIMIT,
+    OPTION_SEARCH_RECENTLY_ADDED_MUSICVIDEOS_LIMIT,
+    OPTION_SEARCH_RECENTLY_ADDED_SONGS_LIMIT,
+)
+from .kodi_client import async_call_batch
+
+_LOGGER = logging.getLogger(__name__)
+
+# How each category is requested from Kodi, and the entry option (and
+# its default) giving the number of items kept
+_CATEGORY_SPECS = {
+    "songs": {
+        "method": "AudioLibrary.GetSongs",
+        "id_key": "songid",
+        "properties": [
+            "title",
+            "artist",
+            "album",
+            "duration",
+            "thumbnail",
+            "file",
+            "albumid",
+        ],
+        "limit": (
+            OPTION_SEARCH_RECENTLY_ADDED_SONGS_LIMIT,
+            DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_SONGS_LIMIT,
+        ),
+    },
+    "albums": {
+        "method": "AudioLibrary.GetAlbums",
+        "id_key": "albumid",
+        "properties": [
+            "thumbnail",
+            "title",
+            "year",
+            "art",
+            "genre",
+            "artist",
+            "artistid",
+        ],
+        "limit": (
+            OPTION_SEARCH_RECENTLY_ADDED_ALBUMS_LIMIT,
+            DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_ALBUMS_LIMIT,
+        ),
+    },
+    "movies": {
+        "method": "VideoLibrary.GetMovies",
+        "id_key": "movieid",
+        "properties": ["title", "year", "thumbnail", "file", "rating"],
+        "limit": (
+            OPTION_SEARCH_RECENTLY_ADDED_MOVIES_LIMIT,
+            DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_MOVIES_LIMIT,
+        ),
+    },
+    "episodes": {
+        "method": "VideoLibrary.GetEpisodes",
+        "id_key": "episodeid",
+        "properties": [
+            "title",
+            "episode",
+            "season",
+            "seasonid",
+            "tvshowid",
+            "thumbnail",
+            "showtitle",
+            "art",
+        ],
+        "limit": (
+            OPTION_SEARCH_RECENTLY_ADDED_EPISODES_LIMIT,
+            DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_EPISODES_LIMIT,
+        ),
+    },
+    "musicvideos": {
+        "method": "VideoLibrary.GetMusicVideos",
+        "id_key": "musicvideoid",
+        "properties": [
+            "thumbnail",
+            "title",
+            "year",
+            "artist",
+            "album",
+            "art",
+            "genre",
+        ],
+        "limit": (
+            OPTION_SEARCH_RECENTLY_ADDED_MUSICVIDEOS_LIMIT,
+            DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_MUSICVIDEOS_LIMIT,
+        ),
+    },
+}
+
+# Categories updated when a library scan or clean finishes
+_LIBRARY_CATEGORIES = {
+    "AudioLibrary": ["songs", "albums"],
+    "VideoLibrary": ["movies", "episodes", "musicvideos"],
+}
+
+# Kodi item type (as sent in OnUpdate / OnRemove) -> category
+_TYPE_CATEGORIES = {
+    "song": "songs",
+    "album": "albums",
+    "movie": "movies",
+    "episode": "episodes",
+    "musicvideo": "musicvideos",
+}
+
+# Listener of the changes: (added items, removed ids), per category
+RecentlyAddedListener = Callable[[dict[str, list], dict[str, list]], None]
+
+
+def _prepare_item(category: str, item: dict) -> dict:
+    """Return an item as sent by `search_recently_added`."""
+    if category == "episodes":
+        return {
+            **item,
+            "artist": item.get("showtitle"),
+            "label": f"S{item.get('season', 0):02d}E{item.get('episode', 0):02d}"
+            f" - {item.get('title')}",
+        }
+    return item
+
+
+class RecentlyAddedStore:
+    """Most recently added items of one Kodi instance, per category."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, kodi_entity_id: str) -> None:
+        """Initialisation."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._kodi_entity_id = kodi_entity_id
+        # Items of the loaded categories, most recent first
+        self._items: dict[str, list[dict]] = {}
+        self._watermarks: dict[str, str | None] = {}
+        # Categories to update (True for a full reload)
+        self._pending: dict[str, bool] = {}
+        self._update_task: asyncio.Task | None = None
+        # Libraries being scanned: their OnUpdate are ignored, an update
+        # follows OnScanFinished
+        self._scanning: set[str] = set()
+        self._listeners: list[RecentlyAddedListener] = []
+        self._unsubs: list = []
+        self.full_loads = 0
+        self.incremental_loads = 0
+
+    @property
+    def is_ready(self) -> bool:
+        """Return True if every category has been loaded."""
+        return len(self._items) == len(_CATEGORY_SPECS)
+
+    @callback
+    def async_start(self) -> None:
+        """Listen to library changes and start the initial load."""
+        self._unsubs.append(
+            self._hass.bus.async_listen(
+                EVENT_LIBRARY_UPDATED, self._async_on_library_updated
+            )
+        )
+        self._unsubs.append(
+            async_track_state_change_event(
+                self._hass, [self._kodi_entity_id], self._async_on_kodi_state_change
+            )
+        )
+        if self._is_kodi_connected(self._hass.states.get(self._kodi_entity_id)):
+            self.async_reload()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening, cancel the pending update and drop the items."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._update_task is not None:
+            self._update_task.cancel()
+        self._pending.clear()
+        self._listeners.clear()
+        self._items.clear()
+        self._watermarks.clear()
+
+    @callback
+    def async_reload(self) -> None:
+        """Schedule a full reload (e.g. after the limits changed)."""
+        self._async_schedule_update(list(_CATEGORY_SPECS), full=True)
+
+    @callback
+    def async_get_items(self) -> dict[str, list[dict]]:
+        """Return a copy of the items of every category, most recent first."""
+        return {
+            category: [dict(item) for item in self._items.get(category, [])]
+            for category in _CATEGORY_SPECS
+        }
+
+    async def async_load_once(self) -> bool:
+        """Load the store unless already loaded. Returns is_ready."""
+        if not self.is_ready:
+            self._async_schedule_update(
+                [
+                    category
+                    for category in _CATEGORY_SPECS
+                    if category not in self._items
+                ],
+                full=True,
+            )
+        if self._update_task is not None:
+            await asyncio.shield(self._update_task)
+        return self.is_ready
+
+    @callback
+    def async_subscribe(self, listener: RecentlyAddedListener) -> Callable[[], None]:
+        """Call listener with the items added (and removed) from now on."""
+        self._listeners.append(listener)
+
+        @callback
+        def _async_unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _async_unsubscribe
+
+    @callback
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return the size and state of the store, for diagnostics."""
+        return {
+            "items": {category: len(items) for category, items in self._items.items()},
+            "watermarks": dict(self._watermarks),
+            "subscribers": len(self._listeners),
+            "full_loads": self.full_loads,
+            "incremental_loads": self.incremental_loads,
+        }
+
+    def _limit(self, category: str) -> int:
+        config_entry = self._hass.config_entries.async_get_entry(self._entry_id)
+        option, default = _CATEGORY_SPECS[category]["limit"]
+        options = config_entry.options if config_entry is not None else {}
+        return max(int(options.get(option, default)), 0)
+
+    @callback
+    def _async_schedule_update(self, categories: list[str], full: bool = False) -> None:
+        """Update the categories, after the update in progress if any."""
+        for category in categories:
+            self._pending[category] = self._pending.get(category, False) or full
+        if self._update_task is None and self._pending:
+            self._update_task = self._hass.async_create_background_task(
+                self._async_run_updates(), f"{self._kodi_entity_id} recently added"
+            )
+            self._update_task.add_done_callback(self._async_on_update_done)
+
+    @callback
+    def _async_on_update_done(self, task: asyncio.Task) -> None:
+        if self._update_task is task:
+            self._update_task = None
+            if not task.cancelled():
+                # Changes received while the last update was finishing
+                self._async_schedule_update([])
+
+    async def _async_run_updates(self) -> None:
+        while self._pending:
+            pending, self._pending = self._pending, {}
+            await self._async_update(pending)
+
+    def _get_call(self, category: str, limit: int, watermark: str | None):
+        """Return the call of the `limit` items of a category added last.
+
+        With a watermark, only the items added since (included, as they
+        may have been added in the same second) are requested.
+        """
+        spec = _CATEGORY_SPECS[category]
+        params = {
+            "properties": spec["properties"] + ["dateadded"],
+            "sort": {"method": "dateadded", "order": "descending"},
+            "limits": {"start": 0, "end": limit},
+        }
+        if watermark:
+            params["filter"] = {
+                "or": [
+                    {"field": "dateadded", "operator": "after", "value": watermark},
+                    {"field": "dateadded", "operator": "is", "value": watermark},
+                ]
+            }
+        return (spec["method"], params)
+
+    async def _async_update(self, pending: dict[str, bool]) -> None:
+        """Fetch the items added since the watermarks, all in one batch."""
+        limits = {category: self._limit(category) for category in pending}
+        full = {
+            category: is_full or self._watermarks.get(category) is None
+            for category, is_full in pending.items()
+        }
+        categories = [category for category in pending if limits[category] > 0]
+        results = await async_call_batch(
+            self._hass,
+            self._kodi_entity_id,
+            [
+                self._get_call(
+                    category,
+                    limits[category],
+                    None if full[category] else self._watermarks[category],
+                )
+                for category in categories
+            ],
+        )
+        results_by_category = dict(zip(categories, results))
+
+        added: dict[str, list] = {}
+        removed: dict[str, list] = {}
+        for category in pending:
+            id_key = _CATEGORY_SPECS[category]["id_key"]
+            if limits[category] <= 0:
+                result = {}
+            else:
+                result = results_by_category[category]
+                if result is None:
+                    _LOGGER.debug(
+                        "[RECENTLY ADDED] Could not update %s for %s",
+                        category,
+                        self._kodi_entity_id,
+                    )
+                    continue
+
+            items = [
+                _prepare_item(category, item) for item in result.get(category) or []
+            ]
+            old_items = self._items.get(category, [])
+            old_ids = {item.get(id_key) for item in old_items}
+            if full[category]:
+                self.full_loads += 1
+            else:
+                items = [item for item in items if item.get(id_key) not in old_ids]
+                items = (items + old_items)[: limits[category]]
+                self.incremental_loads += 1
+
+            self._items[category] = items
+            self._watermarks[category] = max(
+                (item["dateadded"] for item in items if item.get("dateadded")),
+                default=None,
+            )
+            kept_ids = {item.get(id_key) for item in items}
+            category_added = [
+                dict(item) for item in items if item.get(id_key) not in old_ids
+            ]
+            category_removed = [
+                item.get(id_key)
+                for item in old_items
+                if item.get(id_key) not in kept_ids
+            ]
+            if category_added:
+                added[category] = category_added
+            if category_removed:
+                removed[category] = category_removed
+
+        self._async_notify(added, removed)
+
+    @callback
+    def _async_notify(self, added: dict[str, list], removed: dict[str, list]) -> None:
+        if not added and not removed:
+            return
+        for listener in list(self._listeners):
+            listener(added, removed)
+
+    @callback
+    def _async_remove(self, category: str, item_id: Any) -> None:
+        """Drop a removed item, and refill the list if it was full.
+
+        The items added before the watermark are not requested by the
+        incremental updates: the category is fetched again, in one call
+        bounded by its limit.
+        """
+        items = self._items.get(category)
+        if not items:
+            return
+        id_key = _CATEGORY_SPECS[category]["id_key"]
+        kept = [item for item in items if item.get(id_key) != item_id]
+        if len(kept) != len(items):
+            self._items[category] = kept
+            self._async_notify({}, {category: [item_id]})
+            if len(items) >= self._limit(category):
+                # Kodi may have older items to take the free slot
+                self._async_schedule_update([category], full=True)
+
+    @staticmethod
+    def _is_kodi_connected(state) -> bool:
+        return state is not None and state.state not in (
+            KODI_STATE_OFF,
+            KODI_STATE_UNAVAILABLE,
+        )
+
+    @callback
+    def _async_on_kodi_state_change(self, event: Event) -> None:
+        """Reload everything when Kodi comes back (the library may differ)."""
+        if self._is_kodi_connected(
+            event.data.get("new_state")
+        ) and not self._is_kodi_connected(event.data.get("old_state")):
+            self.async_reload()
+
+    @callback
+    def _async_on_library_updated(self, event: Event) -> None:
+        if event.data.get("entry_id") != self._entry_id:
+            return
+
+        library, _, name = event.data.get("method", "").partition(".")
+        data = event.data.get("data") or {}
+
+        if name == "OnScanStarted":
+            self._scanning.add(library)
+        elif name == "OnScanFinished":
+            self._scanning.discard(library)
+            if library in _LIBRARY_CATEGORIES:
+                self._async_schedule_update(_LIBRARY_CATEGORIES[library])
+        elif name == "OnCleanFinished":
+            if library in _LIBRARY_CATEGORIES:
+                self._async_schedule_update(_LIBRARY_CATEGORIES[library], full=True)
+        elif name == "OnRemove":
+            category = _TYPE_CATEGORIES.get(data.get("type"))
+            if category is not None:
+                self._async_remove(category, data.get("id"))
+        elif name == "OnUpdate" and data.get("added") and library not in self._scanning:
+            # An item added outside of a scan (the items added by a scan
+            # are fetched once it is finished)
+            category = _TYPE_CATEGORIES.get(data.get("type"))
+            if category is not None:
+                self._async_schedule_update([category])
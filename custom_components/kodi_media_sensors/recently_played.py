@@ -0,0 +1,340 @@
+"""Recently played songs and albums of a Kodi instance, kept in memory.
+
+`kodi_media_sensors/search_recently_played` used to ask Kodi, on every
+call, for the songs sorted by `lastplayed`: Kodi sorts its whole song
+table to answer, one of the heaviest queries on large libraries.
+
+The buffer keeps, per Kodi instance, the most recently played songs and
+albums (as many as the entry options ask for, the oldest being dropped
+first). It is seeded once from Kodi, then fed by the changes of the Kodi
+media_player entity: a song counts as played when it starts, and only
+its details (and those of its album, the first time) are requested.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import logging
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_ALBUMS_LIMIT,
+    DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT,
+    KODI_STATE_OFF,
+    KODI_STATE_UNAVAILABLE,
+    OPTION_SEARCH_RECENTLY_PLAYED_ALBUMS_LIMIT,
+    OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT,
+    PLAYER_ID_AUDIO,
+)
+from .kodi_client import async_call_batch, async_call_method, async_get_playing_item
+
+_LOGGER = logging.getLogger(__name__)
+
+_SONG_PROPERTIES = [
+    "title",
+    "album",
+    "albumid",
+    "artist",
+    "artistid",
+    "track",
+    "year",
+    "duration",
+    "genre",
+    "thumbnail",
+]
+_ALBUM_PROPERTIES = ["thumbnail", "title", "year", "art", "genre", "artist", "artistid"]
+
+
+class RecentlyPlayedBuffer:
+    """Bounded buffers of the songs and albums played last on one Kodi."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, kodi_entity_id: str) -> None:
+        """Initialisation."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._kodi_entity_id = kodi_entity_id
+        # Least recently played first, keyed by songid / albumid
+        self._songs: OrderedDict[Any, dict] = OrderedDict()
+        self._albums: OrderedDict[Any, dict] = OrderedDict()
+        self._seeded = False
+        self._seed_task: asyncio.Task | None = None
+        # Set when the limits changed while the seed was running
+        self._reseed = False
+        # Plays are recorded one at a time, in the order they started
+        self._record_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        # What the Kodi entity was playing at its last change
+        self._playing_key: tuple | None = None
+        self._unsubs: list = []
+        self.plays = 0
+
+    @property
+    def is_ready(self) -> bool:
+        """Return True if the buffer has been seeded from Kodi."""
+        return self._seeded
+
+    @callback
+    def async_start(self) -> None:
+        """Follow the Kodi entity, and seed the buffer if Kodi is there."""
+        self._unsubs.append(
+            async_track_state_change_event(
+                self._hass, [self._kodi_entity_id], self._async_on_kodi_state_change
+            )
+        )
+        if self._is_kodi_connected(self._hass.states.get(self._kodi_entity_id)):
+            self._async_schedule_seed()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the Kodi entity and drop the buffer."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._seed_task is not None:
+            self._seed_task.cancel()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        self._songs.clear()
+        self._albums.clear()
+        self._seeded = False
+
+    @callback
+    def async_reseed(self) -> None:
+        """Seed the buffer again (e.g. after the limits changed).
+
+        A seed already running starts over with the new limits.
+        """
+        self._seeded = False
+        self._reseed = True
+        self._async_schedule_seed()
+
+    async def async_load_once(self) -> bool:
+        """Seed the buffer unless already seeded. Returns is_ready."""
+        if not self._seeded:
+            await asyncio.shield(self._async_schedule_seed())
+        return self._seeded
+
+    @callback
+    def async_get_items(self) -> dict[str, list[dict]]:
+        """Return a copy of the songs and albums, most recently played first."""
+        return {
+            "songs": [dict(song) for song in reversed(self._songs.values())],
+            "albums": [dict(album) for album in reversed(self._albums.values())],
+        }
+
+    @callback
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return the size and state of the buffer, for diagnostics."""
+        return {
+            "seeded": self._seeded,
+            "songs": len(self._songs),
+            "albums": len(self._albums),
+            "plays": self.plays,
+        }
+
+    def _limits(self) -> tuple[int, int]:
+        """Return the number of songs and of albums kept."""
+        config_entry = self._hass.config_entries.async_get_entry(self._entry_id)
+        options = config_entry.options if config_entry is not None else {}
+        return tuple(
+            max(int(options.get(option, default)), 0)
+            for option, default in (
+                (
+                    OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT,
+                    DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT,
+                ),
+                (
+                    OPTION_SEARCH_RECENTLY_PLAYED_ALBUMS_LIMIT,
+                    DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_ALBUMS_LIMIT,
+                ),
+            )
+        )
+
+    @callback
+    def _async_schedule_seed(self) -> asyncio.Task:
+        if self._seed_task is None:
+            self._seed_task = self._hass.async_create_background_task(
+                self._async_seed(), f"{self._kodi_entity_id} recently played"
+            )
+            self._seed_task.add_done_callback(self._async_on_seed_done)
+        return self._seed_task
+
+    @callback
+    def _async_on_seed_done(self, task: asyncio.Task) -> None:
+        if self._seed_task is task:
+            self._seed_task = None
+
+    async def _async_seed(self) -> None:
+        """Load the songs and albums played last from Kodi."""
+        self._reseed = False
+        songs_limit, albums_limit = self._limits()
+        raw_songs, raw_albums = await async_call_batch(
+            self._hass,
+            self._kodi_entity_id,
+            [
+                (
+                    "AudioLibrary.GetSongs",
+                    {
+                        "properties": _SONG_PROPERTIES,
+                        "sort": {"method": "lastplayed", "order": "descending"},
+                        "limits": {"start": 0, "end": songs_limit},
+                    },
+                ),
+                (
+                    "AudioLibrary.GetRecentlyPlayedAlbums",
+                    {
+                        "properties": _ALBUM_PROPERTIES,
+                        "limits": {"start": 0, "end": albums_limit},
+                    },
+                ),
+            ],
+        )
+        if self._reseed:
+            # Fetched with the former limits
+            await self._async_seed()
+            return
+        if raw_songs is None or raw_albums is None:
+            _LOGGER.debug("[RECENTLY PLAYED] Could not seed %s", self._kodi_entity_id)
+            return
+
+        async with self._record_lock:
+            # Plays recorded meanwhile are more recent than the seed
+            self._songs = self._merge(
+                raw_songs.get("songs") or [], "songid", self._songs, songs_limit
+            )
+            self._albums = self._merge(
+                raw_albums.get("albums") or [], "albumid", self._albums, albums_limit
+            )
+            self._seeded = True
+        _LOGGER.debug(
+            "[RECENTLY PLAYED] Seeded %d songs and %d albums for %s",
+            len(self._songs),
+            len(self._albums),
+            self._kodi_entity_id,
+        )
+
+    @staticmethod
+    def _merge(
+        items: list[dict], id_key: str, played: OrderedDict, limit: int
+    ) -> OrderedDict:
+        """Return the items (most recent first) followed by the played ones."""
+        merged = OrderedDict((item.get(id_key), item) for item in reversed(items))
+        for item_id, item in played.items():
+            merged[item_id] = item
+            merged.move_to_end(item_id)
+        while len(merged) > limit:
+            merged.popitem(last=False)
+        return merged
+
+    @staticmethod
+    def _push(buffer: OrderedDict, item_id: Any, item: dict, limit: int) -> None:
+        """Make an item the most recent of a buffer, dropping the oldest."""
+        buffer[item_id] = item
+        buffer.move_to_end(item_id)
+        while len(buffer) > limit:
+            buffer.popitem(last=False)
+
+    async def _async_record_play(self, song_id: int | None) -> None:
+        """Record the song playing (asking Kodi which one if None)."""
+        async with self._record_lock:
+            songs_limit, albums_limit = self._limits()
+            if song_id is None:
+                result = await async_call_method(
+                    self._hass,
+                    self._kodi_entity_id,
+                    "Player.GetItem",
+                    playerid=PLAYER_ID_AUDIO,
+                    properties=_SONG_PROPERTIES,
+                )
+                song = (result or {}).get("item") or {}
+                if song.get("type") != "song" or not song.get("id"):
+                    return
+                song_id = song.pop("id")
+                song.pop("type", None)
+                song["songid"] = song_id
+            else:
+                result = await async_call_method(
+                    self._hass,
+                    self._kodi_entity_id,
+                    "AudioLibrary.GetSongDetails",
+                    songid=song_id,
+                    properties=_SONG_PROPERTIES,
+                )
+                song = (result or {}).get("songdetails")
+                if not song:
+                    return
+
+            self.plays += 1
+            self._push(self._songs, song_id, song, songs_limit)
+
+            album_id = song.get("albumid")
+            if not album_id:
+                return
+            album = self._albums.get(album_id)
+            if album is None:
+                result = await async_call_method(
+                    self._hass,
+                    self._kodi_entity_id,
+                    "AudioLibrary.GetAlbumDetails",
+                    albumid=album_id,
+                    properties=_ALBUM_PROPERTIES,
+                )
+                album = (result or {}).get("albumdetails")
+                if not album:
+                    return
+            self._push(self._albums, album_id, album, albums_limit)
+
+    @callback
+    def _async_schedule_record(self, song_id: int | None) -> None:
+        task = self._hass.async_create_background_task(
+            self._async_record_play(song_id),
+            f"{self._kodi_entity_id} recently played song",
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _is_kodi_connected(state) -> bool:
+        return state is not None and state.state not in (
+            KODI_STATE_OFF,
+            KODI_STATE_UNAVAILABLE,
+        )
+
+    @callback
+    def _async_on_kodi_state_change(self, event: Event) -> None:
+        """Record the songs started, and seed the buffer once Kodi is there."""
+        new_state = event.data.get("new_state")
+        if not self._is_kodi_connected(new_state):
+            self._playing_key = None
+            return
+        if not self._seeded:
+            self._async_schedule_seed()
+
+        if new_state.state != "playing":
+            return
+        item = async_get_playing_item(self._hass, self._kodi_entity_id)
+        if item is not None:
+            key = (item.get("type"), item["id"])
+        else:
+            # The core entity does not tell the Kodi id: a change of the
+            # played media is asked to Kodi
+            attributes = new_state.attributes
+            key = (
+                attributes.get("media_content_type"),
+                attributes.get("media_content_id"),
+                attributes.get("media_title"),
+            )
+        if key == self._playing_key:
+            # Same media as before (seek, volume...)
+            return
+        self._playing_key = key
+
+        if item is None:
+            if key[0] == "music":
+                self._async_schedule_record(None)
+        elif item.get("type") == "song" and item["id"] > 0:
+            self._async_schedule_record(item["id"])
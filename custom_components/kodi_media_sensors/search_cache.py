@@ -0,0 +1,114 @@
+"""Cache of the search results returned by Kodi.
+
+Identical searches (e.g. when switching back and forth between the tabs
+of the search card) used to be sent to Kodi every time. The results of
+each category are kept per entry, keyed by the case-folded query, the
+category and its limit, in a bounded LRU cache expiring after a TTL.
+
+The whole cache is dropped as soon as Kodi reports a change of its
+libraries, so a cached result is never older than the library. Its
+`generation` changes at the same time, for the holders of results
+obtained before.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import EVENT_LIBRARY_UPDATED
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Return the query as Kodi compares it (case ignored, spacing kept)."""
+    return query.casefold()
+
+
+class SearchResultCache:
+    """Bounded LRU cache, with TTL, of the search results of one entry."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, max_size: int, ttl: float
+    ) -> None:
+        """Initialisation."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._max_size = max_size
+        self._ttl = ttl
+        # key -> (expiry time, items), least recently used first
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._unsub = None
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @callback
+    def async_start(self) -> None:
+        """Listen to library changes."""
+        self._unsub = self._hass.bus.async_listen(
+            EVENT_LIBRARY_UPDATED, self._async_on_library_updated
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening and drop the cached results."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._entries.clear()
+
+    @staticmethod
+    def key(query: str, category: str, limit: Any) -> tuple:
+        """Return the cache key of the search of a category."""
+        return (normalize_query(query), category, limit)
+
+    @callback
+    def async_get(self, key: tuple) -> Any | None:
+        """Return the cached items, or None if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    @callback
+    def async_set(self, key: tuple, items: Any) -> None:
+        """Cache the items found for a key."""
+        self._entries[key] = (time.monotonic() + self._ttl, items)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    @callback
+    def async_clear(self) -> None:
+        """Drop every cached result."""
+        self._entries.clear()
+        self.generation += 1
+
+    @callback
+    def _async_on_library_updated(self, event: Event) -> None:
+        if event.data.get("entry_id") != self._entry_id:
+            return
+        if event.data.get("method", "").endswith(".OnScanStarted"):
+            # Nothing changed yet: the updates will follow
+            return
+        if self._entries:
+            _LOGGER.debug(
+                "[SEARCH] %s: dropping %d cached results",
+                event.data.get("method"),
+                len(self._entries),
+            )
+        self.async_clear()
@@ -1,6 +1,7 @@
 """Support for Kodi config sensors."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -10,8 +11,8 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import async_track_state_change_event
 
-from .const import DOMAIN, CONF_KODI_ENTITY
-from .kodi_client import async_call_method
+from .const import DOMAIN, CONF_KODI_ENTITY, PLAYER_ID_AUDIO, PLAYER_ID_VIDEO
+from .kodi_client import async_call_batch, async_get_playing_item
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,6 +43,10 @@ class KodiConfigSensor(SensorEntity):
         self._attr_unique_id = f"{entry.entry_id}_state"
         self._attr_state = "unavailable"
         self._current_track: dict[str, Any] | None = None
+        # Update of the current track in flight, and the item it is for
+        self._track_task: asyncio.Task | None = None
+        self._track_task_item: tuple | None = None
+        self._track_seq = 0
 
     async def async_added_to_hass(self) -> None:
         """Subscribe to Kodi entity state changes when sensor is added."""
@@ -62,7 +67,7 @@ class KodiConfigSensor(SensorEntity):
         state = self._hass.states.get(self._kodi_entity_id)
         if state:
             self._attr_state = state.state
-            await self._async_update_current_track()
+            self._current_track = await self._async_get_current_track()
         else:
             self._attr_state = "unavailable"
 
@@ -73,6 +78,8 @@ class KodiConfigSensor(SensorEntity):
         """Unsubscribe from state changes when sensor is removed."""
         if self._unsubscribe_state_change:
             self._unsubscribe_state_change()
+        if self._track_task is not None:
+            self._track_task.cancel()
         await super().async_will_remove_from_hass()
 
     @callback
@@ -83,95 +90,114 @@ class KodiConfigSensor(SensorEntity):
         if new_state:
             self._attr_state = new_state.state
             # Update the current_track asynchronously
-            self._hass.async_create_task(self._async_update_current_track())
+            self._async_schedule_current_track_update()
             self.async_write_ha_state()
             _LOGGER.debug("Kodi sensor %s state updated to %s", self.unique_id, self._attr_state)
 
-    async def _async_update_current_track(self) -> None:
-        """Fetch the current playing item's ID and type only.
-    
+    def _get_playing_item(self) -> dict[str, Any] | None:
+        """Return the item played according to the core Kodi media_player."""
+        return async_get_playing_item(self._hass, self._kodi_entity_id)
+
+    async def _async_fetch_playing_item(self) -> dict[str, Any] | None:
+        """Ask Kodi for the playing item, with its artist IDs.
+
+        The audio and video players are asked in a single batch, instead
+        of looking for the active player first.
+        """
+        results = await async_call_batch(
+            self._hass,
+            self._kodi_entity_id,
+            [
+                ("Player.GetItem", {"playerid": player_id, "properties": ["artistid"]})
+                for player_id in (PLAYER_ID_AUDIO, PLAYER_ID_VIDEO)
+            ],
+        )
+        for result in results:
+            item = (result or {}).get("item")
+            if item and item.get("id") is not None:
+                return item
+        return None
+
+    async def _async_get_current_track(self) -> dict[str, Any] | None:
+        """Return the current playing item's ID and type only.
+
         ID is the unique identifier in Kodi (songid, movieid, episodeid, etc).
+        Both are read from the core Kodi media_player entity; Kodi is only
+        asked for the artist ID of a new song, or when the entity cannot
+        tell what is playing.
         """
+        if self._attr_state in ("unavailable", "off", "idle"):
+            return None
+
+        item = self._get_playing_item()
+        previous = self._current_track
+        if (
+            item is not None
+            and previous is not None
+            and previous["id"] == item["id"]
+            and previous["type"] == item.get("type")
+        ):
+            # Same item as before (pause, seek, volume...)
+            return previous
+
+        if item is None or item.get("type") == "song":
+            try:
+                item = await self._async_fetch_playing_item()
+            except Exception as err:
+                _LOGGER.debug("Error updating current track: %s", err)
+                item = None
+
+        if item is None:
+            return None
+
+        track = {
+            "id": item["id"],
+            "type": item.get("type"),
+        }
+        artist_id = _first_artist_id(item.get("artistid"))
+        if artist_id is not None:
+            track["artist_id"] = artist_id
+        return track
+
+    @callback
+    def _async_schedule_current_track_update(self) -> None:
+        """Update the current track, superseding an update in flight.
 
-       # Quick call to send ID's
-        result = await async_call_method(self._hass, self._kodi_entity_id, "Player.GetActivePlayers")
-        if result:
-            player_id = result[0].get("playerid")
-            
-            item_data = await async_call_method(
-                self._hass, 
-                self._kodi_entity_id, 
-                "Player.GetItem", 
-                playerid=player_id, 
-                properties=["title"]
-            )
-            
-            if item_data and "item" in item_data:
-                item = item_data["item"]
-                self._current_track = {"id": item.get("id"), "type": item.get("type")}
-                self.async_write_ha_state()
-
-        # Back to normal process
+        At most one update runs: the one in flight is cancelled unless it
+        is already for the item now playing. Only the latest scheduled
+        update may write its result.
+        """
+        item = self._get_playing_item()
+        item_key = (item["id"], item.get("type")) if item is not None else None
         if self._attr_state in ("unavailable", "off", "idle"):
-            self._current_track = None
-            return
+            item_key = None
 
-        try:
-            # 1. Retrieve the active player
-            result = await async_call_method(
-                self._hass,
-                self._kodi_entity_id,
-                "Player.GetActivePlayers",
-            )
-            
-            if not result:
-                self._current_track = None
+        if self._track_task is not None:
+            if item_key is not None and item_key == self._track_task_item:
                 return
+            self._track_task.cancel()
 
-            player_id = result[0].get("playerid")
-            if player_id is None:
-                self._current_track = None
-                return
+        self._track_seq += 1
+        self._track_task_item = item_key
+        self._track_task = self._hass.async_create_task(
+            self._async_refresh_current_track(self._track_seq)
+        )
 
-            # 2. Retrieve the current item with all possible IDs
-            item_result = await async_call_method(
-                self._hass,
-                self._kodi_entity_id,
-                "Player.GetItem",
-                playerid=player_id,
-                properties=["artistid"],
-            )
-
-            if item_result and "item" in item_result:
-                item = item_result["item"]
-                item_type = item.get("type")
-                item_id = item.get("id")
-                raw_artist_id = item.get("artistid")
-                artist_id = None
-                
-                # If it is a list and not empty, take the first item (index 0)
-                if isinstance(raw_artist_id, list) and raw_artist_id:
-                    artist_id = raw_artist_id[0]
-                # If there is a value but it is unexpectedly not a list
-                elif raw_artist_id is not None and not isinstance(raw_artist_id, list):
-                    artist_id = raw_artist_id
-                        
-                if item_id is not None:
-                    # 1. Required base data
-                    self._current_track = {
-                        "id": item_id,      
-                        "type": item_type,
-                    }
-                    
-                    # 2. Add artist_id only if it was found
-                    if artist_id is not None:
-                        self._current_track["artist_id"] = artist_id
-                    else:
-                        self._current_track = None
-
-        except Exception as err:
-            _LOGGER.debug("Error updating current track: %s", err)
-            self._current_track = None
+    async def _async_refresh_current_track(self, seq: int) -> None:
+        """Update the current track, writing the state if it changed."""
+        try:
+            track = await self._async_get_current_track()
+        finally:
+            if seq == self._track_seq:
+                self._track_task = None
+                self._track_task_item = None
+
+        if seq != self._track_seq:
+            # Superseded by a newer update
+            return
+        if track != self._current_track:
+            self._current_track = track
+            self.async_write_ha_state()
 
     @property
     def state(self) -> str:
@@ -189,4 +215,13 @@ class KodiConfigSensor(SensorEntity):
         if self._current_track:
             attrs["current_track"] = self._current_track
         
-        return attrs
\ No newline at end of file
+        return attrs
+
+
+def _first_artist_id(raw_artist_id: Any) -> Any:
+    """Return the first artist ID of a Kodi item, None if it has none."""
+    # If it is a list and not empty, take the first item (index 0)
+    if isinstance(raw_artist_id, list):
+        return raw_artist_id[0] if raw_artist_id else None
+    # If there is a value but it is unexpectedly not a list
+    return raw_artist_id
@@ -0,0 +1,130 @@
+"""Cache of the thumbnails resolved through the Kodi media_player entity.
+
+The search and playlist commands resolve every `image://` thumbnail
+returned by Kodi through `async_get_browse_image` of the core Kodi
+media_player entity. The same artists, shows and queue items are
+displayed over and over, so the results are kept in a bounded LRU cache
+per Kodi entity, keyed by the raw Kodi image URL and expiring after a
+TTL.
+
+`async_resolve_thumbnails` resolves the thumbnails of a list of items
+concurrently; the cache misses of a Kodi entity are resolved at most
+THUMBNAIL_RESOLVE_CONCURRENCY at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DATA_THUMBNAIL_CACHES,
+    THUMBNAIL_CACHE_MAX_SIZE,
+    THUMBNAIL_CACHE_TTL,
+    THUMBNAIL_RESOLVE_CONCURRENCY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ThumbnailCache:
+    """Bounded LRU cache, with TTL, of `async_get_browse_image` results."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        concurrency: int = THUMBNAIL_RESOLVE_CONCURRENCY,
+    ) -> None:
+        """Initialisation."""
+        self._max_size = max_size
+        self._ttl = ttl
+        # Bounds the calls to the entity, as each one may hit Kodi
+        self._limiter = asyncio.Semaphore(concurrency)
+        # url -> (expiry time, resolved value), least recently used first
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def async_get_browse_image(self, mp_entity, url: str) -> Any:
+        """Return `mp_entity.async_get_browse_image("image", url)`, cached.
+
+        Errors raised by the entity are not cached.
+        """
+        entry = self._entries.get(url)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(url)
+                self.hits += 1
+                return entry[1]
+            del self._entries[url]
+
+        self.misses += 1
+        async with self._limiter:
+            value = await mp_entity.async_get_browse_image("image", url)
+
+        self._entries[url] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(url)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        return value
+
+    @callback
+    def async_clear(self) -> None:
+        """Drop every cached thumbnail."""
+        self._entries.clear()
+
+
+@callback
+def async_get_thumbnail_cache(
+    hass: HomeAssistant, kodi_entity_id: str
+) -> ThumbnailCache:
+    """Return the thumbnail cache of a Kodi entity, creating it if needed."""
+    caches = hass.data.setdefault(DATA_THUMBNAIL_CACHES, {})
+    if kodi_entity_id not in caches:
+        _LOGGER.debug("Creating thumbnail cache for %s", kodi_entity_id)
+        caches[kodi_entity_id] = ThumbnailCache(
+            THUMBNAIL_CACHE_MAX_SIZE, THUMBNAIL_CACHE_TTL
+        )
+    return caches[kodi_entity_id]
+
+
+async def async_resolve_thumbnails(
+    hass: HomeAssistant, kodi_entity_id: str, items: list[dict]
+) -> None:
+    """Replace the `image://` thumbnails of the items by browsable URLs.
+
+    A thumbnail that cannot be resolved is dropped.
+    """
+    mp_component = hass.data.get("media_player")
+    mp_entity = mp_component.get_entity(kodi_entity_id) if mp_component else None
+    if not mp_entity:
+        return
+
+    thumbnail_cache = async_get_thumbnail_cache(hass, kodi_entity_id)
+
+    async def _async_resolve(item: dict) -> None:
+        try:
+            item["thumbnail"] = await thumbnail_cache.async_get_browse_image(
+                mp_entity, item["thumbnail"]
+            )
+        except Exception as err:
+            _LOGGER.debug("Failed to get browse image: %s", err)
+            item["thumbnail"] = None
+
+    await asyncio.gather(
+        *(
+            _async_resolve(item)
+            for item in items
+            if isinstance(item.get("thumbnail"), str)
+            and item["thumbnail"].startswith("image://")
+        )
+    )
@@ -1,6 +1,6 @@
 """Central registry for Kodi Media Sensors WebSocket commands.
 
-Each functional domain (playlist, search, ...) has its own module
+Each functional domain (playlist, search, stats, ...) has its own module
 exposing an `async_register_websockets` function. This file aggregates
 them for a single registration entry point.
 """
@@ -10,6 +10,7 @@ from homeassistant.core import HomeAssistant, callback
 
 from . import playlist
 from . import search
+from . import stats
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema
 
@@ -21,4 +22,5 @@ def async_register_websockets(hass: HomeAssistant) -> None:
     """Register all WebSocket commands for this integration."""
     playlist.async_register_websockets(hass)
     search.async_register_websockets(hass)
+    stats.async_register_websockets(hass)
     _LOGGER.debug("All Kodi Media Sensors WebSocket commands registered")
\ No newline at end of file
@@ -2,11 +2,32 @@
 
 Provides the `kodi_media_sensors/playlist_subscribe` command:
 - sends the full playlist when the client subscribes
+- all subscribers of a Kodi entity share a single playlist hub: the
+  playlist is fetched once per change and broadcast to all of them
+- with `delta: true`, updates carry a sequence number and the operations
+  against the previous version, acknowledged with `playlist_ack`
+
 - pushes the updated playlist whenever items change in the
   associated Kodi media_player entity (via the core Kodi integration)
+- bursts of changes are grouped into a single refresh, and only one
+  refresh runs at a time
 - does NOT send state updates (the sensor tracks Kodi state separately)
 - sends an empty playlist when Kodi is idle (no active player)
 
+- with a `window` (offset/size, or around the current item), only that
+  slice of the playlist and its total size are fetched and sent
+- a field `profile` (`minimal`, `card` or `full`) restricts the fields
+  sent, and the properties fetched (the union of those of the subscribers)
+- with `compact: true`, the items of snapshots and windows are sent in
+  the columnar encoding of the `compact` module
+
+Provides the `kodi_media_sensors/playlist_ack` command:
+- acknowledges the last playlist version applied by a delta subscriber,
+  or requests a full snapshot (`resync`).
+
+Provides the `kodi_media_sensors/playlist_window` command:
+- moves the window of a playlist subscription.
+
 Provides the `kodi_media_sensors/playlist_goto_index` command:
 - navigates to the item at the specified index in the current playlist.
 
@@ -26,25 +47,72 @@ Provides the `kodi_media_sensors/playlist_add_item` command:
 """
 
 import asyncio
+from bisect import bisect_left
+from collections.abc import Callable
 import logging
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.core import HomeAssistant, callback, Event
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
 
 from ..const import (
+    DEFAULT_OPTION_PLAYLIST_REFRESH_DELAY,
     DOMAIN,
-    CONF_KODI_ENTITY,
+    FIELD_PROFILE_FULL,
+    FIELD_PROFILES,
     KODI_STATE_UNAVAILABLE,
     KODI_STATE_OFF,
+    OPTION_PLAYLIST_REFRESH_DELAY,
     PLAYER_ID_AUDIO,
     PLAYER_ID_VIDEO,
+    PLAYLIST_DELTA_MAX_UNACKED,
+    PLAYLIST_REFRESH_MAX_WAIT_DELAYS,
+    PLAYLIST_WINDOW_MAX_SIZE,
 )
-from ..kodi_client import async_call_method
+from ..command_stats import track_command
+from ..compact import compact_items
+from ..field_profiles import profile_properties, project_item, project_items
+from ..kodi_client import (
+    async_call_batch,
+    async_call_method,
+    async_get_kodi_entity_id,
+)
+from ..thumbnail_cache import async_resolve_thumbnails
 
 _LOGGER = logging.getLogger(__name__)
 
+# Window of a windowed playlist subscription
+_WINDOW_SCHEMA = {
+    vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Required("size"): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=PLAYLIST_WINDOW_MAX_SIZE)
+    ),
+    vol.Optional("around_current", default=False): bool,
+}
+
+# Properties of the playlist items sent to the frontend
+_PLAYLIST_ITEM_PROPERTIES = [
+    "showtitle",
+    "album",
+    "albumid",
+    "artist",
+    "artistid",
+    "duration",
+    "genre",
+    "thumbnail",
+    "title",
+    "track",
+    "year",
+    "episode",
+    "season",
+    "art",
+    "file",
+]
+
 
 @callback
 def _is_kodi_connected(hass: HomeAssistant, entity_id: str) -> bool:
@@ -61,31 +129,27 @@ def _is_kodi_connected(hass: HomeAssistant, entity_id: str) -> bool:
 def async_register_websockets(hass: HomeAssistant) -> None:
     """Register playlist-related WebSocket commands."""
     websocket_api.async_register_command(hass, websocket_playlist_subscribe)
+    websocket_api.async_register_command(hass, websocket_playlist_ack)
+    websocket_api.async_register_command(hass, websocket_playlist_window)
     websocket_api.async_register_command(hass, websocket_playlist_goto_index)
     websocket_api.async_register_command(hass, websocket_playlist_remove_item)
     websocket_api.async_register_command(hass, websocket_playlist_reorder)
+    websocket_api.async_register_command(hass, websocket_playlist_reorder_batch)
     websocket_api.async_register_command(hass, websocket_playlist_play_item)
     websocket_api.async_register_command(hass, websocket_playlist_add_item)
     websocket_api.async_register_command(hass, websocket_playlist_play_playlist)
     websocket_api.async_register_command(hass, websocket_playlist_add_playlist)
 
 
-def _get_default_player_id(item_name):
-    if item_name == "songid":
-        return PLAYER_ID_AUDIO
-
-    return PLAYER_ID_VIDEO
-
-
 def _get_kodi_entity_id_from_entry(hass, entry_id):
     """Get kodi_entity_id from entry_id"""
-    config_entry = hass.config_entries.async_get_entry(entry_id)
-    return config_entry.data.get(CONF_KODI_ENTITY)
+    return async_get_kodi_entity_id(hass, entry_id)
 
 
-async def _async_get_active_playlist_id(
+async def _async_get_active_player_id(
     hass: HomeAssistant, entity_id: str
 ) -> int | None:
+    """Return the id of the active player, which is also its playlist id."""
     if not _is_kodi_connected(hass, entity_id):
         return None
     result = await async_call_method(hass, entity_id, "Player.GetActivePlayers")
@@ -98,256 +162,768 @@ async def _async_get_active_playlist_id(
     return None
 
 
-async def _async_get_active_player_id(
+async def _async_get_playback_state(
     hass: HomeAssistant, entity_id: str
-) -> int | None:
-    if not _is_kodi_connected(hass, entity_id):
-        return None
-    result = await async_call_method(hass, entity_id, "Player.GetActivePlayers")
-    if result is None or not result:
-        return None
-    for player in result:
-        playerid = player.get("playerid")
-        if playerid is not None:
-            return playerid
-    return None
+) -> tuple[int | None, dict[int, int], dict[int, int]]:
+    """Read the active player, player positions and playlist sizes at once.
 
+    Returns:
+        (active player id or None, {player id: position},
+        {playlist id: size}) for the audio and video players.
+    """
+    active_player, positions, sizes = await _async_get_player_state(hass, entity_id)
+    return (
+        active_player.get("playerid") if active_player else None,
+        positions,
+        sizes,
+    )
 
-async def _async_get_active_item_index(
-    hass: HomeAssistant, entity_id: str, player_id: int
-) -> int:
-    """Get the current index (position) of the item being played.
 
-    Returns:
-        The 0-based index of the current item, or -1 if no item is playing.
+async def _async_get_player_state(
+    hass: HomeAssistant, entity_id: str
+) -> tuple[dict | None, dict[int, int], dict[int, int]]:
+    """Like `_async_get_playback_state`, returning the whole active player.
+
+    Everything is requested in a single batch; the properties of the
+    inactive players simply fail.
     """
-    result = await async_call_method(
+    if not _is_kodi_connected(hass, entity_id):
+        return None, {}, {}
+
+    player_ids = (PLAYER_ID_AUDIO, PLAYER_ID_VIDEO)
+    results = await async_call_batch(
         hass,
         entity_id,
-        "Player.GetProperties",
-        playerid=player_id,
-        properties=["position"],
+        [("Player.GetActivePlayers", {})]
+        + [
+            (
+                "Player.GetProperties",
+                {"playerid": player_id, "properties": ["position"]},
+            )
+            for player_id in player_ids
+        ]
+        + [
+            (
+                "Playlist.GetProperties",
+                {"playlistid": player_id, "properties": ["size"]},
+            )
+            for player_id in player_ids
+        ],
+    )
+
+    active_player = next(
+        (player for player in results[0] or [] if player.get("playerid") is not None),
+        None,
     )
-    return result.get("position", -1) if result else -1
+    positions = {
+        player_id: result.get("position", -1)
+        for player_id, result in zip(player_ids, results[1:3])
+        if result
+    }
+    sizes = {
+        player_id: result.get("size", 0)
+        for player_id, result in zip(player_ids, results[3:5])
+        if result
+    }
+    return active_player, positions, sizes
 
 
-async def _async_fetch_playlist(hass: HomeAssistant, entity_id: str, playlist_id: int):
+async def _async_fetch_playlist(
+    hass: HomeAssistant,
+    entity_id: str,
+    playlist_id: int,
+    properties: list[str] = _PLAYLIST_ITEM_PROPERTIES,
+):
     """Fetch the current playlist items via Playlist.GetItems."""
     result = await async_call_method(
         hass,
         entity_id,
         "Playlist.GetItems",
         playlistid=playlist_id,
-        properties=[
-            "showtitle",
-            "album",
-            "albumid",
-            "artist",
-            "artistid",
-            "duration",
-            "genre",
-            "thumbnail",
-            "title",
-            "track",
-            "year",
-            "episode",
-            "season",
-            "art",
-            "file",
-        ],
+        properties=properties,
     )
     return result.get("items", []) if result else None
 
 
-async def _async_get_full_playlist_data(hass: HomeAssistant, kodi_entity_id: str):
-    """fetch and format the playlist for the frontend."""
-    if not _is_kodi_connected(hass, kodi_entity_id):
-        return {"items": [], "playlist_id": None, "current_index": -1}
+async def _async_fetch_playlist_windows(
+    hass: HomeAssistant,
+    entity_id: str,
+    playlist_id: int,
+    windows: list[tuple[int, int]],
+    properties: list[str] = _PLAYLIST_ITEM_PROPERTIES,
+) -> list[list | None]:
+    """Fetch slices [start, end) of the playlist, in a single round-trip."""
+    return [
+        result.get("items", []) if result else None
+        for result in await async_call_batch(
+            hass,
+            entity_id,
+            [
+                (
+                    "Playlist.GetItems",
+                    {
+                        "playlistid": playlist_id,
+                        "properties": properties,
+                        "limits": {"start": start, "end": end},
+                    },
+                )
+                for start, end in windows
+            ],
+        )
+    ]
+
+
+async def _async_get_current_item(
+    hass: HomeAssistant,
+    entity_id: str,
+    player_id: int,
+    properties: list[str] = _PLAYLIST_ITEM_PROPERTIES,
+) -> list[dict]:
+    """Return the item being played (as a one-item list), if it is known.
 
+    Used when the player plays something that is not in its playlist.
+    """
     try:
-        active_players = await async_call_method(
-            hass, kodi_entity_id, "Player.GetActivePlayers"
+        item_result = await async_call_method(
+            hass,
+            entity_id,
+            "Player.GetItem",
+            playerid=player_id,
+            properties=properties,
         )
+        if item_result and "item" in item_result:
+            current_item = item_result["item"]
+            if current_item.get("title") or current_item.get("file"):
+                _LOGGER.debug(
+                    "[PLAYLIST] Synthesized playlist from Player.GetItem: type=%s id=%s title=%s",
+                    current_item.get("type"),
+                    current_item.get("id"),
+                    current_item.get("title"),
+                )
+                return [current_item]
     except Exception as err:
-        _LOGGER.error("Failed to get active players: %s", err)
-        return {"items": [], "playlist_id": None, "current_index": -1}
-
-    if not active_players or len(active_players) == 0:
-        return {"items": [], "playlist_id": None, "current_index": -1}
+        _LOGGER.error("Failed to get current item via Player.GetItem: %s", err)
+    return []
+
+
+async def _async_get_full_playlist_data(
+    hass: HomeAssistant,
+    kodi_entity_id: str,
+    player_id: int,
+    current_index: int,
+    properties: list[str] = _PLAYLIST_ITEM_PROPERTIES,
+):
+    """fetch and format the playlist of the active player for the frontend."""
+    try:
+        items = (
+            await _async_fetch_playlist(hass, kodi_entity_id, player_id, properties)
+            or []
+        )
+        _LOGGER.debug(
+            "Playlist data: playlist_id=%d, items_count=%d", player_id, len(items)
+        )
+    except Exception as err:
+        _LOGGER.error("Failed to fetch playlist %d: %s", player_id, err)
+        return {"items": [], "playlist_id": player_id, "current_index": -1}
 
-    if len(active_players) > 1:
+    if not items:
         _LOGGER.info(
-            "Multiple players active (%d). Using the first one.", len(active_players)
+            "[PLAYLIST] Playlist %d is empty but player %d is active — fetching current item via Player.GetItem",
+            player_id,
+            player_id,
+        )
+        items = await _async_get_current_item(
+            hass, kodi_entity_id, player_id, properties
         )
 
-    active_player = active_players[0]
-    active_player_type = active_player.get("type")
-    active_player_id = active_player.get("playerid")
+    await async_resolve_thumbnails(hass, kodi_entity_id, items)
 
-    active_playlist_id = active_player_id
+    return {
+        "items": items,
+        "playlist_id": player_id,
+        "current_index": current_index,
+    }
 
-    _LOGGER.debug(
-        "[PLAYLIST] player_id=%s, player_type=%s → using playlist_id=%s",
-        active_player_id,
-        active_player_type,
-        active_playlist_id,
-    )
 
-    items = []
-    if active_playlist_id is not None:
-        try:
-            raw_items = (
-                await _async_fetch_playlist(hass, kodi_entity_id, active_playlist_id)
-                or []
-            )
+def _playlist_item_key(item: dict) -> tuple:
+    """Identify a playlist item (library type + id, or file path)."""
+    item_type = item.get("type")
+    item_id = item.get("id")
+    if item_type and item_id is not None and item_id != -1:
+        return (item_type, item_id)
+    return ("file", item.get("file"))
 
-            items = raw_items
 
-            _LOGGER.debug(
-                "Playlist data: playlist_id=%d, items_count=%d",
-                active_playlist_id,
-                len(items),
+def _playlist_keys(items: list[dict]) -> list[tuple]:
+    """Return the keys of the items, numbering repeated occurrences.
+
+    The same item may be queued several times in a playlist.
+    """
+    seen: dict[tuple, int] = {}
+    keys = []
+    for item in items:
+        key = _playlist_item_key(item)
+        seen[key] = seen.get(key, 0) + 1
+        keys.append((key, seen[key]))
+    return keys
+
+
+def _longest_increasing_subsequence(
+    values: list[int], through: int | None = None
+) -> set[int]:
+    """Return the values of a longest strictly increasing subsequence.
+
+    With `through`, the longest of those containing that value.
+    """
+    if through is not None and through in values:
+        i = values.index(through)
+        return (
+            _longest_increasing_subsequence([v for v in values[:i] if v < through])
+            | {through}
+            | _longest_increasing_subsequence(
+                [v for v in values[i + 1 :] if v > through]
             )
-        except Exception as err:
-            _LOGGER.error("Failed to fetch playlist %d: %s", active_playlist_id, err)
-            return {"items": [], "playlist_id": active_playlist_id, "current_index": -1}
+        )
 
-    if not items and active_player_id is not None:
-        _LOGGER.info(
-            "[PLAYLIST] Playlist %d is empty but player %d is active — fetching current item via Player.GetItem",
-            active_playlist_id,
-            active_player_id,
+    tails: list[int] = []  # index (in values) of the smallest tail per length
+    tail_values: list[int] = []
+    previous = [-1] * len(values)
+    for i, value in enumerate(values):
+        pos = bisect_left(tail_values, value)
+        if pos > 0:
+            previous[i] = tails[pos - 1]
+        if pos == len(tails):
+            tails.append(i)
+            tail_values.append(value)
+        else:
+            tails[pos] = i
+            tail_values[pos] = value
+
+    result = set()
+    i = tails[-1] if tails else -1
+    while i != -1:
+        result.add(values[i])
+        i = previous[i]
+    return result
+
+
+def _diff_playlist(
+    old_items: list[dict], new_items: list[dict], pinned: int | None = None
+) -> list[dict]:
+    """Compute the operations turning old_items into new_items.
+
+    The operations must be applied in order:
+    - `{"op": "remove", "index": i}`
+    - `{"op": "move", "from": i, "to": j}`: the item is removed at `from`,
+      then inserted at `to` (index in the list after the removal)
+    - `{"op": "insert", "index": i, "item": {...}}`
+    - `{"op": "update", "index": i, "item": {...}}`
+
+    Only the items not belonging to the longest run kept in the same
+    relative order are moved, so the number of moves is minimal. The
+    item at index `pinned` of old_items (e.g. the one playing, which
+    Kodi cannot remove) is kept in that run if it is not removed.
+    """
+    old_keys = _playlist_keys(old_items)
+    new_keys = _playlist_keys(new_items)
+    old_pos = {key: i for i, key in enumerate(old_keys)}
+    new_pos = {key: i for i, key in enumerate(new_keys)}
+
+    ops = []
+    for i in range(len(old_keys) - 1, -1, -1):
+        if old_keys[i] not in new_pos:
+            ops.append({"op": "remove", "index": i})
+    working = [key for key in old_keys if key in new_pos]
+
+    pinned_key = (
+        old_keys[pinned] if pinned is not None and 0 <= pinned < len(old_keys) else None
+    )
+    stable = _longest_increasing_subsequence(
+        [new_pos[key] for key in working], new_pos.get(pinned_key)
+    )
+    placed = {key for key in working if new_pos[key] in stable}
+    for key in sorted(set(working) - placed, key=new_pos.__getitem__):
+        from_index = working.index(key)
+        working.pop(from_index)
+        to_index = next(
+            (
+                i
+                for i, other in enumerate(working)
+                if other in placed and new_pos[other] > new_pos[key]
+            ),
+            len(working),
         )
-        try:
-            item_result = await async_call_method(
-                hass,
-                kodi_entity_id,
-                "Player.GetItem",
-                playerid=active_player_id,
-                properties=[
-                    "showtitle",
-                    "album",
-                    "albumid",
-                    "artist",
-                    "artistid",
-                    "duration",
-                    "genre",
-                    "thumbnail",
-                    "title",
-                    "track",
-                    "year",
-                    "episode",
-                    "season",
-                    "art",
-                    "file",
-                ],
-            )
-            if item_result and "item" in item_result:
-                current_item = item_result["item"]
-                if current_item.get("title") or current_item.get("file"):
-                    items = [current_item]
-                    _LOGGER.debug(
-                        "[PLAYLIST] Synthesized playlist from Player.GetItem: type=%s id=%s title=%s",
-                        current_item.get("type"),
-                        current_item.get("id"),
-                        current_item.get("title"),
-                    )
-        except Exception as err:
-            _LOGGER.error("Failed to get current item via Player.GetItem: %s", err)
-
-    mp_component = hass.data.get("media_player")
-    mp_entity = mp_component.get_entity(kodi_entity_id) if mp_component else None
-
-    if mp_entity and items:
-        for item in items:
-            thumb = item.get("thumbnail")
-            if thumb and isinstance(thumb, str) and thumb.startswith("image://"):
-                try:
-                    item["thumbnail"] = await mp_entity.async_get_browse_image(
-                        "image", thumb
-                    )
-                except Exception as err:
-                    _LOGGER.debug("Failed to get browse image: %s", err)
-                    item["thumbnail"] = None
+        working.insert(to_index, key)
+        placed.add(key)
+        if from_index != to_index:
+            ops.append({"op": "move", "from": from_index, "to": to_index})
 
-    current_index = -1
-    if active_player_id is not None:
-        try:
-            current_index = await _async_get_active_item_index(
-                hass, kodi_entity_id, active_player_id
-            )
-        except Exception as err:
-            _LOGGER.debug("Failed to get current item index: %s", err)
+    for i, key in enumerate(new_keys):
+        if key not in old_pos:
+            ops.append({"op": "insert", "index": i, "item": new_items[i]})
 
-    return {
-        "items": items,
-        "playlist_id": active_playlist_id,
-        "current_index": current_index,
-    }
+    for i, key in enumerate(new_keys):
+        if key in old_pos and old_items[old_pos[key]] != new_items[i]:
+            ops.append({"op": "update", "index": i, "item": new_items[i]})
 
+    return ops
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "kodi_media_sensors/playlist_subscribe",
-        vol.Required("entry_id"): str,
-    }
-)
-@websocket_api.async_response
-async def websocket_playlist_subscribe(hass, connection, msg):
-    kodi_entity_id = _get_kodi_entity_id_from_entry(hass, msg["entry_id"])
-    msg_id = msg["id"]
-    entry_id = msg["entry_id"]
 
-    last_items = None
-    last_player_type = None
+def _playlist_insert_item(item: dict) -> dict:
+    """Return the `Playlist.Insert` item adding the same media as item."""
+    item_type = item.get("type")
+    item_id = item.get("id")
+    if item_type and item_id and item_id != -1:
+        return {f"{item_type}id": item_id}
+    return {"file": item.get("file")}
 
-    async def _send_playlist(*args):
-        nonlocal last_items, last_player_type
 
-        _LOGGER.debug(
-            "[PLAYLIST] _send_playlist called — last_player_type=%s, last_items_count=%s",
-            last_player_type,
-            len(last_items) if last_items is not None else "None",
+def _project_ops(ops: list[dict], profile: str) -> list[dict]:
+    """Return the playlist operations with the items projected for a profile."""
+    if profile == FIELD_PROFILE_FULL:
+        return ops
+    return [
+        {**op, "item": project_item(op["item"], profile)} if "item" in op else op
+        for op in ops
+    ]
+
+
+class _PlaylistWindow:
+    """Slice of the playlist followed by a windowed subscription."""
+
+    def __init__(self, size: int, offset: int = 0, around_current: bool = False):
+        self.size = size
+        self.offset = offset
+        self.around_current = around_current
+
+    def bounds(self, current_index: int, total: int) -> tuple[int, int]:
+        """Return the [start, end) of the window in a playlist of `total` items.
+
+        A window around the current item keeps it in the middle, as far
+        as the ends of the playlist allow.
+        """
+        if self.around_current and current_index >= 0:
+            start = current_index - self.size // 2
+        else:
+            start = self.offset
+        start = max(0, min(start, total - self.size))
+        return start, min(start + self.size, total)
+
+
+class _PlaylistSubscriber:
+    """A `playlist_subscribe` subscription attached to a playlist hub."""
+
+    def __init__(
+        self,
+        send: Callable[[dict], None],
+        delta: bool,
+        window: _PlaylistWindow | None = None,
+        profile: str = FIELD_PROFILE_FULL,
+        compact: bool = False,
+    ) -> None:
+        self.send = send
+        self.delta = delta
+        self.profile = profile
+        self.compact = compact
+        self.sent_seq: int | None = None
+        self.acked_seq: int | None = None
+        # Windowed subscriptions get the items of their window only
+        self.window = window
+        self.window_fetches = 0
+        self.last_window: dict | None = None
+
+    def encode(self, items: list[dict]) -> list[dict] | dict:
+        """Return the items as sent to this subscriber."""
+        items = project_items(items, self.profile)
+        return compact_items(items) if self.compact else items
+
+    def is_behind(self) -> bool:
+        """Return True if the client stopped acknowledging the updates."""
+        if self.sent_seq is None:
+            return True
+        acked = self.acked_seq if self.acked_seq is not None else -1
+        return self.sent_seq - acked > PLAYLIST_DELTA_MAX_UNACKED
+
+
+class _PlaylistHub:
+    """Playlist state of one Kodi entity, shared by all its subscribers.
+
+    The playlist is fetched once per change of the Kodi entity (or
+    `playlist_updated` event) and the result is broadcast to every
+    subscriber. The hub stops listening, and is forgotten, when its last
+    subscriber leaves.
+
+    Every broadcast version gets a sequence number. Subscribers that
+    asked for deltas receive the operations turning the previous version
+    into the new one; a full snapshot is sent instead when they are not
+    acknowledging the updates anymore, or when the diff would not be
+    smaller than the playlist itself.
+
+    Windowed subscribers only receive a slice of the playlist (and its
+    total size): those slices are fetched with `Playlist.GetItems`
+    limits, so they cost the same whatever the size of the playlist. The
+    whole playlist is only fetched while someone subscribed to it.
+
+    Changes are not fetched right away: the refresh waits until no change
+    was received for `refresh_delay` seconds, so a burst of changes gives
+    a single fetch. A continuous stream of changes postpones it by at most
+    PLAYLIST_REFRESH_MAX_WAIT_DELAYS delays. Only one refresh runs at a
+    time; changes received meanwhile schedule one more.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        kodi_entity_id: str,
+        refresh_delay: float = DEFAULT_OPTION_PLAYLIST_REFRESH_DELAY / 1000,
+    ):
+        self._hass = hass
+        self._entry_id = entry_id
+        self._kodi_entity_id = kodi_entity_id
+        self._refresh_delay = refresh_delay
+        self._cancel_refresh_timer: Callable[[], None] | None = None
+        # Loop time after which a burst no longer postpones the refresh
+        self._refresh_deadline: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._refresh_pending = False
+        self._subscribers: dict[tuple, _PlaylistSubscriber] = {}
+        self._unsubs: list[Callable[[], None]] = []
+        self._last_items = None
+        self._last_player_type = None
+        self._seq = 0
+        self._last_data: dict | None = None
+        # Properties of the items of _last_data
+        self._fetched_properties: set[str] = set()
+
+    @callback
+    def async_subscribe(
+        self,
+        key: tuple,
+        send: Callable[[dict], None],
+        delta: bool = False,
+        window: _PlaylistWindow | None = None,
+        profile: str = FIELD_PROFILE_FULL,
+        compact: bool = False,
+    ) -> Callable[[], None]:
+        """Add a subscriber; `async_send_current` then sends it the playlist.
+
+        Returns the callback removing the subscriber.
+        """
+        subscriber = _PlaylistSubscriber(send, delta, window, profile, compact)
+        self._subscribers[key] = subscriber
+
+        if len(self._subscribers) == 1:
+            self._unsubs = [
+                async_track_state_change_event(
+                    self._hass, [self._kodi_entity_id], self._async_schedule_refresh
+                ),
+                self._hass.bus.async_listen(
+                    f"{DOMAIN}_playlist_updated", self._async_on_playlist_updated
+                ),
+            ]
+
+        @callback
+        def _async_unsubscribe() -> None:
+            if self._subscribers.get(key) is subscriber:
+                del self._subscribers[key]
+            if not self._subscribers:
+                self._async_stop()
+
+        return _async_unsubscribe
+
+    async def async_send_current(self, key: tuple) -> None:
+        """Send a new subscriber the current playlist (or window)."""
+        subscriber = self._subscribers.get(key)
+        if subscriber is None:
+            # Unsubscribed meanwhile
+            return
+
+        if subscriber.window is not None:
+            await self._async_refresh_windows([subscriber])
+        elif self._last_data is not None and self._fetched_properties.issuperset(
+            self._properties([subscriber])
+        ):
+            self._send_snapshot(subscriber)
+        else:
+            # Fetch again (the last playlist lacks fields of the profile)
+            self._last_items = None
+            self._last_data = None
+            try:
+                await self._async_refresh_now()
+            except asyncio.CancelledError:
+                # The refresh is cancelled when the last subscriber leaves
+                if asyncio.current_task().cancelling() or key in self._subscribers:
+                    raise
+
+    @callback
+    def async_ack(self, key: tuple, seq: int, resync: bool = False) -> bool:
+        """Record the last version applied by a subscriber.
+
+        A resync (or the acknowledgment of an unknown version) sends a
+        full snapshot right away. Returns False for unknown subscribers.
+        """
+        subscriber = self._subscribers.get(key)
+        if subscriber is None:
+            return False
+
+        if subscriber.window is not None:
+            # Windows are always sent whole: only a resync matters
+            if resync:
+                subscriber.last_window = None
+                self._hass.async_create_background_task(
+                    self._async_refresh_windows([subscriber]),
+                    f"{DOMAIN} playlist window {self._kodi_entity_id}",
+                )
+            return True
+
+        if resync or subscriber.sent_seq is None or seq > subscriber.sent_seq:
+            if self._last_data is not None:
+                self._send_snapshot(subscriber)
+            return True
+
+        subscriber.acked_seq = max(seq, subscriber.acked_seq or 0)
+        return True
+
+    async def async_move_window(self, key: tuple, window: _PlaylistWindow) -> bool:
+        """Change the window of a subscriber and send it the new window.
+
+        Returns False for unknown subscribers.
+        """
+        subscriber = self._subscribers.get(key)
+        if subscriber is None:
+            return False
+        subscriber.window = window
+        await self._async_refresh_windows([subscriber])
+        return True
+
+    @callback
+    def async_get_stats(self) -> dict:
+        """Return the subscribers and state of the hub, for diagnostics."""
+        return {
+            "subscribers": len(self._subscribers),
+            "delta_subscribers": sum(
+                subscriber.delta and subscriber.window is None
+                for subscriber in self._subscribers.values()
+            ),
+            "window_subscribers": sum(
+                subscriber.window is not None
+                for subscriber in self._subscribers.values()
+            ),
+            "subscribers_behind": sum(
+                subscriber.delta
+                and subscriber.window is None
+                and subscriber.is_behind()
+                for subscriber in self._subscribers.values()
+            ),
+            "seq": self._seq,
+            "items": len(self._last_items) if self._last_items is not None else None,
+            "refreshing": self._refresh_task is not None,
+            "refresh_pending": self._refresh_pending
+            or self._cancel_refresh_timer is not None,
+        }
+
+    def _properties(self, subscribers) -> list[str]:
+        """Return the item properties needed by the profiles of subscribers."""
+        needed = set()
+        for profile in {subscriber.profile for subscriber in subscribers}:
+            needed.update(profile_properties(_PLAYLIST_ITEM_PROPERTIES, profile))
+        return [prop for prop in _PLAYLIST_ITEM_PROPERTIES if prop in needed]
+
+    def _payload(self, **kwargs) -> dict:
+        return {
+            "type": "playlist_update",
+            "seq": self._seq,
+            "playlist_id": self._last_data["playlist_id"],
+            "current_index": self._last_data["current_index"],
+            **kwargs,
+        }
+
+    @callback
+    def _send_snapshot(self, subscriber: _PlaylistSubscriber) -> None:
+        subscriber.send(
+            self._payload(full=True, items=subscriber.encode(self._last_data["items"]))
+        )
+        subscriber.sent_seq = self._seq
+        # A snapshot does not depend on earlier versions: start over
+        subscriber.acked_seq = self._seq - 1
+
+    @callback
+    def _async_broadcast(self, ops: list[dict] | None) -> None:
+        # Payloads per profile (and encoding, for the snapshots)
+        snapshots: dict[tuple[str, bool], dict] = {}
+        deltas: dict[str, dict] = {}
+        for subscriber in list(self._subscribers.values()):
+            if subscriber.window is not None:
+                continue
+            if (
+                not subscriber.delta
+                or ops is None
+                or subscriber.sent_seq != self._seq - 1
+                or subscriber.is_behind()
+            ):
+                encoding = (subscriber.profile, subscriber.compact)
+                snapshot = snapshots.get(encoding)
+                if snapshot is None:
+                    snapshot = snapshots[encoding] = self._payload(
+                        full=True, items=subscriber.encode(self._last_data["items"])
+                    )
+                subscriber.send(snapshot)
+            else:
+                delta = deltas.get(subscriber.profile)
+                if delta is None:
+                    delta = deltas[subscriber.profile] = self._payload(
+                        base_seq=self._seq - 1,
+                        ops=_project_ops(ops, subscriber.profile),
+                    )
+                subscriber.send(delta)
+            subscriber.sent_seq = self._seq
+
+    @callback
+    def async_set_refresh_delay(self, refresh_delay: float) -> None:
+        """Wait `refresh_delay` seconds from the next change on."""
+        self._refresh_delay = refresh_delay
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop every subscriber and stop listening (the entry is unloaded)."""
+        self._subscribers.clear()
+        self._async_stop()
+
+    @callback
+    def _async_stop(self) -> None:
+        """Stop listening once nobody is subscribed anymore."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._cancel_refresh_timer is not None:
+            self._cancel_refresh_timer()
+            self._cancel_refresh_timer = None
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        self._refresh_pending = False
+        entry_data = self._hass.data.get(DOMAIN, {}).get(self._entry_id, {})
+        if entry_data.get("playlist_hub") is self:
+            entry_data.pop("playlist_hub")
+        _LOGGER.debug("[PLAYLIST] Last subscriber left %s", self._kodi_entity_id)
+
+    @callback
+    def _async_on_playlist_updated(self, event: Event) -> None:
+        if event.data.get("entry_id") == self._entry_id:
+            self._async_schedule_refresh()
+
+    @callback
+    def _async_schedule_refresh(self, *args) -> None:
+        """Refresh once the burst of changes is over."""
+        if self._refresh_task is not None:
+            # The running fetch may have missed this change
+            self._refresh_pending = True
+            return
+        now = self._hass.loop.time()
+        if self._cancel_refresh_timer is None:
+            self._refresh_deadline = (
+                now + self._refresh_delay * PLAYLIST_REFRESH_MAX_WAIT_DELAYS
+            )
+        else:
+            self._cancel_refresh_timer()
+        self._cancel_refresh_timer = async_call_later(
+            self._hass,
+            max(min(self._refresh_delay, self._refresh_deadline - now), 0),
+            self._async_start_refresh,
         )
 
-        active_players = await async_call_method(
-            hass, kodi_entity_id, "Player.GetActivePlayers"
+    @callback
+    def _async_start_refresh(self, *args) -> None:
+        self._cancel_refresh_timer = None
+        self._refresh_deadline = None
+        self._refresh_pending = False
+        self._refresh_task = self._hass.async_create_background_task(
+            self._async_run_refresh(),
+            f"{DOMAIN} playlist refresh {self._kodi_entity_id}",
         )
 
-        _LOGGER.debug("[PLAYLIST] GetActivePlayers → %s", active_players)
+    async def _async_run_refresh(self) -> None:
+        try:
+            await self._async_refresh()
+        finally:
+            self._refresh_task = None
+            if self._refresh_pending and self._subscribers:
+                self._refresh_pending = False
+                self._async_schedule_refresh()
+
+    async def _async_refresh_now(self) -> None:
+        """Refresh without waiting, or wait for the running refresh."""
+        if self._refresh_task is None:
+            if self._cancel_refresh_timer is not None:
+                self._cancel_refresh_timer()
+            self._async_start_refresh()
+        await asyncio.shield(self._refresh_task)
+
+    async def _async_refresh(self) -> None:
+        """Fetch the playlist and broadcast it if it changed."""
+        _LOGGER.debug(
+            "[PLAYLIST] Refresh for %d subscriber(s) — last_player_type=%s, last_items_count=%s",
+            len(self._subscribers),
+            self._last_player_type,
+            len(self._last_items) if self._last_items is not None else "None",
+        )
+
+        # Read once, for the whole playlist and the windows
+        state = await _async_get_player_state(self._hass, self._kodi_entity_id)
+        active_player, positions, _ = state
 
-        if not active_players or len(active_players) == 0:
+        _LOGGER.debug("[PLAYLIST] GetActivePlayers → %s", active_player)
+
+        if active_player is None:
             _LOGGER.info(
                 "[PLAYLIST] No active player — skipping (last_player_type=%s stays unchanged)",
-                last_player_type,
+                self._last_player_type,
             )
-            if last_items is not None and len(last_items) > 0:
+            if self._last_items is not None and len(self._last_items) > 0:
                 _LOGGER.info(
                     "[PLAYLIST] Had items before, keeping last state — waiting for next event"
                 )
             return
 
-        current_player_type = active_players[0].get("type")
+        current_player_type = active_player.get("type")
 
         _LOGGER.debug(
             "[PLAYLIST] Active player type=%s (last=%s)",
             current_player_type,
-            last_player_type,
+            self._last_player_type,
         )
 
-        if last_player_type is not None and last_player_type != current_player_type:
+        if (
+            self._last_player_type is not None
+            and self._last_player_type != current_player_type
+        ):
             _LOGGER.debug(
                 "[PLAYLIST] Player type changed: %s → %s — forcing full refresh",
-                last_player_type,
+                self._last_player_type,
                 current_player_type,
             )
-            last_items = None  # Force sending even if the items are identical
-
-        last_player_type = current_player_type
+            self._last_items = None  # Force sending even if the items are identical
 
-       
+        self._last_player_type = current_player_type
 
-        data = await _async_get_full_playlist_data(hass, kodi_entity_id)
+        if any(subscriber.window is None for subscriber in self._subscribers.values()):
+            player_id = active_player["playerid"]
+            await self._async_refresh_full(player_id, positions.get(player_id, -1))
+        else:
+            # Forgotten, as it is not kept up to date without full subscribers
+            self._last_items = None
+            self._last_data = None
+        await self._async_refresh_windows(state=state)
+
+    async def _async_refresh_full(self, player_id: int, current_index: int) -> None:
+        """Fetch the whole playlist and broadcast it if it changed."""
+        properties = self._properties(
+            subscriber
+            for subscriber in self._subscribers.values()
+            if subscriber.window is None
+        )
+        data = await _async_get_full_playlist_data(
+            self._hass, self._kodi_entity_id, player_id, current_index, properties
+        )
         items = data["items"]
 
         _LOGGER.debug(
@@ -357,42 +933,245 @@ async def websocket_playlist_subscribe(hass, connection, msg):
             data["current_index"],
         )
 
-        if items == last_items:
+        if items == self._last_items:
             _LOGGER.debug("[PLAYLIST] Items unchanged — skipping send")
             return
 
-        last_items = items
-
-        payload = {
-            "type": "playlist_update",
-            "items": items,
-            "playlist_id": data["playlist_id"],
-            "current_index": data["current_index"],
-        }
+        ops = None
+        if self._last_items is not None and any(
+            subscriber.delta and subscriber.window is None
+            for subscriber in self._subscribers.values()
+        ):
+            ops = _diff_playlist(self._last_items, items)
+            if len(ops) * 2 > len(items):
+                # Not worth it: the snapshot is about as small
+                ops = None
+
+        self._last_items = items
+        self._last_data = data
+        self._fetched_properties = set(properties)
+        self._seq += 1
 
         _LOGGER.debug(
-            "[PLAYLIST] → Sending playlist_update: %d items, playlist_id=%s, current_index=%s",
+            "[PLAYLIST] → Broadcasting playlist_update seq=%d to %d subscriber(s): %d items, %s ops, playlist_id=%s, current_index=%s",
+            self._seq,
+            len(self._subscribers),
             len(items),
+            len(ops) if ops is not None else "full",
             data["playlist_id"],
             data["current_index"],
         )
-        connection.send_message(websocket_api.event_message(msg_id, payload))
+        self._async_broadcast(ops)
+
+    async def _async_refresh_windows(
+        self,
+        subscribers: list[_PlaylistSubscriber] | None = None,
+        state: tuple[dict | None, dict[int, int], dict[int, int]] | None = None,
+    ) -> None:
+        """Fetch the windows of the subscribers (default: all) and send them.
+
+        The position, the playlist size and the active player are read
+        in a single batch (unless given in `state`, as returned by
+        `_async_get_player_state`), then the distinct windows in a second
+        one. Windows that did not change are not sent again.
+        """
+        fetches = [
+            (subscriber, subscriber.window_fetches + 1)
+            for subscriber in (
+                self._subscribers.values() if subscribers is None else subscribers
+            )
+            if subscriber.window is not None
+        ]
+        if not fetches:
+            return
+        for subscriber, fetch in fetches:
+            subscriber.window_fetches = fetch
+        properties = self._properties(subscriber for subscriber, _ in fetches)
+
+        if state is None:
+            state = await _async_get_player_state(self._hass, self._kodi_entity_id)
+        active_player, positions, sizes = state
+        player_id = active_player.get("playerid") if active_player else None
+        current_index = positions.get(player_id, -1)
+        total = sizes.get(player_id, 0)
+        bounds = {
+            subscriber: subscriber.window.bounds(current_index, total)
+            for subscriber, _ in fetches
+        }
 
-    async def _handle_playlist_updated(event: Event) -> None:
-        if event.data.get("entry_id") == entry_id:
-            await _send_playlist()
+        slices: dict[tuple[int, int], list | None] = {}
+        if player_id is None:
+            # Idle: only subscribers that got nothing yet are sent a window
+            fetches = [(sub, fetch) for sub, fetch in fetches if not sub.last_window]
+        elif total:
+            windows = list(dict.fromkeys(bounds.values()))
+            slices = dict(
+                zip(
+                    windows,
+                    await _async_fetch_playlist_windows(
+                        self._hass, self._kodi_entity_id, player_id, windows, properties
+                    ),
+                )
+            )
+        else:
+            # Playing something that is not in the playlist
+            items = await _async_get_current_item(
+                self._hass, self._kodi_entity_id, player_id, properties
+            )
+            total = len(items)
+            bounds = {subscriber: (0, total) for subscriber in bounds}
+            slices[(0, total)] = items
+
+        for items in slices.values():
+            if items:
+                await async_resolve_thumbnails(self._hass, self._kodi_entity_id, items)
+
+        for subscriber, fetch in fetches:
+            if (
+                subscriber.window_fetches != fetch
+                or subscriber not in self._subscribers.values()
+            ):
+                # Superseded by a later fetch, or unsubscribed meanwhile
+                continue
+            items = slices.get(bounds[subscriber], [])
+            if items is None:
+                continue
+            window = {
+                "playlist_id": player_id,
+                "current_index": current_index,
+                "offset": bounds[subscriber][0],
+                "total": total,
+                "items": project_items(items, subscriber.profile),
+            }
+            if window == subscriber.last_window:
+                continue
+            subscriber.last_window = window
+            subscriber.sent_seq = (subscriber.sent_seq or 0) + 1
+            subscriber.send(
+                {
+                    "type": "playlist_update",
+                    "seq": subscriber.sent_seq,
+                    "full": True,
+                    **window,
+                    "items": (
+                        compact_items(window["items"])
+                        if subscriber.compact
+                        else window["items"]
+                    ),
+                }
+            )
 
-    unsub_state = async_track_state_change_event(hass, [kodi_entity_id], _send_playlist)
 
-    unsub_refresh = hass.bus.async_listen(
-        f"{DOMAIN}_playlist_updated", _handle_playlist_updated
-    )
+@callback
+def _async_get_playlist_hub(hass: HomeAssistant, entry_id: str) -> _PlaylistHub | None:
+    """Return the playlist hub of an entry, creating it if needed."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+    if entry_data is None:
+        return None
+    if "playlist_hub" not in entry_data:
+        config_entry = hass.config_entries.async_get_entry(entry_id)
+        refresh_delay = config_entry.options.get(
+            OPTION_PLAYLIST_REFRESH_DELAY, DEFAULT_OPTION_PLAYLIST_REFRESH_DELAY
+        )
+        entry_data["playlist_hub"] = _PlaylistHub(
+            hass,
+            entry_id,
+            _get_kodi_entity_id_from_entry(hass, entry_id),
+            refresh_delay / 1000,
+        )
+    return entry_data["playlist_hub"]
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "kodi_media_sensors/playlist_subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("delta", default=False): bool,
+        vol.Optional("window"): _WINDOW_SCHEMA,
+        vol.Optional("profile", default=FIELD_PROFILE_FULL): vol.In(FIELD_PROFILES),
+        vol.Optional("compact", default=False): bool,
+    }
+)
+@websocket_api.async_response
+@track_command
+async def websocket_playlist_subscribe(hass, connection, msg):
+    msg_id = msg["id"]
+    hub = _async_get_playlist_hub(hass, msg["entry_id"])
+    if hub is None:
+        connection.send_error(
+            msg_id, "invalid_entry", f"Entry {msg['entry_id']} not found"
+        )
+        return
+
+    @callback
+    def _send_playlist(payload: dict) -> None:
+        connection.send_message(websocket_api.event_message(msg_id, payload))
 
-    connection.subscriptions[msg_id] = lambda: (unsub_state(), unsub_refresh())
-    await _send_playlist()
+    window = msg.get("window")
+    # Registered before the first fetch, so that leaving during it cleans up
+    connection.subscriptions[msg_id] = hub.async_subscribe(
+        (connection, msg_id),
+        _send_playlist,
+        msg["delta"],
+        _PlaylistWindow(**window) if window is not None else None,
+        msg["profile"],
+        msg["compact"],
+    )
+    await hub.async_send_current((connection, msg_id))
     connection.send_result(msg_id)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "kodi_media_sensors/playlist_window",
+        vol.Required("entry_id"): str,
+        vol.Required("subscription"): int,
+        **_WINDOW_SCHEMA,
+    }
+)
+@websocket_api.async_response
+@track_command
+async def websocket_playlist_window(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Move the window of a playlist subscription and send the new window."""
+    hub = _async_get_playlist_hub(hass, msg["entry_id"])
+    window = _PlaylistWindow(msg["size"], msg["offset"], msg["around_current"])
+    if hub is not None and await hub.async_move_window(
+        (connection, msg["subscription"]), window
+    ):
+        connection.send_result(msg["id"])
+    else:
+        connection.send_error(
+            msg["id"], "unknown_subscription", "No such playlist subscription"
+        )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "kodi_media_sensors/playlist_ack",
+        vol.Required("entry_id"): str,
+        vol.Required("subscription"): int,
+        vol.Required("seq"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("resync", default=False): bool,
+    }
+)
+@callback
+def websocket_playlist_ack(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Acknowledge the last playlist version applied by a delta subscriber."""
+    hub = _async_get_playlist_hub(hass, msg["entry_id"])
+    if hub is not None and hub.async_ack(
+        (connection, msg["subscription"]), msg["seq"], msg["resync"]
+    ):
+        connection.send_result(msg["id"])
+    else:
+        connection.send_error(
+            msg["id"], "unknown_subscription", "No such playlist subscription"
+        )
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "kodi_media_sensors/playlist_goto_index",
@@ -401,6 +1180,7 @@ async def websocket_playlist_subscribe(hass, connection, msg):
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_playlist_goto_index(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
@@ -424,12 +1204,13 @@ async def websocket_playlist_goto_index(
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_playlist_remove_item(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
     entry_id = msg["entry_id"]
     kodi_entity_id = _get_kodi_entity_id_from_entry(hass, entry_id)
-    playlist_id = await _async_get_active_playlist_id(hass, kodi_entity_id)
+    playlist_id = await _async_get_active_player_id(hass, kodi_entity_id)
 
     if playlist_id is not None and await async_call_method(
         hass,
@@ -453,6 +1234,7 @@ async def websocket_playlist_remove_item(
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_playlist_reorder(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
@@ -470,29 +1252,21 @@ async def websocket_playlist_reorder(
         connection.send_result(msg["id"])
         return
 
-    playlist_id = await _async_get_active_playlist_id(hass, kodi_entity_id)
+    playlist_id = await _async_get_active_player_id(hass, kodi_entity_id)
 
     if playlist_id is None:
         _LOGGER.error("Reorder failed: No active playlist found for %s", kodi_entity_id)
         connection.send_error(msg["id"], "reorder_failed", "No active playlist")
         return
 
-    items = await _async_fetch_playlist(hass, kodi_entity_id, playlist_id)
+    # Only the type/id (or file) of the item are needed
+    items = await _async_fetch_playlist(hass, kodi_entity_id, playlist_id, ["file"])
     if not items or from_index >= len(items):
         _LOGGER.error("Reorder failed: index %d out of bounds", from_index)
         connection.send_error(msg["id"], "reorder_failed", "Invalid index")
         return
 
-    item_to_move = items[from_index]
-
-    item_type = item_to_move.get("type")
-    item_id = item_to_move.get("id")
-
-    insert_payload = {}
-    if item_type and item_id and item_id != -1:
-        insert_payload = {f"{item_type}id": item_id}
-    else:
-        insert_payload = {"file": item_to_move.get("file")}
+    insert_payload = _playlist_insert_item(items[from_index])
 
     removed = await async_call_method(
         hass,
@@ -532,6 +1306,150 @@ async def websocket_playlist_reorder(
         )
 
 
+def _apply_moves(size: int, moves: list[dict]) -> list[int] | None:
+    """Return the order (old indexes) given by moves, as `playlist_reorder`.
+
+    Each move removes the item at `from_index` and inserts it before the
+    item that was at `to_index`. Returns None if an index is out of range.
+    """
+    order = list(range(size))
+    for move in moves:
+        from_index, to_index = move["from_index"], move["to_index"]
+        if from_index >= size or to_index > size:
+            return None
+        index = order.pop(from_index)
+        order.insert(to_index - 1 if from_index < to_index else to_index, index)
+    return order
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "kodi_media_sensors/playlist_reorder_batch",
+        vol.Required("entry_id"): str,
+        vol.Exclusive("moves", "reorder"): [
+            {
+                vol.Required("from_index"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required("to_index"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            }
+        ],
+        vol.Exclusive("order", "reorder"): [vol.All(vol.Coerce(int), vol.Range(min=0))],
+    }
+)
+@websocket_api.async_response
+@track_command
+async def websocket_playlist_reorder_batch(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Reorder several playlist items at once.
+
+    Takes either a list of `moves` (applied in order, as many
+    `playlist_reorder`), or the target `order` of the items (their
+    current indexes). The playlist is read once, the fewest moves
+    turning it into the target order are sent to Kodi in one batch
+    (without moving the item playing), and a single refresh follows.
+    When a call fails, the playlist is read again to tell how many moves
+    were applied.
+    """
+    msg_id = msg["id"]
+    entry_id = msg["entry_id"]
+    kodi_entity_id = _get_kodi_entity_id_from_entry(hass, entry_id)
+    if "moves" not in msg and "order" not in msg:
+        connection.send_error(
+            msg_id, "invalid_format", "Either moves or order is required"
+        )
+        return
+
+    playlist_id, positions, _ = await _async_get_playback_state(hass, kodi_entity_id)
+    if playlist_id is None:
+        _LOGGER.error("Reorder failed: No active playlist found for %s", kodi_entity_id)
+        connection.send_error(msg_id, "reorder_failed", "No active playlist")
+        return
+
+    # Only the type/id (or file) of the items are needed
+    items = await _async_fetch_playlist(hass, kodi_entity_id, playlist_id, ["file"])
+    if items is None:
+        connection.send_error(msg_id, "reorder_failed", "Could not read the playlist")
+        return
+
+    if "moves" in msg:
+        order = _apply_moves(len(items), msg["moves"])
+    else:
+        order = (
+            msg["order"] if sorted(msg["order"]) == list(range(len(items))) else None
+        )
+    if order is None:
+        connection.send_error(
+            msg_id, "reorder_failed", "Invalid index (has the playlist changed?)"
+        )
+        return
+
+    moves = [
+        op
+        for op in _diff_playlist(
+            items, [items[index] for index in order], positions.get(playlist_id)
+        )
+        if op["op"] == "move"
+    ]
+    _LOGGER.debug("Reorder requested: entry_id=%s, %d moves", entry_id, len(moves))
+    if not moves:
+        connection.send_result(msg_id, {"moves": 0})
+        return
+
+    # Kodi runs the calls of a batch in order. The playlist expected
+    # after each move is kept, to tell how far a failed batch went
+    calls = []
+    working = list(items)
+    expected = [_playlist_keys(working)]
+    for move in moves:
+        item = working.pop(move["from"])
+        working.insert(move["to"], item)
+        calls.append(
+            ("Playlist.Remove", {"playlistid": playlist_id, "position": move["from"]})
+        )
+        calls.append(
+            (
+                "Playlist.Insert",
+                {
+                    "playlistid": playlist_id,
+                    "position": move["to"],
+                    "item": _playlist_insert_item(item),
+                },
+            )
+        )
+        expected.append(_playlist_keys(working))
+    results = await async_call_batch(hass, kodi_entity_id, calls)
+
+    # A single refresh, even if the playlist was only partly reordered
+    hass.bus.async_fire(f"{DOMAIN}_playlist_updated", {"entry_id": entry_id})
+    if all(result is not None for result in results):
+        connection.send_result(msg_id, {"moves": len(moves)})
+        return
+
+    # Read the playlist once to find where the failure left it
+    current = await _async_fetch_playlist(hass, kodi_entity_id, playlist_id, ["file"])
+    current_keys = _playlist_keys(current) if current is not None else None
+    applied = next(
+        (
+            count
+            for count in range(len(moves), -1, -1)
+            if expected[count] == current_keys
+        ),
+        None,
+    )
+    if applied == len(moves):
+        connection.send_result(msg_id, {"moves": applied})
+        return
+
+    failed_move = next(i for i, result in enumerate(results) if result is None) // 2
+    message = f"Move {failed_move + 1} of {len(moves)} failed"
+    if applied is None:
+        message += ", leaving the playlist in an unexpected order"
+    else:
+        message += f" ({applied} moves applied)"
+    _LOGGER.error("Reorder failed: %s", message)
+    connection.send_error(msg_id, "reorder_failed", message)
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "kodi_media_sensors/playlist_play",
@@ -541,6 +1459,7 @@ async def websocket_playlist_reorder(
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_playlist_play_playlist(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
@@ -598,6 +1517,7 @@ async def websocket_playlist_play_playlist(
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_playlist_add_playlist(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
@@ -660,6 +1580,7 @@ async def websocket_playlist_add_playlist(
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_playlist_play_item(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
@@ -673,28 +1594,22 @@ async def websocket_playlist_play_item(
             hass, kodi_entity_id, "Player.Open", item={"channelid": item_id}
         )
     else:
-        playlist_id = await _async_get_active_playlist_id(hass, kodi_entity_id)
-        active_player_id = await _async_get_active_player_id(hass, kodi_entity_id)
+        active_player_id, positions, sizes = await _async_get_playback_state(
+            hass, kodi_entity_id
+        )
 
+        playlist_id = active_player_id
         if playlist_id is None:
             playlist_id = 0 if item_name == "songid" else 1
 
-        playlist_items = (
-            await _async_fetch_playlist(hass, kodi_entity_id, playlist_id) or []
-        )
-
         current_index = -1
         if active_player_id is not None:
-            current_index = await _async_get_active_item_index(
-                hass, kodi_entity_id, active_player_id
-            )
-        else:
-            active_player_id = _get_default_player_id(item_name)
+            current_index = positions.get(active_player_id, -1)
 
         if current_index != -1:
             insert_index = current_index + 1
         else:
-            insert_index = len(playlist_items)
+            insert_index = sizes.get(playlist_id, 0)
 
         inserted = await async_call_method(
             hass,
@@ -761,6 +1676,7 @@ async def websocket_playlist_play_item(
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_playlist_add_item(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
@@ -770,24 +1686,15 @@ async def websocket_playlist_add_item(
     item_name = msg["item_name"]
     position = msg["position"] or "last"
 
-    playlist_id = await _async_get_active_playlist_id(hass, kodi_entity_id)
-
-    index = 1;
-    if position == "last":
-        items = await async_call_method(
-            hass,
-            kodi_entity_id,
-            "Playlist.GetItems",
-            playlistid=playlist_id,
-        )
-        items_list = items.get("items", []) if items else []
-        playlist_length = len(items_list)
-        index = playlist_length
-
+    playlist_id, _, sizes = await _async_get_playback_state(hass, kodi_entity_id)
 
     if playlist_id is None:
         playlist_id = 0 if item_name in ["songid", "albumid"] else 1
 
+    index = 1
+    if position == "last":
+        index = sizes.get(playlist_id, 0)
+
     inserted = await async_call_method(
         hass,
         kodi_entity_id,
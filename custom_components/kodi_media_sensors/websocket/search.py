@@ -3,11 +3,22 @@
 Provides the `kodi_media_sensors/search` command. This is a one-shot
 request/response command (not a subscription): the client sends a
 query and an optional category, and receives a single result message.
+
+Provides the `kodi_media_sensors/search_subscribe` command, the streaming
+variant of `search`: the results of each category are pushed as an event
+as soon as they are known, followed by a final `search_done` event.
+
+Every command accepts a field `profile` (`minimal`, `card` or `full`,
+the default) restricting the fields of the items sent and, except for
+the searches answered from the shared index and caches, the properties
+requested from Kodi. With `compact: true`, the lists of items are sent
+in the columnar encoding of the `compact` module.
 """
 
 import asyncio
 import logging
 import pathlib
+import time
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
@@ -15,8 +26,30 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import STATE_UNAVAILABLE
 
 from ..const import (
-    CONF_KODI_ENTITY,
+    ARTIST_ALBUMS_MAX_PAGE_SIZE,
+    CATEGORY_ALBUMS,
+    CATEGORY_ALL,
+    CATEGORY_ARTISTS,
+    CATEGORY_CHANNELS,
+    CATEGORY_EPISODES,
+    CATEGORY_MOVIES,
+    CATEGORY_MUSIC_VIDEOS,
+    CATEGORY_MUSICPLAYLIST,
+    CATEGORY_SONGS,
+    CATEGORY_TVSHOWS,
+    DATA_SEARCH_TYPEAHEAD,
     DOMAIN,
+    FIELD_PROFILE_FULL,
+    FIELD_PROFILES,
+    SEARCH_CACHE_TTL,
+    SEARCH_PROPERTIES_ALBUMS,
+    SEARCH_PROPERTIES_ARTISTS,
+    SEARCH_PROPERTIES_CHANNELS,
+    SEARCH_PROPERTIES_EPISODES,
+    SEARCH_PROPERTIES_MOVIES,
+    SEARCH_PROPERTIES_MUSICVIDEOS,
+    SEARCH_PROPERTIES_SONGS,
+    SEARCH_PROPERTIES_TVSHOWS,
     OPTION_SEARCH_SONGS_LIMIT,
     DEFAULT_OPTION_SEARCH_SONGS_LIMIT,
     OPTION_SEARCH_ALBUMS_LIMIT,
@@ -35,37 +68,21 @@ from ..const import (
     DEFAULT_OPTION_SEARCH_CHANNELS_LIMIT,
     OPTION_SEARCH_MUSIC_PLAYLISTS_LIMIT,
     DEFAULT_OPTION_SEARCH_MUSIC_PLAYLISTS_LIMIT,
-    OPTION_SEARCH_RECENTLY_ADDED_SONGS_LIMIT,
-    DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_SONGS_LIMIT,
-    OPTION_SEARCH_RECENTLY_ADDED_ALBUMS_LIMIT,
-    DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_ALBUMS_LIMIT,
-    OPTION_SEARCH_RECENTLY_ADDED_MOVIES_LIMIT,
-    DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_MOVIES_LIMIT,
-    OPTION_SEARCH_RECENTLY_ADDED_EPISODES_LIMIT,
-    DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_EPISODES_LIMIT,
-    OPTION_SEARCH_RECENTLY_ADDED_MUSICVIDEOS_LIMIT,
-    DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_MUSICVIDEOS_LIMIT,
-    OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT,
-    DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT,
-    OPTION_SEARCH_RECENTLY_PLAYED_ALBUMS_LIMIT,
-    DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_ALBUMS_LIMIT,
 )
 
-from ..kodi_client import async_call_method
+from ..channel_catalog import async_get_channel_catalog
+from ..command_stats import track_command
+from ..compact import compact_items, compact_results
+from ..field_profiles import profile_properties, project_items
+from ..kodi_client import (
+    async_call_batch,
+    async_call_method,
+    async_get_kodi_entity_id,
+)
+from ..thumbnail_cache import async_resolve_thumbnails
 
 _LOGGER = logging.getLogger(__name__)
 
-CATEGORY_ALL = "all"
-CATEGORY_MOVIES = "movies"
-CATEGORY_TVSHOWS = "tvshows"
-CATEGORY_SONGS = "songs"
-CATEGORY_ALBUMS = "albums"
-CATEGORY_ARTISTS = "artists"
-CATEGORY_MUSIC_VIDEOS = "musicvideos"
-CATEGORY_EPISODES = "episodes"
-CATEGORY_CHANNELS = "channels"
-CATEGORY_MUSICPLAYLIST = "musicplaylists"
-
 VALID_CATEGORIES = [
     CATEGORY_ALL,
     CATEGORY_MOVIES,
@@ -83,17 +100,22 @@ VALID_CATEGORIES = [
 def async_register_websockets(hass: HomeAssistant) -> None:
     """Register search-related WebSocket commands."""
     websocket_api.async_register_command(hass, websocket_search)
+    websocket_api.async_register_command(hass, websocket_search_subscribe)
     websocket_api.async_register_command(hass, websocket_search_recently_played)
     websocket_api.async_register_command(hass, websocket_search_artist)
+    websocket_api.async_register_command(hass, websocket_search_artist_album)
     websocket_api.async_register_command(hass, websocket_search_recently_added)
+    websocket_api.async_register_command(
+        hass, websocket_search_recently_added_subscribe
+    )
     websocket_api.async_register_command(hass, websocket_search_tvshow)
+    websocket_api.async_register_command(hass, websocket_search_tvshow_season)
     websocket_api.async_register_command(hass, websocket_search_musicplaylists)
 
 
 def _get_kodi_entity_id_from_entry(hass, entry_id):
     """Retrieve kodi_entity_id from entry_id."""
-    config_entry = hass.config_entries.async_get_entry(entry_id)
-    return config_entry.data.get(CONF_KODI_ENTITY)
+    return async_get_kodi_entity_id(hass, entry_id)
 
 
 async def _is_kodi_connected(hass: HomeAssistant, entity_id: str) -> bool:
@@ -114,7 +136,7 @@ async def _search_movies(
         hass,
         entity_id,
         "VideoLibrary.GetMovies",
-        properties=["title", "year", "thumbnail", "genre"],
+        properties=SEARCH_PROPERTIES_MOVIES,
         filter={"field": "title", "operator": "contains", "value": query},
         limits={"start": 0, "end": limit_value},
         sort={
@@ -138,16 +160,7 @@ async def _search_episodes(
         hass,
         entity_id,
         "VideoLibrary.GetEpisodes",
-        properties=[
-            "title",
-            "episode",
-            "season",
-            "seasonid",
-            "tvshowid",
-            "thumbnail",
-            "showtitle",
-            "art",
-        ],
+        properties=SEARCH_PROPERTIES_EPISODES,
         filter={
             "field": "title",
             "operator": "contains",
@@ -176,7 +189,7 @@ async def _search_musicvideos(
         hass,
         entity_id,
         "VideoLibrary.GetMusicVideos",
-        properties=["thumbnail", "title", "year", "artist", "album", "art", "genre"],
+        properties=SEARCH_PROPERTIES_MUSICVIDEOS,
         filter={
             "or": [
                 {"field": "title", "operator": "contains", "value": query},
@@ -205,7 +218,7 @@ async def _search_tvshows(
         hass,
         entity_id,
         "VideoLibrary.GetTVShows",
-        properties=["title", "year", "thumbnail", "art"],
+        properties=SEARCH_PROPERTIES_TVSHOWS,
         filter={"field": "title", "operator": "contains", "value": query},
         limits={"start": 0, "end": limit_value},
         sort={
@@ -231,16 +244,7 @@ async def _search_songs(
         hass,
         entity_id,
         "AudioLibrary.GetSongs",
-        properties=[
-            "title",
-            "artist",
-            "year",
-            "genre",
-            "album",
-            "albumid",
-            "duration",
-            "thumbnail",
-        ],
+        properties=SEARCH_PROPERTIES_SONGS,
         sort={
             "method": "title",
             "order": "ascending",
@@ -264,7 +268,7 @@ async def _search_albums(
         hass,
         entity_id,
         "AudioLibrary.GetAlbums",
-        properties=["title", "artist", "year", "thumbnail"],
+        properties=SEARCH_PROPERTIES_ALBUMS,
         filter={"field": "album", "operator": "contains", "value": query},
         limits={"start": 0, "end": limit_value},
         sort={
@@ -288,7 +292,7 @@ async def _search_artists(
         hass,
         entity_id,
         "AudioLibrary.GetArtists",
-        properties=["thumbnail"],
+        properties=SEARCH_PROPERTIES_ARTISTS,
         filter={"field": "artist", "operator": "contains", "value": query},
         limits={"start": 0, "end": limit_value},
         sort={
@@ -303,6 +307,15 @@ async def _search_artists(
 async def _search_channels(
     hass: HomeAssistant, entity_id: str, query: str, search_limits: dict
 ):
+    limit_value = int(
+        search_limits.get(CATEGORY_CHANNELS, DEFAULT_OPTION_SEARCH_CHANNELS_LIMIT)
+    )
+
+    # Searched in the channel catalog, once loaded
+    channel_catalog = async_get_channel_catalog(hass, entity_id)
+    if channel_catalog is not None and await channel_catalog.async_load_once():
+        return channel_catalog.async_search(query, limit_value)
+
     # Verify the PVR addon before launching the queries
     try:
         pvr_status = await async_call_method(
@@ -322,9 +335,6 @@ async def _search_channels(
         _LOGGER.debug("PVR.GetProperties unavailable or error: %s", e)
         return []
 
-    limit_value = int(
-        search_limits.get(CATEGORY_CHANNELS, DEFAULT_OPTION_SEARCH_CHANNELS_LIMIT)
-    )
     resultTV = await _search_channel(hass, entity_id, query, limit_value, "alltv")
     resultRadio = await _search_channel(hass, entity_id, query, limit_value, "allradio")
 
@@ -342,7 +352,7 @@ async def _search_channel(
         hass,
         entity_id,
         "PVR.GetChannels",
-        properties=["uniqueid", "thumbnail", "channeltype", "channel", "channelnumber"],
+        properties=SEARCH_PROPERTIES_CHANNELS,
         channelgroupid=channel_group_id,
         sort={
             "method": "label",
@@ -373,6 +383,7 @@ async def _search_channel(
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_search_musicplaylists(    hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict,
@@ -419,43 +430,368 @@ _CATEGORY_HANDLERS = {
 }
 
 
-async def _async_search(
-    hass: HomeAssistant, entity_id: str, query: str, category: str, search_limits: dict
-) -> dict:
-    """Run the search sequentially to prevent overloading Kodi's webserver."""
+_DEFAULT_SEARCH_LIMITS = {
+    CATEGORY_MOVIES: DEFAULT_OPTION_SEARCH_MOVIES_LIMIT,
+    CATEGORY_TVSHOWS: DEFAULT_OPTION_SEARCH_TVSHOWS_LIMIT,
+    CATEGORY_SONGS: DEFAULT_OPTION_SEARCH_SONGS_LIMIT,
+    CATEGORY_ALBUMS: DEFAULT_OPTION_SEARCH_ALBUMS_LIMIT,
+    CATEGORY_ARTISTS: DEFAULT_OPTION_SEARCH_ARTISTS_LIMIT,
+    CATEGORY_MUSIC_VIDEOS: DEFAULT_OPTION_SEARCH_MUSICVIDEOS_LIMIT,
+    CATEGORY_EPISODES: DEFAULT_OPTION_SEARCH_EPISODES_LIMIT,
+    CATEGORY_CHANNELS: DEFAULT_OPTION_SEARCH_CHANNELS_LIMIT,
+}
+
+
+def _get_library_index(hass: HomeAssistant, entry_id: str):
+    """Return the in-memory library index of an entry, if any."""
+    return hass.data.get(DOMAIN, {}).get(entry_id, {}).get("library_index")
+
+
+def _get_search_limiter(hass: HomeAssistant, entry_id: str):
+    """Return the semaphore bounding the searches sent to Kodi, if any."""
+    return hass.data.get(DOMAIN, {}).get(entry_id, {}).get("search_limiter")
+
+
+def _get_search_cache(hass: HomeAssistant, entry_id: str):
+    """Return the cache of the search results of an entry, if any."""
+    return hass.data.get(DOMAIN, {}).get(entry_id, {}).get("search_cache")
+
+
+# Fields each handler filters on with the "contains" operator
+_REFINE_FIELDS = {
+    CATEGORY_MOVIES: ("title",),
+    CATEGORY_TVSHOWS: ("title",),
+    CATEGORY_SONGS: ("title",),
+    CATEGORY_ALBUMS: ("title",),
+    CATEGORY_ARTISTS: ("artist",),
+    CATEGORY_MUSIC_VIDEOS: ("title", "artist"),
+    CATEGORY_EPISODES: ("title",),
+    CATEGORY_CHANNELS: ("label",),
+}
+
+
+def _item_contains(item: dict, fields: tuple, query: str) -> bool:
+    """Apply the "contains" filter of Kodi to an item (query casefolded)."""
+    for field in fields:
+        value = item.get(field)
+        if isinstance(value, list):
+            value = " / ".join(value)
+        if isinstance(value, str) and query in value.casefold():
+            return True
+    return False
+
+
+class _TypeAhead:
+    """Last complete search results of one connection, for type-ahead.
+
+    Kodi filters with "contains": the matches of a query containing the
+    previous one ("beatl" after "beat") are a subset of the previous
+    matches. When those were complete (fewer items than the limit), they
+    are filtered locally instead of searching Kodi again.
+    """
+
+    def __init__(self, result_cache=None) -> None:
+        """Initialisation."""
+        self._result_cache = result_cache
+        # category -> (casefolded query, limit, expiry, cache generation, items)
+        self._results: dict[str, tuple] = {}
+
+    def _generation(self) -> int | None:
+        if self._result_cache is None:
+            return None
+        return self._result_cache.generation
+
+    @callback
+    def async_refine(self, query: str, category: str, limit: int) -> list | None:
+        """Return the items of the query, None if Kodi must be searched."""
+        previous = self._results.get(category)
+        if previous is None:
+            return None
+        previous_query, previous_limit, expiry, generation, items = previous
+        query = query.casefold()
+        if (
+            previous_limit != limit
+            or previous_query not in query
+            or expiry < time.monotonic()
+            or generation != self._generation()
+        ):
+            return None
+        fields = _REFINE_FIELDS[category]
+        return [item for item in items if _item_contains(item, fields, query)]
+
+    @callback
+    def async_record(self, query: str, category: str, limit: int, items: list):
+        """Remember the items returned by Kodi for a query."""
+        if len(items) < limit:
+            self._results[category] = (
+                query.casefold(),
+                limit,
+                time.monotonic() + SEARCH_CACHE_TTL,
+                self._generation(),
+                items,
+            )
+        else:
+            # Incomplete: the next query could match items not in there
+            self._results.pop(category, None)
+
+
+@callback
+def _async_get_typeahead(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, entry_id: str
+) -> _TypeAhead:
+    """Return the type-ahead state of a connection, dropped on disconnect."""
+    typeaheads = hass.data.setdefault(DATA_SEARCH_TYPEAHEAD, {})
+    key = (id(connection), entry_id)
+    if key not in typeaheads:
+        typeaheads[key] = _TypeAhead(_get_search_cache(hass, entry_id))
+
+        @callback
+        def _async_forget() -> None:
+            typeaheads.pop(key, None)
+
+        # Called by Home Assistant when the connection closes
+        connection.subscriptions[(DATA_SEARCH_TYPEAHEAD, entry_id)] = _async_forget
+    return typeaheads[key]
+
+
+def _search_category_in_index(
+    library_index, query: str, category: str, search_limits: dict
+) -> list | None:
+    """Search one category in the library index, None if it is not loaded."""
+    if library_index is None:
+        return None
+    limit_value = int(search_limits.get(category, _DEFAULT_SEARCH_LIMITS[category]))
+    return library_index.async_search(category, query, limit_value)
+
+
+async def _async_iter_search(
+    hass: HomeAssistant,
+    entity_id: str,
+    query: str,
+    category: str,
+    search_limits: dict,
+    library_index=None,
+    limiter: asyncio.Semaphore | None = None,
+    result_cache=None,
+    typeahead: _TypeAhead | None = None,
+):
+    """Yield `(category, items)` as soon as the items of a category are known.
+
+    Categories loaded in the library index, refined from the previous
+    results of the connection (`typeahead`) or whose results are in
+    `result_cache`, are answered from memory, and first; the cold ones
+    are requested from Kodi in parallel, but never more at once than
+    allowed by `limiter` (shared by all the searches of the Kodi
+    instance) to prevent overloading Kodi's webserver.
+    """
     if category == CATEGORY_ALL:
         categories = list(_CATEGORY_HANDLERS)
     else:
         categories = [category]
+    if limiter is None:
+        limiter = asyncio.Semaphore(1)
 
-    results = []
+    def _limit(cat: str) -> int:
+        return int(search_limits.get(cat, _DEFAULT_SEARCH_LIMITS[cat]))
+
+    cold_categories = []
     for cat in categories:
-        res = await _CATEGORY_HANDLERS[cat](hass, entity_id, query, search_limits)
-        results.append(res)
+        items = _search_category_in_index(library_index, query, cat, search_limits)
+        if items is None and typeahead is not None:
+            items = typeahead.async_refine(query, cat, _limit(cat))
+        if items is None and result_cache is not None:
+            items = result_cache.async_get(
+                result_cache.key(query, cat, search_limits.get(cat))
+            )
+            if items is not None and typeahead is not None:
+                typeahead.async_record(query, cat, _limit(cat), items)
+        if items is None:
+            cold_categories.append(cat)
+        else:
+            yield cat, items
+
+    async def _async_search_kodi(cat: str) -> tuple[str, list]:
+        async with limiter:
+            items = await _CATEGORY_HANDLERS[cat](hass, entity_id, query, search_limits)
+        if items is None:
+            return cat, []
+        if result_cache is not None:
+            result_cache.async_set(
+                result_cache.key(query, cat, search_limits.get(cat)), items
+            )
+        if typeahead is not None:
+            typeahead.async_record(query, cat, _limit(cat), items)
+        return cat, items
+
+    tasks = [asyncio.ensure_future(_async_search_kodi(cat)) for cat in cold_categories]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Search abandoned (or failed): do not keep Kodi busy for nothing
+        for task in tasks:
+            task.cancel()
+
+
+async def _async_search(
+    hass: HomeAssistant,
+    entity_id: str,
+    query: str,
+    category: str,
+    search_limits: dict,
+    library_index=None,
+    limiter: asyncio.Semaphore | None = None,
+    result_cache=None,
+    typeahead: _TypeAhead | None = None,
+) -> dict:
+    """Run the search and return the items of every category at once."""
+    found = {
+        cat: items
+        async for cat, items in _async_iter_search(
+            hass,
+            entity_id,
+            query,
+            category,
+            search_limits,
+            library_index,
+            limiter,
+            result_cache,
+            typeahead,
+        )
+    }
+    return {cat: found[cat] for cat in _CATEGORY_HANDLERS if cat in found}
+
 
+def _get_search_limits(config_entry) -> dict:
+    """Return the search limit of each category, from the entry options."""
     return {
-        cat: (items if items is not None else [])
-        for cat, items in zip(categories, results)
+        CATEGORY_SONGS: config_entry.options.get(
+            OPTION_SEARCH_SONGS_LIMIT, DEFAULT_OPTION_SEARCH_SONGS_LIMIT
+        ),
+        CATEGORY_ALBUMS: config_entry.options.get(
+            OPTION_SEARCH_ALBUMS_LIMIT, DEFAULT_OPTION_SEARCH_ALBUMS_LIMIT
+        ),
+        CATEGORY_MOVIES: config_entry.options.get(
+            OPTION_SEARCH_MOVIES_LIMIT, DEFAULT_OPTION_SEARCH_MOVIES_LIMIT
+        ),
+        CATEGORY_TVSHOWS: config_entry.options.get(
+            OPTION_SEARCH_TVSHOWS_LIMIT, DEFAULT_OPTION_SEARCH_TVSHOWS_LIMIT
+        ),
+        CATEGORY_ARTISTS: config_entry.options.get(
+            OPTION_SEARCH_ARTISTS_LIMIT, DEFAULT_OPTION_SEARCH_ARTISTS_LIMIT
+        ),
+        CATEGORY_MUSIC_VIDEOS: config_entry.options.get(
+            OPTION_SEARCH_MUSICVIDEOS_LIMIT, DEFAULT_OPTION_SEARCH_MUSICVIDEOS_LIMIT
+        ),
+        CATEGORY_EPISODES: config_entry.options.get(
+            OPTION_SEARCH_EPISODES_LIMIT, DEFAULT_OPTION_SEARCH_EPISODES_LIMIT
+        ),
+        CATEGORY_CHANNELS: config_entry.options.get(
+            OPTION_SEARCH_CHANNELS_LIMIT, DEFAULT_OPTION_SEARCH_CHANNELS_LIMIT
+        ),
+        CATEGORY_MUSICPLAYLIST: config_entry.options.get(
+            OPTION_SEARCH_MUSIC_PLAYLISTS_LIMIT,
+            DEFAULT_OPTION_SEARCH_MUSIC_PLAYLISTS_LIMIT,
+        ),
     }
 
 
+# Properties of the albums and songs of the artist drill-down
+_ARTIST_ALBUM_PROPERTIES = ["title", "artist", "year", "thumbnail", "artistid"]
+_ARTIST_SONG_PROPERTIES = [
+    "title",
+    "artist",
+    "album",
+    "duration",
+    "file",
+    "albumid",
+    "artistid",
+]
+
+
+def _get_album_songs_call(album_id: int, profile: str):
+    """Return the `AudioLibrary.GetSongs` call of an album, in track order.
+
+    The songs do not have their own thumbnail: they get the album's.
+    """
+    return (
+        "AudioLibrary.GetSongs",
+        {
+            "filter": {"albumid": album_id},
+            "properties": profile_properties(_ARTIST_SONG_PROPERTIES, profile),
+            "sort": {"method": "track", "order": "ascending"},
+        },
+    )
+
+
+def _get_artist_songs_call(artist_id: int, profile: str):
+    """Return the `AudioLibrary.GetSongs` call of an artist, in track order.
+
+    The songs are grouped by album afterwards: they keep their `albumid`.
+    """
+    return (
+        "AudioLibrary.GetSongs",
+        {
+            "filter": {"artistid": artist_id},
+            "properties": profile_properties(
+                _ARTIST_SONG_PROPERTIES, profile, required=("albumid",)
+            ),
+            "sort": {"method": "track", "order": "ascending"},
+        },
+    )
+
+
+def _prepare_album_songs(
+    album: dict, songs: list[dict], artist_id: int | None = None
+) -> list[dict]:
+    """Return the songs of an album, with the thumbnail of the album.
+
+    With `artist_id`, only the songs of that artist are kept, unless the
+    album is theirs (e.g. a compilation only lists their own songs).
+    """
+    if artist_id is not None and artist_id not in album.get("artistid", []):
+        songs = [song for song in songs if artist_id in song.get("artistid", [])]
+    if "thumbnail" in album:
+        for song in songs:
+            song["thumbnail"] = album["thumbnail"]
+    return songs
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "kodi_media_sensors/search_artist",
         vol.Required("entry_id"): str,
         vol.Required("artist_id"): vol.Any(int, str),
+        vol.Optional("cursor", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("limit", default=ARTIST_ALBUMS_MAX_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=ARTIST_ALBUMS_MAX_PAGE_SIZE)
+        ),
+        vol.Optional("lazy", default=False): bool,
+        vol.Optional("profile", default=FIELD_PROFILE_FULL): vol.In(FIELD_PROFILES),
+        vol.Optional("compact", default=False): bool,
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_search_artist(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict,
 ) -> None:
-    """Get detailed view of an artist (Albums containing their Songs)."""
+    """Get detailed view of an artist (Albums containing their Songs).
+
+    The albums, most recent first, are paginated by Kodi: `cursor` is
+    the position of the first album, and the reply gives the cursor of
+    the next page (None after the last one). The songs of the artist
+    are requested in the same batch as the albums and grouped by album,
+    unless `lazy`: they are then fetched album by album with
+    `search_artist_album`.
+    """
     msg_id = msg["id"]
     kodi_entity_id = _get_kodi_entity_id_from_entry(hass, msg["entry_id"])
     artist_id = int(msg["artist_id"])
+    profile = msg["profile"]
+    cursor = msg["cursor"]
 
     if not await _is_kodi_connected(hass, kodi_entity_id):
         connection.send_error(
@@ -463,78 +799,51 @@ async def websocket_search_artist(
         )
         return
 
-    try:
-        albums_task = async_call_method(
-            hass,
-            kodi_entity_id,
+    calls = [
+        (
             "AudioLibrary.GetAlbums",
-            properties=["title", "artist", "year", "thumbnail"],
-            filter={"artistid": artist_id},
-        )
-        songs_task = async_call_method(
-            hass,
-            kodi_entity_id,
-            "AudioLibrary.GetSongs",
-            properties=[
-                "title",
-                "artist",
-                "album",
-                "duration",
-                "thumbnail",
-                "file",
-                "albumid",
-            ],
-            filter={"artistid": artist_id},
+            {
+                "properties": profile_properties(
+                    _ARTIST_ALBUM_PROPERTIES, profile, required=("artistid",)
+                ),
+                "filter": {"artistid": artist_id},
+                "sort": {"method": "year", "order": "descending"},
+                "limits": {"start": cursor, "end": cursor + msg["limit"]},
+            },
         )
+    ]
+    if not msg["lazy"]:
+        calls.append(_get_artist_songs_call(artist_id, profile))
 
-        raw_albums, raw_songs = await asyncio.gather(albums_task, songs_task)
+    try:
+        raw_albums, *raw_songs = await async_call_batch(hass, kodi_entity_id, calls)
 
         albums = raw_albums.get("albums", []) if raw_albums else []
-        songs = raw_songs.get("songs", []) if raw_songs else []
-
-        albums_dict = {album["albumid"]: {**album, "songs": []} for album in albums}
-
-        for song in songs:
-            album_id = song.get("albumid")
-            if album_id in albums_dict:
-                albums_dict[album_id]["songs"].append(song)
-
-        structured_albums = list(albums_dict.values())
-
-        mp_component = hass.data.get("media_player")
-        mp_entity = mp_component.get_entity(kodi_entity_id) if mp_component else None
-
-        if mp_entity:
-            for album in structured_albums:
-                thumb = album.get("thumbnail")
-                final_thumb = (
-                    next((t for t in thumb if t is not None), None)
-                    if isinstance(thumb, list)
-                    else thumb
+        total = (
+            raw_albums.get("limits", {}).get("total", cursor + len(albums))
+            if raw_albums
+            else 0
+        )
+        await async_resolve_thumbnails(hass, kodi_entity_id, albums)
+
+        if not msg["lazy"]:
+            songs_by_album: dict[int, list[dict]] = {}
+            for song in (raw_songs[0] or {}).get("songs", []):
+                songs_by_album.setdefault(song.get("albumid"), []).append(song)
+            for album in albums:
+                # Already restricted to the songs of the artist
+                album["songs"] = _prepare_album_songs(
+                    album, songs_by_album.get(album["albumid"], [])
                 )
-                if final_thumb and final_thumb.startswith("image://"):
-                    album["thumbnail"] = await mp_entity.async_get_browse_image(
-                        "image", final_thumb
-                    )
-                else:
-                    album["thumbnail"] = None
-
-                for song in album["songs"]:
-                    s_thumb = song.get("thumbnail")
-                    final_s_thumb = (
-                        next((t for t in s_thumb if t is not None), None)
-                        if isinstance(s_thumb, list)
-                        else s_thumb
-                    )
-                    if final_s_thumb and final_s_thumb.startswith("image://"):
-                        song["thumbnail"] = await mp_entity.async_get_browse_image(
-                            "image", final_s_thumb
-                        )
-                    else:
-                        song["thumbnail"] = None
-
-        structured_albums.sort(key=lambda x: x.get("year", 0), reverse=True)
-        results = {"albums": structured_albums}
+
+        next_cursor = cursor + len(albums)
+        results = {
+            "albums": project_items(albums, profile),
+            "total": total,
+            "next_cursor": next_cursor if albums and next_cursor < total else None,
+        }
+        if msg["compact"]:
+            results = compact_results(results)
         connection.send_result(msg_id, results)
 
     except Exception as e:
@@ -548,176 +857,123 @@ async def websocket_search_artist(
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): "kodi_media_sensors/search_recently_added",
+        vol.Required("type"): "kodi_media_sensors/search_artist_album",
         vol.Required("entry_id"): str,
-        # vol.Required("kodi_entity_id"): str,
+        vol.Required("album_id"): vol.Any(int, str),
+        vol.Optional("artist_id"): vol.Any(int, str),
+        vol.Optional("profile", default=FIELD_PROFILE_FULL): vol.In(FIELD_PROFILES),
+        vol.Optional("compact", default=False): bool,
     }
 )
 @websocket_api.async_response
-async def websocket_search_recently_added(
+@track_command
+async def websocket_search_artist_album(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict,
 ) -> None:
-    """Fetch all recently added media from Kodi (Songs, Albums, Movies, Episodes, Music Videos)."""
+    """Fetch the songs of an album of the artist drill-down."""
     msg_id = msg["id"]
-    entry_id = msg["entry_id"]
     kodi_entity_id = _get_kodi_entity_id_from_entry(hass, msg["entry_id"])
+    album_id = int(msg["album_id"])
+    artist_id = int(msg["artist_id"]) if "artist_id" in msg else None
+    profile = msg["profile"]
 
-    config_entry = hass.config_entries.async_get_entry(entry_id)
-    if not config_entry or config_entry.domain != DOMAIN:
-        connection.send_error(msg_id, "invalid_entry", f"Entry {entry_id} not found")
-        return
-    songsLimits = int(
-        config_entry.options.get(
-            OPTION_SEARCH_RECENTLY_ADDED_SONGS_LIMIT,
-            DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_SONGS_LIMIT,
-        )
-    )
-    albumsLimits = int(
-        config_entry.options.get(
-            OPTION_SEARCH_RECENTLY_ADDED_ALBUMS_LIMIT,
-            DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_ALBUMS_LIMIT,
-        )
-    )
-    moviesLimits = int(
-        config_entry.options.get(
-            OPTION_SEARCH_RECENTLY_ADDED_MOVIES_LIMIT,
-            DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_MOVIES_LIMIT,
-        )
-    )
-    episodesLimits = int(
-        config_entry.options.get(
-            OPTION_SEARCH_RECENTLY_ADDED_EPISODES_LIMIT,
-            DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_EPISODES_LIMIT,
-        )
-    )
-    musicvideosLimits = int(
-        config_entry.options.get(
-            OPTION_SEARCH_RECENTLY_ADDED_MUSICVIDEOS_LIMIT,
-            DEFAULT_OPTION_SEARCH_RECENTLY_ADDED_MUSICVIDEOS_LIMIT,
+    if not await _is_kodi_connected(hass, kodi_entity_id):
+        connection.send_error(
+            msg_id, "kodi_unavailable", "Kodi is currently unreachable"
         )
+        return
+
+    raw_album, raw_songs = await async_call_batch(
+        hass,
+        kodi_entity_id,
+        [
+            (
+                "AudioLibrary.GetAlbumDetails",
+                {
+                    "albumid": album_id,
+                    "properties": profile_properties(
+                        ["thumbnail", "artistid"], profile, required=("artistid",)
+                    ),
+                },
+            ),
+            _get_album_songs_call(album_id, profile),
+        ],
     )
-    try:
-        songs_task = async_call_method(
-            hass,
-            kodi_entity_id,
-            "AudioLibrary.GetRecentlyAddedSongs",
-            properties=[
-                "title",
-                "artist",
-                "album",
-                "duration",
-                "thumbnail",
-                "file",
-                "albumid",
-            ],
-            limits={"start": 0, "end": songsLimits},
+    if raw_album is None or raw_songs is None:
+        connection.send_error(
+            msg_id, "search_error", f"Could not fetch album {album_id}"
         )
+        return
 
-        albums_task = async_call_method(
-            hass,
-            kodi_entity_id,
-            "AudioLibrary.GetRecentlyAddedAlbums",
-            properties=[
-                "thumbnail",
-                "title",
-                "year",
-                "art",
-                "genre",
-                "artist",
-                "artistid",
-            ],
-            limits={"start": 0, "end": albumsLimits},
-        )
+    album = raw_album.get("albumdetails", {})
+    await async_resolve_thumbnails(hass, kodi_entity_id, [album])
+    songs = _prepare_album_songs(album, raw_songs.get("songs", []), artist_id)
 
-        movies_task = async_call_method(
-            hass,
-            kodi_entity_id,
-            "VideoLibrary.GetRecentlyAddedMovies",
-            properties=["title", "year", "thumbnail", "file", "rating"],
-            limits={"start": 0, "end": moviesLimits},
-        )
+    results = {"songs": project_items(songs, profile)}
+    if msg["compact"]:
+        results = compact_results(results)
+    connection.send_result(msg_id, results)
 
-        episodes_task = async_call_method(
-            hass,
-            kodi_entity_id,
-            "VideoLibrary.GetRecentlyAddedEpisodes",
-            properties=[
-                "title",
-                "episode",
-                "season",
-                "seasonid",
-                "tvshowid",
-                "thumbnail",
-                "showtitle",
-                "art",
-            ],
-            limits={"start": 0, "end": episodesLimits},
-        )
 
-        musicvideos_task = async_call_method(
-            hass,
-            kodi_entity_id,
-            "VideoLibrary.GetRecentlyAddedMusicVideos",
-            properties=[
-                "thumbnail",
-                "title",
-                "year",
-                "artist",
-                "album",
-                "art",
-                "genre",
-            ],
-            limits={"start": 0, "end": musicvideosLimits},
-        )
+async def _async_encode_recently_added(
+    hass: HomeAssistant,
+    kodi_entity_id: str,
+    items: dict[str, list[dict]],
+    profile: str,
+    compact: bool,
+) -> dict:
+    """Return recently added items (per category) as sent to a client."""
+    await async_resolve_thumbnails(
+        hass,
+        kodi_entity_id,
+        [item for category_items in items.values() for item in category_items],
+    )
+    results = {
+        category: project_items(category_items, profile)
+        for category, category_items in items.items()
+    }
+    return compact_results(results) if compact else results
 
-        (
-            raw_songs,
-            raw_albums,
-            raw_movies,
-            raw_episodes,
-            raw_musicvideos,
-        ) = await asyncio.gather(
-            songs_task, albums_task, movies_task, episodes_task, musicvideos_task
-        )
 
-        results = {
-            "songs": raw_songs.get("songs", []) if raw_songs else [],
-            "albums": raw_albums.get("albums", []) if raw_albums else [],
-            "movies": raw_movies.get("movies", []) if raw_movies else [],
-            "musicvideos": raw_musicvideos.get("musicvideos", [])
-            if raw_musicvideos
-            else [],
-            "episodes": [
-                {
-                    **ep,
-                    "artist": ep.get("showtitle"),
-                    "label": f"S{ep.get('season', 0):02d}E{ep.get('episode', 0):02d} - {ep.get('title')}",
-                }
-                for ep in (raw_episodes.get("episodes", []) if raw_episodes else [])
-            ],
-        }
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "kodi_media_sensors/search_recently_added",
+        vol.Required("entry_id"): str,
+        # vol.Required("kodi_entity_id"): str,
+        vol.Optional("profile", default=FIELD_PROFILE_FULL): vol.In(FIELD_PROFILES),
+        vol.Optional("compact", default=False): bool,
+    }
+)
+@websocket_api.async_response
+@track_command
+async def websocket_search_recently_added(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Fetch all recently added media from Kodi (Songs, Albums, Movies, Episodes, Music Videos).
 
-        mp_component = hass.data.get("media_player")
-        mp_entity = mp_component.get_entity(kodi_entity_id) if mp_component else None
-
-        if mp_entity:
-            for category, items in results.items():
-                for item in items:
-                    thumb = item.get("thumbnail")
-                    final_thumb = (
-                        next((t for t in thumb if t is not None), None)
-                        if isinstance(thumb, list)
-                        else thumb
-                    )
-                    if final_thumb and final_thumb.startswith("image://"):
-                        item["thumbnail"] = await mp_entity.async_get_browse_image(
-                            "image", final_thumb
-                        )
-                    else:
-                        item["thumbnail"] = None
+    The items come from the recently added store of the entry: Kodi is
+    only requested while the store is not loaded.
+    """
+    msg_id = msg["id"]
+    entry_id = msg["entry_id"]
+    store = hass.data.get(DOMAIN, {}).get(entry_id, {}).get("recently_added")
+    if store is None:
+        connection.send_error(msg_id, "invalid_entry", f"Entry {entry_id} not found")
+        return
 
+    try:
+        await store.async_load_once()
+        results = await _async_encode_recently_added(
+            hass,
+            _get_kodi_entity_id_from_entry(hass, entry_id),
+            store.async_get_items(),
+            msg["profile"],
+            msg["compact"],
+        )
         connection.send_result(msg_id, results)
 
     except Exception as e:
@@ -728,93 +984,132 @@ async def websocket_search_recently_added(
         )
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "kodi_media_sensors/search_recently_added_subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("profile", default=FIELD_PROFILE_FULL): vol.In(FIELD_PROFILES),
+        vol.Optional("compact", default=False): bool,
+    }
+)
+@websocket_api.async_response
+@track_command
+async def websocket_search_recently_added_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Subscribe to the recently added media.
+
+    The first event holds every item, as `{"items": {...}}`; the next
+    ones the items added and the ids of the items removed (or pushed out
+    by newer ones) since, as `{"added": {...}, "removed": {...}}`.
+    """
+    msg_id = msg["id"]
+    entry_id = msg["entry_id"]
+    profile = msg["profile"]
+    compact = msg["compact"]
+    store = hass.data.get(DOMAIN, {}).get(entry_id, {}).get("recently_added")
+    if store is None:
+        connection.send_error(msg_id, "invalid_entry", f"Entry {entry_id} not found")
+        return
+    kodi_entity_id = _get_kodi_entity_id_from_entry(hass, entry_id)
+    # Events are sent in order, whatever the time their thumbnails take
+    send_lock = asyncio.Lock()
+    tasks: set[asyncio.Task] = set()
+    # Changes made before the first event are part of it
+    snapshot_taken = False
+
+    async def _async_send_changes(added: dict, removed: dict) -> None:
+        async with send_lock:
+            connection.send_message(
+                websocket_api.event_message(
+                    msg_id,
+                    {
+                        "added": await _async_encode_recently_added(
+                            hass, kodi_entity_id, added, profile, compact
+                        ),
+                        "removed": removed,
+                    },
+                )
+            )
+
+    @callback
+    def _async_on_changes(added: dict, removed: dict) -> None:
+        if not snapshot_taken:
+            return
+        task = hass.async_create_background_task(
+            _async_send_changes(added, removed),
+            f"{DOMAIN} recently added {msg_id}",
+        )
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    unsubscribe = store.async_subscribe(_async_on_changes)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        unsubscribe()
+        for task in tasks:
+            task.cancel()
+
+    connection.subscriptions[msg_id] = _async_unsubscribe
+    connection.send_result(msg_id)
+
+    async with send_lock:
+        await store.async_load_once()
+        items = store.async_get_items()
+        snapshot_taken = True
+        connection.send_message(
+            websocket_api.event_message(
+                msg_id,
+                {
+                    "items": await _async_encode_recently_added(
+                        hass, kodi_entity_id, items, profile, compact
+                    )
+                },
+            )
+        )
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "kodi_media_sensors/search_recently_played",
         vol.Required("entry_id"): str,
         # vol.Required("kodi_entity_id"): str,
+        vol.Optional("profile", default=FIELD_PROFILE_FULL): vol.In(FIELD_PROFILES),
+        vol.Optional("compact", default=False): bool,
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_search_recently_played(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict,
 ) -> None:
-    """Fetch recently played songs."""
+    """Fetch recently played songs.
+
+    The songs and albums come from the recently played buffer of the
+    entry: Kodi is only requested while it has not been seeded.
+    """
     msg_id = msg["id"]
     entry_id = msg["entry_id"]
-    msg_id = msg["id"]
     _LOGGER.debug(">>> Entering search recently played items")
 
-    kodi_entity_id = _get_kodi_entity_id_from_entry(hass, msg["entry_id"])
-    config_entry = hass.config_entries.async_get_entry(entry_id)
-    if not config_entry or config_entry.domain != DOMAIN:
+    buffer = hass.data.get(DOMAIN, {}).get(entry_id, {}).get("recently_played")
+    if buffer is None:
         connection.send_error(msg_id, "invalid_entry", f"Entry {entry_id} not found")
         return
 
-    songsLimits = int(
-        config_entry.options.get(
-            OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT,
-            DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_SONGS_LIMIT,
-        )
-    )
-    albumsLimits = int(
-        config_entry.options.get(
-            OPTION_SEARCH_RECENTLY_PLAYED_ALBUMS_LIMIT,
-            DEFAULT_OPTION_SEARCH_RECENTLY_PLAYED_ALBUMS_LIMIT,
-        )
-    )
-
     try:
-        songs_task = async_call_method(
-            hass,
-            kodi_entity_id,
-            "AudioLibrary.GetSongs",
-            properties=[
-                "title",
-                "album",
-                "albumid",
-                "artist",
-                "artistid",
-                "track",
-                "year",
-                "duration",
-                "genre",
-                "thumbnail",
-            ],
-            sort={
-                "method": "lastplayed",
-                "order": "descending",
-            },
-            limits={"start": 0, "end": songsLimits},
-        )
-
-        albums_task = async_call_method(
-            hass,
-            kodi_entity_id,
-            "AudioLibrary.GetRecentlyPlayedAlbums",
-            properties=[
-                "thumbnail",
-                "title",
-                "year",
-                "art",
-                "genre",
-                "artist",
-                "artistid",
-            ],
-            limits={"start": 0, "end": albumsLimits},
-        )
-
-        (
-            raw_songs,
-            raw_albums,
-        ) = await asyncio.gather(songs_task, albums_task)
-
+        await buffer.async_load_once()
         results = {
-            "songs": raw_songs.get("songs", []) if raw_songs else [],
-            "albums": raw_albums.get("albums", []) if raw_albums else [],
+            category: project_items(items, msg["profile"])
+            for category, items in buffer.async_get_items().items()
         }
+        if msg["compact"]:
+            results = compact_results(results)
 
         connection.send_result(msg_id, results)
 
@@ -832,9 +1127,12 @@ async def websocket_search_recently_played(
         vol.Required("entry_id"): str,
         vol.Required("query"): str,
         vol.Optional("category"): vol.In(VALID_CATEGORIES),
+        vol.Optional("profile", default=FIELD_PROFILE_FULL): vol.In(FIELD_PROFILES),
+        vol.Optional("compact", default=False): bool,
     }
 )
 @websocket_api.async_response
+@track_command
 async def websocket_search(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
@@ -852,36 +1150,7 @@ async def websocket_search(
         connection.send_error(msg_id, "invalid_entry", f"Entry {entry_id} not found")
         return
 
-    search_limits = {
-        CATEGORY_SONGS: config_entry.options.get(
-            OPTION_SEARCH_SONGS_LIMIT, DEFAULT_OPTION_SEARCH_SONGS_LIMIT
-        ),
-        CATEGORY_ALBUMS: config_entry.options.get(
-            OPTION_SEARCH_ALBUMS_LIMIT, DEFAULT_OPTION_SEARCH_ALBUMS_LIMIT
-        ),
-        CATEGORY_MOVIES: config_entry.options.get(
-            OPTION_SEARCH_MOVIES_LIMIT, DEFAULT_OPTION_SEARCH_MOVIES_LIMIT
-        ),
-        CATEGORY_TVSHOWS: config_entry.options.get(
-            OPTION_SEARCH_TVSHOWS_LIMIT, DEFAULT_OPTION_SEARCH_TVSHOWS_LIMIT
-        ),
-        CATEGORY_ARTISTS: config_entry.options.get(
-            OPTION_SEARCH_ARTISTS_LIMIT, DEFAULT_OPTION_SEARCH_ARTISTS_LIMIT
-        ),
-        CATEGORY_MUSIC_VIDEOS: config_entry.options.get(
-            OPTION_SEARCH_MUSICVIDEOS_LIMIT, DEFAULT_OPTION_SEARCH_MUSICVIDEOS_LIMIT
-        ),
-        CATEGORY_EPISODES: config_entry.options.get(
-            OPTION_SEARCH_EPISODES_LIMIT, DEFAULT_OPTION_SEARCH_EPISODES_LIMIT
-        ),
-        CATEGORY_CHANNELS: config_entry.options.get(
-            OPTION_SEARCH_CHANNELS_LIMIT, DEFAULT_OPTION_SEARCH_CHANNELS_LIMIT
-        ),
-        CATEGORY_MUSICPLAYLIST: config_entry.options.get(
-            OPTION_SEARCH_MUSIC_PLAYLISTS_LIMIT,
-            DEFAULT_OPTION_SEARCH_MUSIC_PLAYLISTS_LIMIT,
-        ),
-    }
+    search_limits = _get_search_limits(config_entry)
 
     if not await _is_kodi_connected(hass, kodi_entity_id):
         connection.send_error(
@@ -893,17 +1162,142 @@ async def websocket_search(
         connection.send_error(msg_id, "invalid_query", "Query cannot be empty")
         return
 
-    results = await _async_search(hass, kodi_entity_id, query, category, search_limits)
+    results = await _async_search(
+        hass,
+        kodi_entity_id,
+        query,
+        category,
+        search_limits,
+        _get_library_index(hass, entry_id),
+        _get_search_limiter(hass, entry_id),
+        _get_search_cache(hass, entry_id),
+        _async_get_typeahead(hass, connection, entry_id),
+    )
 
+    results = {
+        cat: project_items(items, msg["profile"]) for cat, items in results.items()
+    }
+    if msg["compact"]:
+        results = compact_results(results)
     connection.send_result(msg_id, {"results": results})
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "kodi_media_sensors/search_subscribe",
+        vol.Required("entry_id"): str,
+        vol.Required("query"): str,
+        vol.Optional("category", default=CATEGORY_ALL): vol.In(VALID_CATEGORIES),
+        vol.Optional("profile", default=FIELD_PROFILE_FULL): vol.In(FIELD_PROFILES),
+        vol.Optional("compact", default=False): bool,
+    }
+)
+@websocket_api.async_response
+@track_command
+async def websocket_search_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Search Kodi's libraries, streaming the results of each category."""
+    entry_id = msg["entry_id"]
+    msg_id = msg["id"]
+    query = msg["query"]
+
+    config_entry = hass.config_entries.async_get_entry(entry_id)
+    if not config_entry or config_entry.domain != DOMAIN:
+        connection.send_error(msg_id, "invalid_entry", f"Entry {entry_id} not found")
+        return
+
+    kodi_entity_id = _get_kodi_entity_id_from_entry(hass, entry_id)
+    if not await _is_kodi_connected(hass, kodi_entity_id):
+        connection.send_error(
+            msg_id, "kodi_unavailable", "Kodi is currently unreachable"
+        )
+        return
+
+    if not query.strip():
+        connection.send_error(msg_id, "invalid_query", "Query cannot be empty")
+        return
+
+    def _encode(items: list) -> list | dict:
+        items = project_items(items, msg["profile"])
+        return compact_items(items) if msg["compact"] else items
+
+    async def _async_stream_results() -> None:
+        try:
+            async for cat, items in _async_iter_search(
+                hass,
+                kodi_entity_id,
+                query,
+                msg["category"],
+                _get_search_limits(config_entry),
+                _get_library_index(hass, entry_id),
+                _get_search_limiter(hass, entry_id),
+                _get_search_cache(hass, entry_id),
+                _async_get_typeahead(hass, connection, entry_id),
+            ):
+                connection.send_message(
+                    websocket_api.event_message(
+                        msg_id,
+                        {
+                            "type": "search_results",
+                            "category": cat,
+                            "items": _encode(items),
+                        },
+                    )
+                )
+        except Exception as e:  # noqa: BLE001 - report instead of going silent
+            _LOGGER.exception("Streamed search of '%s' failed", query)
+            connection.send_message(
+                websocket_api.event_message(
+                    msg_id, {"type": "search_done", "error": str(e)}
+                )
+            )
+            return
+
+        connection.send_message(
+            websocket_api.event_message(msg_id, {"type": "search_done"})
+        )
+
+    task = hass.async_create_background_task(
+        _async_stream_results(), f"{DOMAIN} search {msg_id}"
+    )
+
+    @callback
+    def _async_unsubscribe() -> None:
+        task.cancel()
+
+    connection.subscriptions[msg_id] = _async_unsubscribe
+    connection.send_result(msg_id)
+
+
+_TVSHOW_SCHEMA = {
+    vol.Optional("entry_id"): str,
+    vol.Optional("kodi_entity_id"): str,
+    vol.Required("tvshow_id"): vol.Any(int, str),
+    vol.Optional("profile", default=FIELD_PROFILE_FULL): vol.In(FIELD_PROFILES),
+    vol.Optional("compact", default=False): bool,
+}
+
+# Properties of the episodes of the TV show drill-down
+_TVSHOW_EPISODE_PROPERTIES = [
+    "title",
+    "season",
+    "episode",
+    "runtime",
+    "thumbnail",
+    "tvshowid",
+    "file",
+    "art",
+]
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "kodi_media_sensors/search_tvshow",
-        vol.Optional("entry_id"): str,
-        vol.Optional("kodi_entity_id"): str,
-        vol.Required("tvshow_id"): vol.Any(int, str),
+        **_TVSHOW_SCHEMA,
+        vol.Optional("lazy", default=False): bool,
     }
 )
 @callback
@@ -914,91 +1308,143 @@ def websocket_search_tvshow(
     hass.async_create_task(_async_handle_search_tvshow(hass, connection, msg))
 
 
+def _get_tvshow_kodi_entity_id(hass: HomeAssistant, msg: dict) -> str | None:
+    """Return the Kodi entity of a TV show command (given, or of the entry)."""
+    kodi_entity_id = msg.get("kodi_entity_id")
+    if not kodi_entity_id and msg.get("entry_id"):
+        kodi_entity_id = _get_kodi_entity_id_from_entry(hass, msg["entry_id"])
+    return kodi_entity_id
+
+
+def _get_episodes_call(tvshow_id: int, profile: str, season: int | None = None):
+    """Return the `VideoLibrary.GetEpisodes` call of a show (or of a season)."""
+    params = {
+        "tvshowid": tvshow_id,
+        # The episodes are grouped by season and sorted by number
+        "properties": profile_properties(
+            _TVSHOW_EPISODE_PROPERTIES, profile, required=("season", "episode")
+        ),
+    }
+    if season is not None:
+        params["season"] = season
+    return ("VideoLibrary.GetEpisodes", params)
+
+
+def _prepare_episodes(episodes: list[dict]) -> list[dict]:
+    """Sort the episodes of a season and expose their runtime as duration."""
+    episodes.sort(key=lambda x: x.get("episode", 0))
+    for ep in episodes:
+        if "runtime" in ep:
+            ep["duration"] = ep["runtime"]
+    return episodes
+
+
+@track_command
 async def _async_handle_search_tvshow(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
-    """Fetch seasons and episodes for a given TV Show."""
-    msg_id = msg["id"]
-    entry_id = msg.get("entry_id")
-    kodi_entity_id = msg.get("kodi_entity_id")
-
-    if not kodi_entity_id and entry_id:
-        _get_kodi_entity_id_from_entry = globals().get("_get_kodi_entity_id_from_entry")
-        if _get_kodi_entity_id_from_entry:
-            kodi_entity_id = _get_kodi_entity_id_from_entry(hass, entry_id)
+    """Fetch seasons and episodes for a given TV Show.
 
+    Both are requested in a single batch, and the episodes are grouped
+    by season in one pass. In lazy mode, only the seasons (with their
+    number of episodes) are returned: the episodes of a season are
+    fetched by `search_tvshow_season`.
+    """
+    msg_id = msg["id"]
+    kodi_entity_id = _get_tvshow_kodi_entity_id(hass, msg)
     if not kodi_entity_id:
         connection.send_error(msg_id, "invalid_entity", "No Kodi entity configured")
         return
 
     tvshow_id = int(msg["tvshow_id"])
+    profile = msg["profile"]
+    lazy = msg["lazy"]
 
     try:
-        seasons_response = await async_call_method(
-            hass,
-            kodi_entity_id,
-            "VideoLibrary.GetSeasons",
-            tvshowid=tvshow_id,
-            properties=["title", "season", "thumbnail", "tvshowid", "art"],
+        calls = [
+            (
+                "VideoLibrary.GetSeasons",
+                {
+                    "tvshowid": tvshow_id,
+                    # The seasons are matched to the episodes by number, and
+                    # the lazy skeleton tells how many episodes each has
+                    "properties": profile_properties(
+                        ["title", "season", "thumbnail", "tvshowid", "art"]
+                        + (["episode"] if lazy else []),
+                        profile,
+                        required=("season", "episode"),
+                    ),
+                },
+            )
+        ]
+        if not lazy:
+            calls.append(_get_episodes_call(tvshow_id, profile))
+        seasons_response, *episodes_response = await async_call_batch(
+            hass, kodi_entity_id, calls
         )
         seasons = seasons_response.get("seasons", []) if seasons_response else []
-
-        episodes_response = await async_call_method(
-            hass,
-            kodi_entity_id,
-            "VideoLibrary.GetEpisodes",
-            tvshowid=tvshow_id,
-            properties=[
-                "title",
-                "season",
-                "episode",
-                "runtime",
-                "thumbnail",
-                "tvshowid",
-                "file",
-                "art",
-            ],
-        )
-        all_episodes = (
-            episodes_response.get("episodes", []) if episodes_response else []
-        )
+        episodes_by_season: dict[int, list[dict]] = {}
+        if episodes_response and episodes_response[0]:
+            for ep in episodes_response[0].get("episodes", []):
+                episodes_by_season.setdefault(ep.get("season"), []).append(ep)
 
         for season in seasons:
             season["type"] = "season"
-            season_num = season.get("season")
+            if not lazy:
+                season["episodes"] = _prepare_episodes(
+                    episodes_by_season.get(season.get("season"), [])
+                )
 
-            season_episodes = [
-                ep for ep in all_episodes if ep.get("season") == season_num
-            ]
-            season_episodes.sort(key=lambda x: x.get("episode", 0))
+        await async_resolve_thumbnails(
+            hass,
+            kodi_entity_id,
+            seasons
+            + [episode for season in seasons for episode in season.get("episodes", [])],
+        )
 
-            for ep in season_episodes:
-                if "runtime" in ep:
-                    ep["duration"] = ep["runtime"]
+        results = {"seasons": project_items(seasons, profile)}
+        if msg["compact"]:
+            results = compact_results(results)
+        connection.send_result(msg_id, results)
 
-            season["episodes"] = season_episodes
+    except Exception as e:
+        _LOGGER.error("Error searching TV show details: %s", e)
+        connection.send_error(msg_id, "search_error", str(e))
 
-        mp_component = hass.data.get("media_player")
-        mp_entity = mp_component.get_entity(kodi_entity_id) if mp_component else None
 
-        if mp_entity:
-            for season in seasons:
-                thumb = season.get("thumbnail")
-                if isinstance(thumb, str) and thumb.startswith("image://"):
-                    season["thumbnail"] = await mp_entity.async_get_browse_image(
-                        "image", thumb
-                    )
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "kodi_media_sensors/search_tvshow_season",
+        **_TVSHOW_SCHEMA,
+        vol.Required("season"): vol.Coerce(int),
+    }
+)
+@websocket_api.async_response
+@track_command
+async def websocket_search_tvshow_season(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Fetch the episodes of one season of a TV Show."""
+    msg_id = msg["id"]
+    kodi_entity_id = _get_tvshow_kodi_entity_id(hass, msg)
+    if not kodi_entity_id:
+        connection.send_error(msg_id, "invalid_entity", "No Kodi entity configured")
+        return
 
-                for episode in season.get("episodes", []):
-                    ep_thumb = episode.get("thumbnail")
-                    if isinstance(ep_thumb, str) and ep_thumb.startswith("image://"):
-                        episode["thumbnail"] = await mp_entity.async_get_browse_image(
-                            "image", ep_thumb
-                        )
+    method, params = _get_episodes_call(
+        int(msg["tvshow_id"]), msg["profile"], msg["season"]
+    )
+    response = await async_call_method(hass, kodi_entity_id, method, **params)
+    if response is None:
+        connection.send_error(
+            msg_id, "search_error", f"Could not fetch season {msg['season']}"
+        )
+        return
 
-        results = {"seasons": seasons}
-        connection.send_result(msg_id, results)
+    episodes = _prepare_episodes(response.get("episodes", []))
+    await async_resolve_thumbnails(hass, kodi_entity_id, episodes)
 
-    except Exception as e:
-        _LOGGER.error("Error searching TV show details: %s", e)
-        connection.send_error(msg_id, "search_error", str(e))
+    results = {"episodes": project_items(episodes, msg["profile"])}
+    if msg["compact"]:
+        results = compact_results(results)
+    connection.send_result(msg_id, results)
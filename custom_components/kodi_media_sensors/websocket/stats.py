@@ -0,0 +1,148 @@
+"""WebSocket command reporting what the integration is doing.
+
+Provides the `kodi_media_sensors/stats` command:
+- returns, per entry: the Kodi JSON-RPC call metrics, the playlist
+  subscriptions, the cache sizes and hit rates (and the recently added
+  and played media), and the requests in flight
+- returns the slowest recent websocket commands
+- `entry_id` restricts the report to one entry
+
+The same report is included in the diagnostics of each config entry.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from ..command_stats import async_get_command_stats
+from ..const import DATA_SEARCH_TYPEAHEAD, DATA_THUMBNAIL_CACHES, DOMAIN
+from ..kodi_client import (
+    async_get_kodi_entity_id,
+    async_get_resolution_stats,
+    async_get_rpc_in_flight,
+    async_get_rpc_metrics,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_register_websockets(hass: HomeAssistant) -> None:
+    """Register the stats WebSocket command."""
+    websocket_api.async_register_command(hass, websocket_stats)
+
+
+def _cache_stats(cache) -> dict[str, Any] | None:
+    """Return the size and hit rate of a cache with hits/misses counters."""
+    if cache is None:
+        return None
+    lookups = cache.hits + cache.misses
+    return {
+        "size": len(cache),
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "hit_rate": round(cache.hits / lookups, 3) if lookups else None,
+    }
+
+
+@callback
+def async_get_entry_stats(hass: HomeAssistant, entry_id: str) -> dict[str, Any]:
+    """Return the runtime stats of one entry."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id, {})
+    kodi_entity_id = async_get_kodi_entity_id(hass, entry_id)
+    command_stats = async_get_command_stats(hass)
+
+    library_index = entry_data.get("library_index")
+    channel_catalog = entry_data.get("channel_catalog")
+    playlist_hub = entry_data.get("playlist_hub")
+    search_cache = entry_data.get("search_cache")
+    recently_added = entry_data.get("recently_added")
+    recently_played = entry_data.get("recently_played")
+    search_cache_stats = _cache_stats(search_cache)
+    if search_cache_stats is not None:
+        search_cache_stats["generation"] = search_cache.generation
+
+    return {
+        "label": entry_data.get("label"),
+        "kodi_entity_id": kodi_entity_id,
+        "in_flight": {
+            "commands": command_stats.in_flight_by_entry.get(entry_id, 0),
+            "kodi_calls": (
+                async_get_rpc_in_flight(hass, kodi_entity_id) if kodi_entity_id else 0
+            ),
+        },
+        "rpc": async_get_rpc_metrics(hass, kodi_entity_id) if kodi_entity_id else {},
+        "playlist": (
+            playlist_hub.async_get_stats() if playlist_hub is not None else None
+        ),
+        "caches": {
+            "thumbnails": _cache_stats(
+                hass.data.get(DATA_THUMBNAIL_CACHES, {}).get(kodi_entity_id)
+            ),
+            "search_results": search_cache_stats,
+            "typeahead_connections": sum(
+                1
+                for _, typeahead_entry_id in hass.data.get(DATA_SEARCH_TYPEAHEAD, {})
+                if typeahead_entry_id == entry_id
+            ),
+            "library_index": (
+                library_index.async_get_sizes() if library_index is not None else None
+            ),
+            "channels": (
+                len(channel_catalog)
+                if channel_catalog is not None and channel_catalog.is_ready
+                else None
+            ),
+            "recently_added": (
+                recently_added.async_get_stats() if recently_added is not None else None
+            ),
+            "recently_played": (
+                recently_played.async_get_stats()
+                if recently_played is not None
+                else None
+            ),
+        },
+        "slowest_commands": command_stats.async_slowest(entry_id),
+    }
+
+
+@callback
+def async_get_stats(hass: HomeAssistant, entry_ids: list[str]) -> dict[str, Any]:
+    """Return the stats of the given entries and of the whole integration."""
+    command_stats = async_get_command_stats(hass)
+    return {
+        "entries": {
+            entry_id: async_get_entry_stats(hass, entry_id) for entry_id in entry_ids
+        },
+        "in_flight_commands": dict(command_stats.in_flight),
+        "slowest_commands": command_stats.async_slowest(),
+        "kodi_resolution": async_get_resolution_stats(hass),
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "kodi_media_sensors/stats",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def websocket_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the runtime stats of the integration."""
+    entry_ids = list(hass.data.get(DOMAIN, {}))
+    if "entry_id" in msg:
+        if msg["entry_id"] not in entry_ids:
+            connection.send_error(
+                msg["id"], "invalid_entry", f"Entry {msg['entry_id']} not found"
+            )
+            return
+        entry_ids = [msg["entry_id"]]
+    connection.send_result(msg["id"], async_get_stats(hass, entry_ids))